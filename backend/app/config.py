@@ -1,7 +1,12 @@
 import os
+from datetime import datetime
 
+from pydantic import field_validator
 from pydantic_settings import BaseSettings
 
+# Strategies registered by app.services.question_sampler
+QUESTION_SAMPLERS = ("catalog", "order_by_random")
+
 
 class Settings(BaseSettings):
     APP_NAME: str = "GAT Mentor API"
@@ -10,10 +15,83 @@ class Settings(BaseSettings):
     SECRET_KEY: str = "dev-secret-key-change-in-production"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 1440
+    # Put id/is_admin/level/daily_minutes in access tokens so most routes skip
+    # the users table; those claims then stay as issued until the token expires
+    TOKEN_EMBED_CLAIMS: bool = False
+    # bcrypt cost factor; stored hashes with another cost are redone on login
+    BCRYPT_ROUNDS: int = 12
+    # Processes per worker that run bcrypt for register/login (0 = threadpool)
+    PASSWORD_HASH_WORKERS: int = 2
     API_V1_PREFIX: str = "/api/v1"
     ALLOWED_ORIGINS: str = "*"
     PORT: int = 8000
 
+    # Connection pool, per worker process (SQLite files and Postgres)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_SECONDS: int = 30
+    # Postgres only
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_STATEMENT_TIMEOUT_MS: int = 30000  # 0 = no limit
+    DB_IDLE_IN_TRANSACTION_TIMEOUT_MS: int = 60000  # 0 = no limit
+
+    # SQLite pragmas, applied to every new connection
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_CACHE_SIZE_KB: int = 65536
+    SQLITE_MMAP_SIZE_BYTES: int = 268435456
+
+    # Serve the hot routes (next question, attempts, review queue, dashboard)
+    # from async endpoints on an async engine (aiosqlite / asyncpg)
+    ASYNC_DB: bool = False
+
+    # In-process caches
+    USER_CACHE_TTL_SECONDS: int = 60  # 0 = always read users
+    USER_CACHE_MAX_USERS: int = 10000
+    REVIEW_COUNT_TTL_SECONDS: int = 300  # 0 = always count
+    REVIEW_COUNT_MAX_USERS: int = 10000
+    CATALOG_CACHE_TTL_SECONDS: int = 300
+    SEEN_INDEX_MAX_USERS: int = 10000
+    SEEN_INDEX_TTL_SECONDS: int = 600
+
+    # Adaptive engine lookahead (0 = compute every question on demand)
+    ADAPTIVE_LOOKAHEAD: int = 0
+    LOOKAHEAD_MAX_USERS: int = 10000
+    LOOKAHEAD_TTL_SECONDS: int = 300
+    LOOKAHEAD_REORDER_THRESHOLD: float = 0.05
+
+    # Review queue items per page (GET /review/queue?limit= overrides, max 100)
+    REVIEW_PAGE_SIZE: int = 20
+
+    # Pre-generate the day's plans in-process at this UTC time ("HH:MM",
+    # empty = off; run jobs.generate_daily_plans from cron instead)
+    PLAN_PREGENERATE_AT: str = ""
+    PLAN_PREGENERATE_WORKERS: int = 4
+    # flock()ed so only one worker process on the host runs the job
+    PLAN_PREGENERATE_LOCK_FILE: str = "/tmp/gat_mentor_plans.lock"
+
+    # Random question sets: "catalog" or "order_by_random"
+    QUESTION_SAMPLER: str = "catalog"
+
+    @field_validator("QUESTION_SAMPLER")
+    @classmethod
+    def _check_question_sampler(cls, value: str) -> str:
+        if value not in QUESTION_SAMPLERS:
+            raise ValueError(f"expected one of {', '.join(QUESTION_SAMPLERS)}, got {value!r}")
+        return value
+
+    @field_validator("PLAN_PREGENERATE_AT")
+    @classmethod
+    def _check_pregenerate_at(cls, value: str) -> str:
+        if value:
+            try:
+                datetime.strptime(value, "%H:%M")
+            except ValueError:
+                raise ValueError(f"expected HH:MM (UTC) or empty, got {value!r}") from None
+        return value
+
     class Config:
         env_file = ".env" if os.path.exists(".env") else None
 
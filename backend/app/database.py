@@ -1,25 +1,115 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, DeclarativeBase
 
 from app.config import settings
+from app.utils.pool_metrics import TimedAsyncAdaptedQueuePool, TimedQueuePool
 
 # Railway PostgreSQL uses postgres:// but SQLAlchemy needs postgresql://
 database_url = settings.DATABASE_URL
 if database_url.startswith("postgres://"):
     database_url = database_url.replace("postgres://", "postgresql://", 1)
 
+# Driver arguments every connection needs (migrations use these as-is, without
+# the request-path timeouts below)
 connect_args = {}
 if "sqlite" in database_url:
     connect_args = {"check_same_thread": False}
 
-engine = create_engine(
-    database_url,
-    connect_args=connect_args,
-    echo=False,
-)
+
+def _is_memory_sqlite(url: str) -> bool:
+    return url.startswith("sqlite") and (":memory:" in url or url.split("://", 1)[1] in ("", "/"))
+
+
+def _postgres_session_settings() -> dict[str, str]:
+    """Server settings applied to every Postgres session (milliseconds)."""
+    session_settings = {}
+    if settings.DB_STATEMENT_TIMEOUT_MS:
+        session_settings["statement_timeout"] = str(settings.DB_STATEMENT_TIMEOUT_MS)
+    if settings.DB_IDLE_IN_TRANSACTION_TIMEOUT_MS:
+        session_settings["idle_in_transaction_session_timeout"] = str(
+            settings.DB_IDLE_IN_TRANSACTION_TIMEOUT_MS
+        )
+    return session_settings
+
+
+def engine_options(url: str, is_async: bool = False) -> dict:
+    """create_engine() keyword arguments for the configured backend."""
+    if _is_memory_sqlite(url):
+        # One shared in-memory database; SQLAlchemy picks the right pool
+        return {"connect_args": {} if is_async else dict(connect_args)}
+
+    options = {
+        "poolclass": TimedAsyncAdaptedQueuePool if is_async else TimedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+    }
+    if url.startswith("sqlite"):
+        options["connect_args"] = {} if is_async else dict(connect_args)
+        return options
+
+    options["pool_recycle"] = settings.DB_POOL_RECYCLE_SECONDS
+    options["pool_pre_ping"] = settings.DB_POOL_PRE_PING
+    session_settings = _postgres_session_settings()
+    if is_async:
+        options["connect_args"] = {"server_settings": session_settings}
+    elif session_settings:
+        options["connect_args"] = {
+            "options": " ".join(f"-c {k}={v}" for k, v in session_settings.items())
+        }
+    return options
+
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"PRAGMA busy_timeout = {settings.SQLITE_BUSY_TIMEOUT_MS}")
+    cursor.execute(f"PRAGMA journal_mode = {settings.SQLITE_JOURNAL_MODE}")
+    cursor.execute(f"PRAGMA synchronous = {settings.SQLITE_SYNCHRONOUS}")
+    # Negative cache_size is in KiB rather than pages
+    cursor.execute(f"PRAGMA cache_size = -{settings.SQLITE_CACHE_SIZE_KB}")
+    cursor.execute(f"PRAGMA mmap_size = {settings.SQLITE_MMAP_SIZE_BYTES}")
+    cursor.close()
+
+
+def tune_engine(sync_engine: Engine) -> Engine:
+    """Attach per-connection setup (SQLite pragmas) to an engine."""
+    if sync_engine.dialect.name == "sqlite":
+        event.listen(sync_engine, "connect", _apply_sqlite_pragmas)
+    return sync_engine
+
+
+engine = tune_engine(create_engine(database_url, echo=False, **engine_options(database_url)))
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
+def async_database_url(url: str) -> str:
+    """Same database, async driver: sqlite → aiosqlite, postgresql → asyncpg."""
+    for sync_prefix, async_prefix in (
+        ("sqlite://", "sqlite+aiosqlite://"),
+        ("postgresql+psycopg2://", "postgresql+asyncpg://"),
+        ("postgresql://", "postgresql+asyncpg://"),
+    ):
+        if url.startswith(sync_prefix):
+            return async_prefix + url[len(sync_prefix):]
+    return url
+
+
+# Only built when enabled, so the async drivers stay optional otherwise
+async_engine = None
+AsyncSessionLocal = None
+if settings.ASYNC_DB:
+    _async_url = async_database_url(database_url)
+    async_engine = create_async_engine(
+        _async_url, echo=False, **engine_options(_async_url, is_async=True)
+    )
+    tune_engine(async_engine.sync_engine)
+    AsyncSessionLocal = async_sessionmaker(
+        async_engine, autoflush=False, expire_on_commit=False
+    )
+
+
 class Base(DeclarativeBase):
     pass
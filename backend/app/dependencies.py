@@ -1,11 +1,14 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from app import database
 from app.config import settings
 from app.database import SessionLocal
 from app.models.user import User
+from app.services.user_cache import Principal, get_principal, principal_from_claims
 
 oauth2_scheme = OAuth2PasswordBearer(
     tokenUrl=f"{settings.API_V1_PREFIX}/auth/login"
@@ -20,32 +23,93 @@ def get_db():
         db.close()
 
 
-def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db),
-) -> User:
-    credentials_exception = HTTPException(
+async def get_async_db():
+    async with database.AsyncSessionLocal() as db:
+        yield db
+
+
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+
+def _decode_token(token: str) -> tuple[int, dict]:
+    """Return (user_id, payload) of a valid access token."""
     try:
         payload = jwt.decode(
             token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
         )
         user_id_str = payload.get("sub")
         if user_id_str is None:
-            raise credentials_exception
-        user_id = int(user_id_str)
+            raise _credentials_exception()
+        return int(user_id_str), payload
     except (JWTError, ValueError):
-        raise credentials_exception
+        raise _credentials_exception()
+
 
+def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db),
+) -> User:
+    """The ORM user, for routes that read or write profile fields."""
+    user_id, _ = _decode_token(token)
     user = db.query(User).filter(User.id == user_id).first()
     if user is None:
-        raise credentials_exception
+        raise _credentials_exception()
     return user
 
 
+def get_current_principal(
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db),
+) -> Principal:
+    """The caller's id/is_admin/level/daily_minutes, from claims or the user cache."""
+    user_id, payload = _decode_token(token)
+    principal = principal_from_claims(user_id, payload)
+    if principal is None:
+        principal = get_principal(db, user_id)
+        # Hand the connection back now: holding it until the endpoint gets a
+        # threadpool slot can starve the pool under load
+        db.rollback()
+    if principal is None:
+        raise _credentials_exception()
+    return principal
+
+
+def get_current_principal_fresh(
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db),
+) -> Principal:
+    """The caller's principal from the user cache, never from token claims.
+
+    For routes that store what they derive from level/daily_minutes (plans):
+    claims keep the values from login, the cache is invalidated by profile writes.
+    """
+    user_id, _ = _decode_token(token)
+    principal = get_principal(db, user_id)
+    db.rollback()
+    if principal is None:
+        raise _credentials_exception()
+    return principal
+
+
+async def get_current_principal_async(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db),
+) -> Principal:
+    user_id, payload = _decode_token(token)
+    principal = principal_from_claims(user_id, payload)
+    if principal is None:
+        principal = await db.run_sync(get_principal, user_id)
+        await db.rollback()
+    if principal is None:
+        raise _credentials_exception()
+    return principal
+
+
 def get_admin_user(
     current_user: User = Depends(get_current_user),
 ) -> User:
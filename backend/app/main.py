@@ -1,3 +1,4 @@
+import asyncio
 import os
 from contextlib import asynccontextmanager
 
@@ -40,13 +41,44 @@ def _auto_seed():
         db.close()
 
 
+def _warm_catalog():
+    """Load the topic/concept/question catalog into memory."""
+    from app.database import SessionLocal
+    from app.services.catalog import load_catalog
+
+    db = SessionLocal()
+    try:
+        snapshot = load_catalog(db)
+        print(f"Catalog loaded (version {snapshot.version}).")
+    except Exception as e:
+        print(f"Catalog warm-up skipped: {e}")
+    finally:
+        db.close()
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Create tables on startup
     Base.metadata.create_all(bind=engine)
     # Auto-seed if empty
     _auto_seed()
+    # Warm the catalog cache
+    _warm_catalog()
+    scheduler = None
+    if settings.PLAN_PREGENERATE_AT:
+        from jobs.generate_daily_plans import run_scheduler
+
+        scheduler = asyncio.create_task(run_scheduler())
     yield
+    if scheduler is not None:
+        scheduler.cancel()
+    from app.database import async_engine
+    from app.utils.security import shutdown_hash_pool
+
+    shutdown_hash_pool()
+
+    if async_engine is not None:
+        await async_engine.dispose()
 
 
 def create_app() -> FastAPI:
@@ -72,6 +104,20 @@ def create_app() -> FastAPI:
     )
 
     prefix = settings.API_V1_PREFIX
+    if settings.ASYNC_DB:
+        # Registered first so they shadow the sync routes on the same paths
+        application.include_router(
+            questions.async_router, prefix=f"{prefix}/questions", tags=["Questions"]
+        )
+        application.include_router(
+            attempts.async_router, prefix=f"{prefix}/attempts", tags=["Attempts"]
+        )
+        application.include_router(
+            review.async_router, prefix=f"{prefix}/review", tags=["Review"]
+        )
+        application.include_router(
+            stats.async_router, prefix=f"{prefix}/stats", tags=["Stats"]
+        )
     application.include_router(auth.router, prefix=f"{prefix}/auth", tags=["Auth"])
     application.include_router(
         onboarding.router, prefix=f"{prefix}/onboarding", tags=["Onboarding"]
@@ -7,6 +7,9 @@ from app.models.user_concept_stats import UserConceptStats
 from app.models.study_session import StudySession
 from app.models.daily_plan import DailyPlan, DailyPlanItem
 from app.models.streak import Streak
+from app.models.user_rollup import UserRollup
+from app.models.user_daily_activity import UserDailyActivity
+from app.models.review_item import ReviewItem
 
 __all__ = [
     "User",
@@ -19,4 +22,7 @@ __all__ = [
     "DailyPlan",
     "DailyPlanItem",
     "Streak",
+    "UserRollup",
+    "UserDailyActivity",
+    "ReviewItem",
 ]
@@ -1,7 +1,7 @@
 import enum
 from datetime import datetime
 
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, String
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import relationship
 
 from app.database import Base
@@ -30,10 +30,18 @@ class Attempt(Base):
     session_id = Column(Integer, ForeignKey("study_sessions.id"), nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
 
-    # Spaced repetition fields
+    # Legacy spaced-repetition fields, no longer written: review state lives in
+    # review_items (migration 0005 backfills it and copies it back on downgrade)
     next_review_date = Column(DateTime, nullable=True)
-    review_interval_days = Column(Integer, default=1)
-    review_count = Column(Integer, default=0)
+    review_interval_days = Column(Integer)
+    review_count = Column(Integer)
+
+    __table_args__ = (
+        # get_trends, /attempts/history, /attempts/recent
+        Index("ix_attempts_user_created", "user_id", "created_at"),
+        # Seen-question index load (attempts ⋈ questions per user)
+        Index("ix_attempts_user_question", "user_id", "question_id"),
+    )
 
     user = relationship("User", back_populates="attempts")
     question = relationship("Question", back_populates="attempts")
@@ -1,7 +1,7 @@
 import enum
 from datetime import date, datetime
 
-from sqlalchemy import Boolean, Column, Date, DateTime, ForeignKey, Integer, String
+from sqlalchemy import Boolean, Column, Date, DateTime, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import relationship
 
 from app.database import Base
@@ -25,6 +25,9 @@ class DailyPlan(Base):
     is_completed = Column(Boolean, default=False)
     created_at = Column(DateTime, default=datetime.utcnow)
 
+    # One plan per user and day (pre-generation and /plan/today may race)
+    __table_args__ = (Index("ix_daily_plans_user_date", "user_id", "date", unique=True),)
+
     user = relationship("User", back_populates="daily_plans")
     items = relationship("DailyPlanItem", back_populates="plan", cascade="all, delete-orphan")
 
@@ -33,7 +36,7 @@ class DailyPlanItem(Base):
     __tablename__ = "daily_plan_items"
 
     id = Column(Integer, primary_key=True, index=True)
-    plan_id = Column(Integer, ForeignKey("daily_plans.id"), nullable=False)
+    plan_id = Column(Integer, ForeignKey("daily_plans.id"), nullable=False, index=True)
     item_type = Column(String, nullable=False)
     concept_id = Column(Integer, ForeignKey("concepts.id"), nullable=True)
     duration_minutes = Column(Integer, nullable=False)
@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, String
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import relationship
 
 from app.database import Base
@@ -29,5 +29,14 @@ class Question(Base):
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime, default=datetime.utcnow)
 
+    __table_args__ = (
+        Index(
+            "ix_questions_concept_active_difficulty",
+            "concept_id",
+            "is_active",
+            "difficulty",
+        ),
+    )
+
     concept = relationship("Concept", back_populates="questions")
     attempts = relationship("Attempt", back_populates="question")
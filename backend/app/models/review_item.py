@@ -0,0 +1,24 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, UniqueConstraint
+
+from app.database import Base
+
+
+class ReviewItem(Base):
+    """Spaced-repetition state for one question a user got wrong."""
+
+    __tablename__ = "review_items"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    question_id = Column(Integer, ForeignKey("questions.id"), nullable=False)
+    # The latest wrong attempt; the review routes are addressed by attempt id
+    attempt_id = Column(Integer, ForeignKey("attempts.id"), nullable=False)
+    next_review_date = Column(DateTime, nullable=False)
+    review_interval_days = Column(Integer, nullable=False, default=1)
+    review_count = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        UniqueConstraint("user_id", "question_id", name="uq_review_item"),
+        # Due queue and due count, oldest first
+        Index("ix_review_items_user_due", "user_id", "next_review_date"),
+    )
@@ -1,7 +1,7 @@
 import enum
 from datetime import datetime
 
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, String
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import relationship
 
 from app.database import Base
@@ -28,5 +28,7 @@ class StudySession(Base):
     ended_at = Column(DateTime, nullable=True)
     is_completed = Column(Boolean, default=False)
 
+    __table_args__ = (Index("ix_study_sessions_user_started", "user_id", "started_at"),)
+
     user = relationship("User", back_populates="study_sessions")
     attempts = relationship("Attempt", back_populates="session")
@@ -35,3 +35,4 @@ class User(Base):
     study_sessions = relationship("StudySession", back_populates="user")
     daily_plans = relationship("DailyPlan", back_populates="user")
     streak = relationship("Streak", back_populates="user", uselist=False)
+    rollup = relationship("UserRollup", back_populates="user", uselist=False)
@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import Column, DateTime, Float, ForeignKey, Integer, UniqueConstraint
+from sqlalchemy import Column, DateTime, Float, ForeignKey, Index, Integer, UniqueConstraint
 from sqlalchemy.orm import relationship
 
 from app.database import Base
@@ -25,6 +25,8 @@ class UserConceptStats(Base):
 
     __table_args__ = (
         UniqueConstraint("user_id", "concept_id", name="uq_user_concept"),
+        # Weakest-concept lookups
+        Index("ix_user_concept_stats_user_mastery", "user_id", "mastery"),
     )
 
     user = relationship("User", back_populates="concept_stats")
@@ -0,0 +1,23 @@
+from sqlalchemy import Column, Date, ForeignKey, Integer, UniqueConstraint
+
+from app.database import Base
+
+
+class UserDailyActivity(Base):
+    """Attempts per user, UTC day and topic; summed across topics for day totals."""
+
+    __tablename__ = "user_daily_activity"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    activity_date = Column(Date, nullable=False)
+    topic_id = Column(Integer, ForeignKey("topics.id"), nullable=False)
+    attempts = Column(Integer, nullable=False, default=0)
+    correct = Column(Integer, nullable=False, default=0)
+    time_seconds = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        UniqueConstraint(
+            "user_id", "activity_date", "topic_id", name="uq_user_daily_activity"
+        ),
+    )
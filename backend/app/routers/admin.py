@@ -1,13 +1,18 @@
+import os
+
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy import func
 from sqlalchemy.orm import Session
 
+from app.config import settings
 from app.dependencies import get_admin_user, get_db
-from app.models.attempt import Attempt
 from app.models.question import Question
 from app.models.user import User
 from app.models.user_concept_stats import UserConceptStats
+from app.models.user_rollup import UserRollup
 from app.schemas.question import QuestionCreate, QuestionDetail
+from app.services.catalog import invalidate_catalog
+from app.utils.pool_metrics import pool_status
 
 router = APIRouter()
 
@@ -21,6 +26,7 @@ def create_question(
     question = Question(**request.model_dump())
     db.add(question)
     db.commit()
+    invalidate_catalog()
     db.refresh(question)
     return QuestionDetail.model_validate(question)
 
@@ -81,6 +87,7 @@ def update_question(
     for field, value in request.model_dump().items():
         setattr(question, field, value)
     db.commit()
+    invalidate_catalog()
     db.refresh(question)
     return {"id": question.id, "message": "Updated successfully"}
 
@@ -97,6 +104,7 @@ def delete_question(
 
     question.is_active = False  # Soft delete
     db.commit()
+    invalidate_catalog()
     return {"message": "Question deactivated"}
 
 
@@ -114,6 +122,7 @@ def bulk_upload(
         created.append(question)
 
     db.commit()
+    invalidate_catalog()
     return {"created": len(created), "message": f"{len(created)} questions uploaded"}
 
 
@@ -124,7 +133,7 @@ def admin_overview(
 ):
     total_users = db.query(User).count()
     total_questions = db.query(Question).filter(Question.is_active == True).count()
-    total_attempts = db.query(Attempt).count()
+    total_attempts = db.query(func.sum(UserRollup.total_attempts)).scalar() or 0
     avg_mastery = db.query(func.avg(UserConceptStats.mastery)).scalar() or 0.0
 
     return {
@@ -133,3 +142,19 @@ def admin_overview(
         "total_attempts": total_attempts,
         "avg_mastery": round(avg_mastery, 3),
     }
+
+
+@router.get("/stats/pool")
+def pool_stats(admin: User = Depends(get_admin_user)):
+    """Connection pool occupancy and checkout waits for this worker process."""
+    from app.database import async_engine, engine
+
+    result = {
+        "pid": os.getpid(),
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "sync": pool_status(engine),
+    }
+    if async_engine is not None:
+        result["async"] = pool_status(async_engine.sync_engine)
+    return result
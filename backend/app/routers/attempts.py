@@ -1,24 +1,50 @@
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.dependencies import get_current_user, get_db
+from app.dependencies import (
+    get_async_db,
+    get_current_principal,
+    get_current_principal_async,
+    get_db,
+)
 from app.models.attempt import Attempt
 from app.models.question import Question
-from app.models.user import User
 from app.schemas.attempt import AttemptCreate, AttemptResponse
+from app.services.activity_service import record_activity
 from app.services.mastery_service import update_mastery
+from app.services.rollup_service import record_attempts
+from app.services.seen_index import mark_seen
 from app.services.streak_service import check_in
+from app.services.user_cache import Principal
+from app.utils.after_commit import after_commit
 
 router = APIRouter()
+# Async twins of the hot routes, mounted ahead of `router` when ASYNC_DB is on
+async_router = APIRouter()
 
 
 @router.post("/", response_model=AttemptResponse)
 def create_attempt(
     request: AttemptCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db),
 ):
     """Record an answer attempt and update mastery."""
+    return _create_attempt(db, current_user.id, request)
+
+
+@async_router.post("/", response_model=AttemptResponse)
+async def create_attempt_async(
+    request: AttemptCreate,
+    current_user: Principal = Depends(get_current_principal_async),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Record an answer attempt and update mastery."""
+    return await db.run_sync(_create_attempt, current_user.id, request)
+
+
+def _create_attempt(db: Session, user_id: int, request: AttemptCreate) -> AttemptResponse:
     question = db.query(Question).get(request.question_id)
     if not question:
         raise HTTPException(status_code=404, detail="Question not found")
@@ -26,7 +52,7 @@ def create_attempt(
     is_correct = request.selected_option == question.correct_option
 
     attempt = Attempt(
-        user_id=current_user.id,
+        user_id=user_id,
         question_id=request.question_id,
         selected_option=request.selected_option,
         is_correct=is_correct,
@@ -42,15 +68,20 @@ def create_attempt(
 
     db.add(attempt)
     db.flush()
+    after_commit(db, mark_seen, user_id, question.concept_id, question.id)
+    record_attempts(db, user_id, 1, int(is_correct), attempt.time_taken_seconds)
+    record_activity(
+        db,
+        user_id,
+        [(question.concept_id, is_correct, attempt.time_taken_seconds)],
+        day=attempt.created_at.date(),
+    )
 
     # Update mastery
-    stats, mastery_change = update_mastery(db, current_user.id, question, attempt)
+    stats, mastery_change = update_mastery(db, user_id, question, attempt)
 
     # Update streak
-    check_in(db, current_user.id)
-
-    db.commit()
-    db.refresh(attempt)
+    check_in(db, user_id)
 
     # Build "why wrong" for selected option
     why_wrong = None
@@ -63,7 +94,7 @@ def create_attempt(
         }
         why_wrong = why_wrong_map.get(request.selected_option)
 
-    return AttemptResponse(
+    response = AttemptResponse(
         id=attempt.id,
         question_id=attempt.question_id,
         selected_option=attempt.selected_option,
@@ -79,6 +110,10 @@ def create_attempt(
         mastery_change=round(mastery_change, 4),
         new_mastery=round(stats.mastery, 4),
     )
+    # Built before the commit so nothing reloads afterwards: the connection
+    # goes back to the pool here, not after the response is serialized
+    db.commit()
+    return response
 
 
 @router.get("/history")
@@ -86,7 +121,7 @@ def get_history(
     page: int = 1,
     per_page: int = 20,
     topic_id: int | None = None,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db),
 ):
     """Get paginated attempt history."""
@@ -131,7 +166,7 @@ def get_history(
 @router.get("/recent")
 def get_recent(
     limit: int = 10,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db),
 ):
     """Get most recent attempts."""
@@ -15,14 +15,15 @@ from app.services.auth_service import (
     create_token_for_user,
     register_user,
 )
+from app.services.user_cache import invalidate_user
 
 router = APIRouter()
 
 
 @router.post("/register", response_model=TokenResponse)
-def register(request: RegisterRequest, db: Session = Depends(get_db)):
+async def register(request: RegisterRequest, db: Session = Depends(get_db)):
     try:
-        user = register_user(db, request.email, request.password, request.full_name)
+        user = await register_user(db, request.email, request.password, request.full_name)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     token = create_token_for_user(user)
@@ -30,8 +31,8 @@ def register(request: RegisterRequest, db: Session = Depends(get_db)):
 
 
 @router.post("/login", response_model=TokenResponse)
-def login(request: LoginRequest, db: Session = Depends(get_db)):
-    user = authenticate_user(db, request.email, request.password)
+async def login(request: LoginRequest, db: Session = Depends(get_db)):
+    user = await authenticate_user(db, request.email, request.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -56,5 +57,6 @@ def update_me(
     for field, value in update_data.items():
         setattr(current_user, field, value)
     db.commit()
+    invalidate_user(current_user.id)
     db.refresh(current_user)
     return UserProfile.model_validate(current_user)
@@ -1,16 +1,18 @@
 from datetime import datetime
 
 from fastapi import APIRouter, Depends
-from sqlalchemy import func
 from sqlalchemy.orm import Session
 
 from app.dependencies import get_current_user, get_db
-from app.models.concept import Concept
 from app.models.question import Question
 from app.models.user import User
 from app.models.user_concept_stats import UserConceptStats
 from app.schemas.auth import UserProfile
 from app.schemas.user import OnboardingProfileRequest
+from app.services.catalog import get_catalog
+from app.services.question_sampler import sample_questions
+from app.services.rollup_service import ensure_rollup
+from app.services.user_cache import invalidate_user
 
 router = APIRouter()
 
@@ -27,6 +29,7 @@ def set_profile(
     current_user.daily_minutes = request.daily_minutes
     current_user.target_score = request.target_score
     db.commit()
+    invalidate_user(current_user.id)
     db.refresh(current_user)
     return UserProfile.model_validate(current_user)
 
@@ -38,31 +41,19 @@ def get_diagnostic_questions(
 ):
     """Return 15 diagnostic questions: 5 per topic, mixed difficulty."""
     questions = []
-    concepts = db.query(Concept).all()
+    catalog = get_catalog(db)
 
-    # Group concepts by topic
-    topic_concepts: dict[int, list[int]] = {}
-    for c in concepts:
-        topic_concepts.setdefault(c.topic_id, []).append(c.id)
+    # Topics that have concepts, in first-seen order
+    topic_ids = dict.fromkeys(c.topic_id for c in catalog.concepts.values())
 
-    for topic_id, concept_ids in topic_concepts.items():
-        topic_qs = (
-            db.query(Question)
-            .filter(
-                Question.concept_id.in_(concept_ids),
-                Question.is_active == True,
-            )
-            .order_by(func.random())
-            .limit(5)
-            .all()
-        )
+    for topic_id in topic_ids:
+        topic_qs = sample_questions(db, 5, topic_id=topic_id)
         for q in topic_qs:
-            concept = db.query(Concept).get(q.concept_id)
             questions.append(
                 {
                     "id": q.id,
                     "concept_id": q.concept_id,
-                    "concept_name": concept.name if concept else None,
+                    "concept_name": catalog.concept_name(q.concept_id),
                     "text": q.text,
                     "difficulty": q.difficulty,
                     "option_a": q.option_a,
@@ -101,6 +92,7 @@ def submit_diagnostic(
             concept_results[cid]["correct"] += 1
 
     # Set initial mastery per concept
+    catalog = get_catalog(db)
     results = []
     for concept_id, data in concept_results.items():
         accuracy = data["correct"] / data["total"] if data["total"] > 0 else 0.0
@@ -135,20 +127,24 @@ def submit_diagnostic(
         else:
             stats.difficulty_comfort = 1
 
-        concept = db.query(Concept).get(concept_id)
         results.append(
             {
                 "concept_id": concept_id,
-                "concept_name": concept.name if concept else "",
+                "concept_name": catalog.concept_name(concept_id) or "",
                 "accuracy": round(accuracy, 2),
                 "initial_mastery": round(initial_mastery, 2),
                 "difficulty_comfort": stats.difficulty_comfort,
             }
         )
 
+    # Diagnostic answers are not stored as attempts, so they do not count
+    # towards the lifetime totals; just make sure the counters exist
+    ensure_rollup(db, current_user.id)
+
     # Mark onboarding complete
     current_user.onboarding_complete = True
     db.commit()
+    invalidate_user(current_user.id)
 
     # Calculate overall readiness
     total_correct = sum(r["accuracy"] for r in results)
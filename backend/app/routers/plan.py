@@ -1,19 +1,25 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 
-from app.dependencies import get_current_user, get_db
-from app.models.concept import Concept
+from app.dependencies import (
+    get_current_principal,
+    get_current_principal_fresh,
+    get_current_user,
+    get_db,
+)
 from app.models.daily_plan import DailyPlan, DailyPlanItem
 from app.models.user import User
 from app.schemas.plan import PlanSettings
+from app.services.catalog import get_catalog
 from app.services.plan_service import generate_daily_plan, get_or_generate_today_plan
+from app.services.user_cache import Principal, invalidate_user
 
 router = APIRouter()
 
 
 @router.get("/today")
 def today_plan(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal_fresh),
     db: Session = Depends(get_db),
 ):
     """Get or generate today's plan."""
@@ -23,7 +29,7 @@ def today_plan(
 
 @router.post("/generate")
 def force_generate(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal_fresh),
     db: Session = Depends(get_db),
 ):
     """Force regenerate today's plan."""
@@ -46,6 +52,7 @@ def update_settings(
 
         current_user.exam_date = datetime.fromisoformat(request.exam_date)
     db.commit()
+    invalidate_user(current_user.id)
     return {
         "daily_minutes": current_user.daily_minutes,
         "target_score": current_user.target_score,
@@ -56,7 +63,7 @@ def update_settings(
 @router.put("/items/{item_id}/complete")
 def complete_item(
     item_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db),
 ):
     item = db.query(DailyPlanItem).get(item_id)
@@ -79,19 +86,15 @@ def complete_item(
 
 
 def _plan_to_dict(db: Session, plan: DailyPlan) -> dict:
+    catalog = get_catalog(db)
     items = []
     for item in sorted(plan.items, key=lambda i: i.display_order):
-        concept_name = None
-        if item.concept_id:
-            concept = db.query(Concept).get(item.concept_id)
-            concept_name = concept.name if concept else None
-
         items.append(
             {
                 "id": item.id,
                 "item_type": item.item_type,
                 "concept_id": item.concept_id,
-                "concept_name": concept_name,
+                "concept_name": catalog.concept_name(item.concept_id),
                 "duration_minutes": item.duration_minutes,
                 "question_count": item.question_count,
                 "difficulty_range_min": item.difficulty_range_min,
@@ -1,16 +1,23 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import func
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.dependencies import get_current_user, get_db
-from app.models.concept import Concept
+from app.dependencies import (
+    get_async_db,
+    get_current_principal,
+    get_current_principal_async,
+    get_db,
+)
 from app.models.question import Question
-from app.models.topic import Topic
-from app.models.user import User
 from app.schemas.question import BatchRequest, HintResponse, QuestionDetail, QuestionOut
-from app.services.adaptive_engine import get_next_question
+from app.services.adaptive_engine import get_next_question, get_next_questions
+from app.services.catalog import get_catalog
+from app.services.question_sampler import sample_questions
+from app.services.user_cache import Principal
 
 router = APIRouter()
+# Async twins of the hot routes, mounted ahead of `router` when ASYNC_DB is on
+async_router = APIRouter()
 
 
 @router.get("/next", response_model=QuestionOut)
@@ -18,24 +25,43 @@ def next_question(
     topic_id: int | None = None,
     concept_id: int | None = None,
     difficulty: int | None = None,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db),
 ):
     """Get next question using adaptive engine."""
-    question = get_next_question(
-        db, current_user.id, topic_id, concept_id, difficulty
-    )
+    return _next_question(db, current_user.id, topic_id, concept_id, difficulty)
+
+
+@async_router.get("/next", response_model=QuestionOut)
+async def next_question_async(
+    topic_id: int | None = None,
+    concept_id: int | None = None,
+    difficulty: int | None = None,
+    current_user: Principal = Depends(get_current_principal_async),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Get next question using adaptive engine."""
+    return await db.run_sync(_next_question, current_user.id, topic_id, concept_id, difficulty)
+
+
+def _next_question(
+    db: Session,
+    user_id: int,
+    topic_id: int | None,
+    concept_id: int | None,
+    difficulty: int | None,
+) -> QuestionOut:
+    question = get_next_question(db, user_id, topic_id, concept_id, difficulty)
     if not question:
         raise HTTPException(status_code=404, detail="No questions available")
 
-    concept = db.query(Concept).get(question.concept_id)
-    topic = db.query(Topic).get(concept.topic_id) if concept else None
+    catalog = get_catalog(db)
 
-    return QuestionOut(
+    response = QuestionOut(
         id=question.id,
         concept_id=question.concept_id,
-        concept_name=concept.name if concept else None,
-        topic_name=topic.name if topic else None,
+        concept_name=catalog.concept_name(question.concept_id),
+        topic_name=catalog.topic_name_for_concept(question.concept_id),
         text=question.text,
         difficulty=question.difficulty,
         option_a=question.option_a,
@@ -45,12 +71,52 @@ def next_question(
         expected_time_seconds=question.expected_time_seconds,
         tags=question.tags,
     )
+    # End the read transaction so the connection is back in the pool before
+    # the response waits its turn for serialization in the threadpool
+    db.rollback()
+    return response
+
+
+@router.get("/next/batch")
+def next_question_batch(
+    count: int = Query(default=10, ge=1, le=50),
+    topic_id: int | None = None,
+    concept_id: int | None = None,
+    difficulty: int | None = Query(default=None, ge=1, le=5),
+    current_user: Principal = Depends(get_current_principal),
+    db: Session = Depends(get_db),
+):
+    """Get an adaptive set of distinct questions in one pass."""
+    questions = get_next_questions(
+        db, current_user.id, count, topic_id, concept_id, difficulty
+    )
+
+    catalog = get_catalog(db)
+    result = []
+    for q in questions:
+        result.append(
+            {
+                "id": q.id,
+                "concept_id": q.concept_id,
+                "concept_name": catalog.concept_name(q.concept_id),
+                "topic_name": catalog.topic_name_for_concept(q.concept_id),
+                "text": q.text,
+                "difficulty": q.difficulty,
+                "option_a": q.option_a,
+                "option_b": q.option_b,
+                "option_c": q.option_c,
+                "option_d": q.option_d,
+                "expected_time_seconds": q.expected_time_seconds,
+            }
+        )
+
+    return {"questions": result, "count": len(result)}
 
 
 @router.get("/{question_id}", response_model=QuestionDetail)
 def get_question(
     question_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db),
 ):
     """Get full question with solution (for post-answer review)."""
@@ -58,14 +124,13 @@ def get_question(
     if not question:
         raise HTTPException(status_code=404, detail="Question not found")
 
-    concept = db.query(Concept).get(question.concept_id)
-    topic = db.query(Topic).get(concept.topic_id) if concept else None
+    catalog = get_catalog(db)
 
     return QuestionDetail(
         id=question.id,
         concept_id=question.concept_id,
-        concept_name=concept.name if concept else None,
-        topic_name=topic.name if topic else None,
+        concept_name=catalog.concept_name(question.concept_id),
+        topic_name=catalog.topic_name_for_concept(question.concept_id),
         text=question.text,
         difficulty=question.difficulty,
         option_a=question.option_a,
@@ -87,7 +152,7 @@ def get_question(
 @router.get("/{question_id}/hint", response_model=HintResponse)
 def get_hint(
     question_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db),
 ):
     question = db.query(Question).get(question_id)
@@ -99,33 +164,27 @@ def get_hint(
 @router.post("/batch")
 def get_batch(
     request: BatchRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db),
 ):
     """Get a batch of questions for timed sets."""
-    query = db.query(Question).filter(Question.is_active == True)
-
-    if request.topic_id:
-        query = query.join(Concept).filter(Concept.topic_id == request.topic_id)
-    if request.concept_id:
-        query = query.filter(Question.concept_id == request.concept_id)
-    if request.difficulty:
-        query = query.filter(
-            Question.difficulty.between(request.difficulty - 1, request.difficulty + 1)
-        )
-
-    questions = query.order_by(func.random()).limit(request.count).all()
+    questions = sample_questions(
+        db,
+        request.count,
+        topic_id=request.topic_id,
+        concept_id=request.concept_id,
+        difficulty=request.difficulty,
+    )
 
+    catalog = get_catalog(db)
     result = []
     for q in questions:
-        concept = db.query(Concept).get(q.concept_id)
-        topic = db.query(Topic).get(concept.topic_id) if concept else None
         result.append(
             {
                 "id": q.id,
                 "concept_id": q.concept_id,
-                "concept_name": concept.name if concept else None,
-                "topic_name": topic.name if topic else None,
+                "concept_name": catalog.concept_name(q.concept_id),
+                "topic_name": catalog.topic_name_for_concept(q.concept_id),
                 "text": q.text,
                 "difficulty": q.difficulty,
                 "option_a": q.option_a,
@@ -1,58 +1,86 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.dependencies import get_current_user, get_db
+from app.dependencies import (
+    get_async_db,
+    get_current_principal,
+    get_current_principal_async,
+    get_db,
+)
 from app.models.attempt import Attempt
-from app.models.concept import Concept
 from app.models.question import Question
-from app.models.topic import Topic
-from app.models.user import User
 from app.schemas.attempt import MistakeClassification
-from app.services.spaced_repetition import get_due_reviews, get_review_count, process_review
+from app.schemas.review import ReviewBatchRequest
+from app.services.catalog import get_catalog
+from app.services.review_count_cache import get_due_count
+from app.services.spaced_repetition import (
+    get_review_item,
+    get_review_page,
+    process_review,
+    process_reviews,
+)
+from app.services.user_cache import Principal
 
 router = APIRouter()
+# Async twins of the hot routes, mounted ahead of `router` when ASYNC_DB is on
+async_router = APIRouter()
 
 
 @router.get("/queue")
 def review_queue(
-    current_user: User = Depends(get_current_user),
+    cursor: str | None = None,
+    limit: int | None = Query(default=None, ge=1, le=100),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db),
 ):
-    """Get mistakes due for review."""
-    reviews = get_due_reviews(db, current_user.id)
-    result = []
+    """Get mistakes due for review, oldest first; pass next_cursor for more."""
+    return _review_queue(db, current_user.id, cursor, limit)
 
-    for attempt in reviews:
-        question = db.query(Question).get(attempt.question_id)
-        concept = db.query(Concept).get(question.concept_id) if question else None
-        topic = db.query(Topic).get(concept.topic_id) if concept else None
 
-        result.append(
-            {
-                "attempt_id": attempt.id,
-                "question_id": attempt.question_id,
-                "question_text": question.text if question else "",
-                "concept_name": concept.name if concept else "",
-                "topic_name": topic.name if topic else "",
-                "selected_option": attempt.selected_option,
-                "correct_option": question.correct_option if question else "",
-                "mistake_type": attempt.mistake_type,
-                "review_count": attempt.review_count,
-                "next_review_date": attempt.next_review_date.isoformat()
-                if attempt.next_review_date
-                else None,
-            }
-        )
-
-    return {"reviews": result, "count": len(result)}
+@async_router.get("/queue")
+async def review_queue_async(
+    cursor: str | None = None,
+    limit: int | None = Query(default=None, ge=1, le=100),
+    current_user: Principal = Depends(get_current_principal_async),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """Get mistakes due for review, oldest first; pass next_cursor for more."""
+    return await db.run_sync(_review_queue, current_user.id, cursor, limit)
+
+
+def _review_queue(db: Session, user_id: int, cursor: str | None, limit: int | None) -> dict:
+    try:
+        rows, next_cursor = get_review_page(db, user_id, cursor, limit)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    catalog = get_catalog(db)
+
+    result = [
+        {
+            "attempt_id": row.attempt_id,
+            "question_id": row.question_id,
+            "question_text": row.text,
+            "concept_name": catalog.concept_name(row.concept_id) or "",
+            "topic_name": catalog.topic_name_for_concept(row.concept_id) or "",
+            "selected_option": row.selected_option,
+            "correct_option": row.correct_option,
+            "mistake_type": row.mistake_type,
+            "review_count": row.review_count,
+            "next_review_date": row.next_review_date.isoformat(),
+        }
+        for row in rows
+    ]
+
+    return {"reviews": result, "count": len(result), "next_cursor": next_cursor}
 
 
 @router.get("/queue/count")
 def review_count(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db),
 ):
-    count = get_review_count(db, current_user.id)
+    count = get_due_count(db, current_user.id)
     return {"count": count}
 
 
@@ -60,7 +88,7 @@ def review_count(
 def classify_mistake(
     attempt_id: int,
     classification: MistakeClassification,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db),
 ):
     """Classify a mistake type."""
@@ -78,7 +106,7 @@ def classify_mistake(
 def mark_reviewed(
     attempt_id: int,
     body: dict,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db),
 ):
     """Mark a review as completed and schedule next review."""
@@ -86,12 +114,16 @@ def mark_reviewed(
     if not attempt or attempt.user_id != current_user.id:
         raise HTTPException(status_code=404, detail="Attempt not found")
 
+    item = get_review_item(db, current_user.id, attempt.question_id)
+    if not item:
+        raise HTTPException(status_code=404, detail="Attempt is not scheduled for review")
+
     question = db.query(Question).get(attempt.question_id)
     expected_time = question.expected_time_seconds if question else 90
 
     updated = process_review(
         db,
-        attempt,
+        item,
         got_correct=body.get("got_correct", False),
         time_taken=body.get("time_taken", 0),
         expected_time=expected_time,
@@ -99,10 +131,47 @@ def mark_reviewed(
     db.commit()
 
     return {
-        "attempt_id": updated.id,
+        "attempt_id": attempt.id,
         "review_count": updated.review_count,
         "next_review_date": updated.next_review_date.isoformat()
         if updated.next_review_date
         else None,
         "review_interval_days": updated.review_interval_days,
     }
+
+
+@router.post("/batch")
+def mark_reviewed_batch(
+    request: ReviewBatchRequest,
+    current_user: Principal = Depends(get_current_principal),
+    db: Session = Depends(get_db),
+):
+    """Record a whole review session in one transaction."""
+    updated = process_reviews(
+        db,
+        current_user.id,
+        [(r.attempt_id, r.got_correct, r.time_taken) for r in request.reviews],
+    )
+
+    results = []
+    for review in request.reviews:
+        item = updated.get(review.attempt_id)
+        if item is None:
+            results.append({"attempt_id": review.attempt_id, "status": "not_found"})
+            continue
+        results.append(
+            {
+                "attempt_id": review.attempt_id,
+                "status": "reviewed",
+                "review_count": item.review_count,
+                "next_review_date": item.next_review_date.isoformat(),
+                "review_interval_days": item.review_interval_days,
+            }
+        )
+    # Read before the commit expires the items, so they are not reloaded one by one
+    db.commit()
+
+    return {
+        "results": results,
+        "reviewed": sum(1 for r in results if r["status"] == "reviewed"),
+    }
@@ -1,13 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 
-from app.dependencies import get_current_user, get_db
-from app.models.concept import Concept
+from app.dependencies import get_current_principal, get_db
 from app.models.study_session import StudySession
-from app.models.topic import Topic
-from app.models.user import User
 from app.schemas.session import SessionSubmission, StartSessionRequest
+from app.services.catalog import get_catalog
 from app.services.session_service import start_session, submit_session
+from app.services.user_cache import Principal
 
 router = APIRouter()
 
@@ -15,7 +14,7 @@ router = APIRouter()
 @router.post("/start")
 def start(
     request: StartSessionRequest,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db),
 ):
     """Start a new timed session or exam simulation."""
@@ -28,16 +27,15 @@ def start(
         request.difficulty,
     )
 
+    catalog = get_catalog(db)
     question_list = []
     for q in questions:
-        concept = db.query(Concept).get(q.concept_id)
-        topic = db.query(Topic).get(concept.topic_id) if concept else None
         question_list.append(
             {
                 "id": q.id,
                 "concept_id": q.concept_id,
-                "concept_name": concept.name if concept else None,
-                "topic_name": topic.name if topic else None,
+                "concept_name": catalog.concept_name(q.concept_id),
+                "topic_name": catalog.topic_name_for_concept(q.concept_id),
                 "text": q.text,
                 "difficulty": q.difficulty,
                 "option_a": q.option_a,
@@ -60,7 +58,7 @@ def start(
 @router.get("/{session_id}")
 def get_session(
     session_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db),
 ):
     session = db.query(StudySession).get(session_id)
@@ -83,7 +81,7 @@ def get_session(
 def submit(
     session_id: int,
     submission: SessionSubmission,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db),
 ):
     """Submit all answers for a session."""
@@ -98,7 +96,7 @@ def submit(
 
 @router.get("/history/list")
 def session_history(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db),
 ):
     sessions = (
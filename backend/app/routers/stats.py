@@ -1,73 +1,89 @@
-from fastapi import APIRouter, Depends
+from typing import Literal
+
+from fastapi import APIRouter, Depends, Header, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.dependencies import get_current_user, get_db
-from app.models.user import User
-from app.services.stats_service import get_dashboard_data, get_mastery_map, get_trends
+from app.dependencies import (
+    get_async_db,
+    get_current_principal,
+    get_current_principal_async,
+    get_db,
+)
+from app.services.stats_service import (
+    get_dashboard_data,
+    get_heatmap,
+    get_mastery_map,
+    get_trends,
+    get_weakest_concepts,
+)
+from app.services.user_cache import Principal
+from app.utils.etag import etag_matches, json_etag
 
 router = APIRouter()
+# Async twins of the hot routes, mounted ahead of `router` when ASYNC_DB is on
+async_router = APIRouter()
 
 
 @router.get("/dashboard")
 def dashboard(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db),
 ):
     return get_dashboard_data(db, current_user.id)
 
 
+@async_router.get("/dashboard")
+async def dashboard_async(
+    current_user: Principal = Depends(get_current_principal_async),
+    db: AsyncSession = Depends(get_async_db),
+):
+    return await db.run_sync(get_dashboard_data, current_user.id)
+
+
 @router.get("/mastery")
 def mastery_map(
-    current_user: User = Depends(get_current_user),
+    response: Response,
+    if_none_match: str | None = Header(None),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db),
 ):
-    return {"topics": get_mastery_map(db, current_user.id)}
+    payload = {"topics": get_mastery_map(db, current_user.id)}
+    etag = json_etag(payload)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return payload
 
 
 @router.get("/trends")
 def trends(
-    days: int = 7,
-    current_user: User = Depends(get_current_user),
+    days: int = Query(7, ge=1, le=365),
+    bucket: Literal["day", "week", "month"] = "day",
+    topic_id: int | None = None,
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db),
 ):
     return {
-        "daily_trends": get_trends(db, current_user.id, days),
+        "daily_trends": get_trends(db, current_user.id, days, bucket, topic_id),
         "period": f"{days}d",
+        "bucket": bucket,
     }
 
 
-@router.get("/weakest")
-def weakest_concepts(
-    current_user: User = Depends(get_current_user),
+@router.get("/heatmap")
+def heatmap(
+    days: int = Query(365, ge=1, le=366),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db),
 ):
-    from app.models.concept import Concept
-    from app.models.topic import Topic
-    from app.models.user_concept_stats import UserConceptStats
+    return get_heatmap(db, current_user.id, days)
 
-    stats = (
-        db.query(UserConceptStats)
-        .filter(UserConceptStats.user_id == current_user.id)
-        .order_by(UserConceptStats.mastery.asc())
-        .limit(5)
-        .all()
-    )
 
-    result = []
-    for s in stats:
-        concept = db.query(Concept).get(s.concept_id)
-        topic = db.query(Topic).get(concept.topic_id) if concept else None
-        result.append(
-            {
-                "concept_id": s.concept_id,
-                "concept_name": concept.name if concept else "",
-                "topic_name": topic.name if topic else "",
-                "mastery": s.mastery,
-                "accuracy": s.accuracy,
-                "avg_time_seconds": s.avg_time_seconds,
-                "total_attempts": s.total_attempts,
-                "current_streak": s.current_streak,
-            }
-        )
-
-    return result
+@router.get("/weakest")
+def weakest_concepts(
+    current_user: Principal = Depends(get_current_principal),
+    db: Session = Depends(get_db),
+):
+    return get_weakest_concepts(db, current_user.id)
@@ -1,16 +1,16 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 
-from app.dependencies import get_current_user, get_db
-from app.models.user import User
+from app.dependencies import get_current_principal, get_db
 from app.services.streak_service import check_in, get_streak
+from app.services.user_cache import Principal
 
 router = APIRouter()
 
 
 @router.get("/current")
 def current_streak(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db),
 ):
     streak = get_streak(db, current_user.id)
@@ -28,7 +28,7 @@ def current_streak(
 
 @router.post("/checkin")
 def daily_checkin(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
     db: Session = Depends(get_db),
 ):
     streak = check_in(db, current_user.id)
@@ -0,0 +1,11 @@
+from pydantic import BaseModel, Field
+
+
+class ReviewResult(BaseModel):
+    attempt_id: int
+    got_correct: bool = False
+    time_taken: int = Field(default=0, ge=0)
+
+
+class ReviewBatchRequest(BaseModel):
+    reviews: list[ReviewResult] = Field(..., min_length=1, max_length=100)
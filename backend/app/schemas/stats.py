@@ -39,5 +39,6 @@ class TrendPoint(BaseModel):
 
 
 class TrendData(BaseModel):
-    daily_trends: list[TrendPoint]
-    period: str  # "7d" or "30d"
+    daily_trends: list[TrendPoint]  # One point per bucket, oldest first
+    period: str  # "7d", "30d", "90d", ...
+    bucket: str = "day"  # "day", "week" or "month"
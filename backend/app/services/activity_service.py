@@ -0,0 +1,168 @@
+"""
+Activity Service - Per-user daily activity facts.
+
+user_daily_activity keeps one row per (user, UTC day, topic) with attempt,
+correct and time totals, so trends, heatmaps and streak rebuilds read a few
+hundred small rows instead of the attempt history:
+
+    record_activity()         → add answers inside the caller's transaction
+    rebuild_daily_activity()  → recompute rows from attempts (backfill/repair)
+    daily_totals()            → per-day totals over a window (optionally one topic)
+    active_days()             → sorted days with any activity
+"""
+from collections.abc import Iterable
+from datetime import date, datetime
+
+from sqlalchemy import case, delete, func, insert, select
+from sqlalchemy.orm import Session
+
+from app.models.attempt import Attempt
+from app.models.concept import Concept
+from app.models.question import Question
+from app.models.user_daily_activity import UserDailyActivity
+from app.services.catalog import get_catalog
+from app.utils.upsert import upsert_insert
+
+
+def record_activity(
+    db: Session,
+    user_id: int,
+    answers: Iterable[tuple[int, bool, int]],
+    day: date | None = None,
+) -> None:
+    """Add (concept_id, is_correct, time_seconds) answers to the day's rows."""
+    day = day or datetime.utcnow().date()
+    by_topic: dict[int, list[int]] = {}
+    for concept_id, is_correct, time_seconds in answers:
+        topic_id = _topic_for_concept(db, concept_id)
+        if topic_id is None:
+            continue
+        totals = by_topic.setdefault(topic_id, [0, 0, 0])
+        totals[0] += 1
+        totals[1] += int(is_correct)
+        totals[2] += time_seconds
+
+    dialect_insert = upsert_insert(db)
+    for topic_id, (count, correct, time_seconds) in by_topic.items():
+        if dialect_insert is None:
+            _add_fallback(db, user_id, day, topic_id, count, correct, time_seconds)
+            continue
+        stmt = dialect_insert(UserDailyActivity).values(
+            user_id=user_id,
+            activity_date=day,
+            topic_id=topic_id,
+            attempts=count,
+            correct=correct,
+            time_seconds=time_seconds,
+        )
+        db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[
+                    UserDailyActivity.user_id,
+                    UserDailyActivity.activity_date,
+                    UserDailyActivity.topic_id,
+                ],
+                set_={
+                    "attempts": UserDailyActivity.attempts + stmt.excluded.attempts,
+                    "correct": UserDailyActivity.correct + stmt.excluded.correct,
+                    "time_seconds": UserDailyActivity.time_seconds
+                    + stmt.excluded.time_seconds,
+                },
+            )
+        )
+
+
+def rebuild_daily_activity(db: Session, user_ids: list[int] | None = None) -> int:
+    """Recompute rows from attempts; returns the number of rows written."""
+    day = func.date(Attempt.created_at)
+    source = (
+        select(
+            Attempt.user_id,
+            day,
+            Concept.topic_id,
+            func.count(Attempt.id),
+            func.sum(case((Attempt.is_correct == True, 1), else_=0)),
+            func.coalesce(func.sum(Attempt.time_taken_seconds), 0),
+        )
+        .join(Question, Attempt.question_id == Question.id)
+        .join(Concept, Question.concept_id == Concept.id)
+        .where(Attempt.created_at != None)
+        .group_by(Attempt.user_id, day, Concept.topic_id)
+    )
+    scope = delete(UserDailyActivity)
+    if user_ids is not None:
+        source = source.where(Attempt.user_id.in_(user_ids))
+        scope = scope.where(UserDailyActivity.user_id.in_(user_ids))
+
+    db.execute(scope)
+    result = db.execute(
+        insert(UserDailyActivity).from_select(
+            ["user_id", "activity_date", "topic_id", "attempts", "correct", "time_seconds"],
+            source,
+        )
+    )
+    return result.rowcount
+
+
+def daily_totals(
+    db: Session, user_id: int, first_day: date, topic_id: int | None = None
+) -> dict[date, tuple[int, int, int]]:
+    """(attempts, correct, time sum) per active day since first_day."""
+    query = db.query(
+        UserDailyActivity.activity_date,
+        func.sum(UserDailyActivity.attempts),
+        func.sum(UserDailyActivity.correct),
+        func.sum(UserDailyActivity.time_seconds),
+    ).filter(
+        UserDailyActivity.user_id == user_id,
+        UserDailyActivity.activity_date >= first_day,
+    )
+    if topic_id is not None:
+        query = query.filter(UserDailyActivity.topic_id == topic_id)
+    rows = query.group_by(UserDailyActivity.activity_date).all()
+    return {day: (total, correct, time_sum) for day, total, correct, time_sum in rows}
+
+
+def active_days(db: Session, user_id: int) -> list[date]:
+    return [
+        day
+        for (day,) in db.query(UserDailyActivity.activity_date)
+        .filter(UserDailyActivity.user_id == user_id)
+        .distinct()
+        .order_by(UserDailyActivity.activity_date)
+        .all()
+    ]
+
+
+def _topic_for_concept(db: Session, concept_id: int) -> int | None:
+    concept = get_catalog(db).concepts.get(concept_id)
+    if concept:
+        return concept.topic_id
+    # Added since this worker's catalog snapshot
+    return db.query(Concept.topic_id).filter(Concept.id == concept_id).scalar()
+
+
+def _add_fallback(db, user_id, day, topic_id, count, correct, time_seconds) -> None:
+    row = (
+        db.query(UserDailyActivity)
+        .filter(
+            UserDailyActivity.user_id == user_id,
+            UserDailyActivity.activity_date == day,
+            UserDailyActivity.topic_id == topic_id,
+        )
+        .first()
+    )
+    if not row:
+        row = UserDailyActivity(
+            user_id=user_id,
+            activity_date=day,
+            topic_id=topic_id,
+            attempts=0,
+            correct=0,
+            time_seconds=0,
+        )
+        db.add(row)
+    row.attempts += count
+    row.correct += correct
+    row.time_seconds += time_seconds
+    db.flush()
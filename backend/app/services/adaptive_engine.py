@@ -7,17 +7,27 @@ Priority scoring:
              + (1 - accuracy) * 0.20       # Low accuracy concepts
              + review_urgency * 0.20       # Spaced repetition items
              + topic_deficit * 0.10        # Topic balance
+
+Scoring runs as NumPy array ops over all concepts at once
+(_calculate_top_priorities); _calculate_priorities is the scalar reference.
+
+Lookahead mode (ADAPTIVE_LOOKAHEAD = K > 0) plans K questions per pass and
+serves unfiltered /questions/next calls from a per-user queue until mastery
+updates shift priorities enough to invalidate it.
 """
 import random
-from datetime import datetime
+from datetime import datetime, timedelta
 
+import numpy as np
 from sqlalchemy.orm import Session
 
-from app.models.attempt import Attempt
+from app.config import settings
 from app.models.concept import Concept
 from app.models.question import Question
-from app.models.topic import Topic
 from app.models.user_concept_stats import UserConceptStats
+from app.services import lookahead_queue
+from app.services.catalog import CatalogSnapshot, ConceptEntry, QuestionEntry, get_catalog
+from app.services.seen_index import get_seen, is_seen, seen_for_concept
 
 W_MASTERY = 0.35
 W_STALENESS = 0.15
@@ -25,6 +35,13 @@ W_ACCURACY = 0.20
 W_REVIEW = 0.20
 W_BALANCE = 0.10
 
+TOP_N = 5
+
+_EPOCH = datetime(1970, 1, 1)
+_ONE_US = timedelta(microseconds=1)
+_ONE_DAY_US = 86_400_000_000
+_NEVER = -(2**62)
+
 
 def get_next_question(
     db: Session,
@@ -38,25 +55,23 @@ def get_next_question(
     if concept_id:
         return _find_question(db, user_id, concept_id, difficulty)
 
+    # Lookahead mode: serve unfiltered requests from the precomputed queue
+    if settings.ADAPTIVE_LOOKAHEAD > 0 and not topic_id and not difficulty:
+        question = _next_from_lookahead(db, user_id, settings.ADAPTIVE_LOOKAHEAD)
+        if question:
+            return question
+
     # Get all concepts (filtered by topic if specified)
-    concepts_query = db.query(Concept)
-    if topic_id:
-        concepts_query = concepts_query.filter(Concept.topic_id == topic_id)
-    all_concepts = concepts_query.all()
+    all_concepts = get_catalog(db).concepts_for_topic(topic_id or None)
 
     if not all_concepts:
         return None
 
     # Get user stats for all concepts
-    user_stats = {
-        s.concept_id: s
-        for s in db.query(UserConceptStats)
-        .filter(UserConceptStats.user_id == user_id)
-        .all()
-    }
+    user_stats = _load_user_stats(db, user_id)
 
     # Calculate priorities
-    priorities = _calculate_priorities(all_concepts, user_stats)
+    priorities = _calculate_top_priorities(all_concepts, user_stats, TOP_N)
     if not priorities:
         return None
 
@@ -71,8 +86,129 @@ def get_next_question(
     return _find_question(db, user_id, selected["concept_id"], target_diff)
 
 
+def note_stats_change(user_id: int, mastery_delta: float, accuracy_delta: float) -> None:
+    """Feed a mastery update into the user's lookahead queue invalidation."""
+    shift = abs(mastery_delta) * W_MASTERY + abs(accuracy_delta) * W_ACCURACY
+    lookahead_queue.record_drift(user_id, shift)
+
+
+def _next_from_lookahead(db: Session, user_id: int, k: int) -> Question | None:
+    """Serve the next queued question, planning k more when the queue is empty."""
+    while (item := lookahead_queue.pop(user_id)) is not None:
+        concept_id, question_id = item
+        if is_seen(seen_for_concept(db, user_id, concept_id), question_id):
+            continue
+        question = db.get(Question, question_id)
+        if question and question.is_active:
+            return question
+
+    planned = _plan_questions(db, user_id, k, top_up=False)
+    if not planned:
+        return None
+    lookahead_queue.fill(user_id, planned[1:])
+    return db.get(Question, planned[0][1])
+
+
+def get_next_questions(
+    db: Session,
+    user_id: int,
+    count: int,
+    topic_id: int | None = None,
+    concept_id: int | None = None,
+    difficulty: int | None = None,
+) -> list[Question]:
+    """Select count distinct questions with one load of stats and seen-set."""
+    planned = _plan_questions(db, user_id, count, topic_id, concept_id, difficulty)
+    if not planned:
+        return []
+
+    ids = [question_id for _, question_id in planned]
+    by_id = {q.id: q for q in db.query(Question).filter(Question.id.in_(ids)).all()}
+    return [by_id[qid] for qid in ids if qid in by_id]
+
+
+def _plan_questions(
+    db: Session,
+    user_id: int,
+    count: int,
+    topic_id: int | None = None,
+    concept_id: int | None = None,
+    difficulty: int | None = None,
+    top_up: bool = True,
+) -> list[tuple[int, int]]:
+    """Draw up to count distinct questions in one adaptive pass.
+
+    Concepts are drawn from the top-5 window, which slides down the ranking
+    as concepts run out of questions. Unanswered questions near the target
+    difficulty come first; answered ones only top up an exhausted bank.
+    Returns (concept_id, question_id) pairs in serving order.
+    """
+    catalog = get_catalog(db)
+    if concept_id:
+        concepts = [c for c in [catalog.concepts.get(concept_id)] if c]
+    else:
+        concepts = catalog.concepts_for_topic(topic_id or None)
+    if not concepts:
+        return []
+
+    user_stats = _load_user_stats(db, user_id)
+    ranking = _calculate_top_priorities(concepts, user_stats, TOP_N + count)
+    seen = get_seen(db, user_id)
+
+    planned: list[tuple[int, int]] = []
+    taken: set[int] = set()
+    pool, ranking = ranking[:TOP_N], ranking[TOP_N:]
+    while pool and len(planned) < count:
+        selected = _select_concept(pool)
+        cid = selected["concept_id"]
+        target_diff = _calculate_target_difficulty(user_stats.get(cid), difficulty)
+        concept_seen = seen.get(cid, ())
+        question_id = _pick_unseen(
+            _candidates(catalog, cid, target_diff), concept_seen, taken
+        )
+        if question_id is None and not difficulty:
+            question_id = _pick_unseen(_candidates(catalog, cid), concept_seen, taken)
+        if question_id is None:
+            # Nothing left to serve from this concept; widen the window
+            pool.remove(selected)
+            if ranking:
+                pool.append(ranking.pop(0))
+            continue
+        planned.append((cid, question_id))
+        taken.add(question_id)
+
+    # Bank exhausted — top up with already-answered questions
+    for c in concepts if top_up else ():
+        if len(planned) >= count:
+            break
+        for entry in _candidates(catalog, c.id, difficulty):
+            if len(planned) >= count:
+                break
+            if entry.id not in taken:
+                planned.append((c.id, entry.id))
+                taken.add(entry.id)
+    return planned
+
+
+def _load_user_stats(db: Session, user_id: int) -> dict:
+    """Fetch only the stats columns the engine scores on, keyed by concept."""
+    rows = (
+        db.query(
+            UserConceptStats.concept_id,
+            UserConceptStats.mastery,
+            UserConceptStats.accuracy,
+            UserConceptStats.total_attempts,
+            UserConceptStats.current_streak,
+            UserConceptStats.last_seen,
+        )
+        .filter(UserConceptStats.user_id == user_id)
+        .all()
+    )
+    return {row.concept_id: row for row in rows}
+
+
 def _calculate_priorities(
-    concepts: list[Concept],
+    concepts: list[Concept] | list[ConceptEntry],
     user_stats: dict[int, UserConceptStats],
 ) -> list[dict]:
     """Calculate priority scores for all concepts."""
@@ -131,9 +267,109 @@ def _calculate_priorities(
     return scores
 
 
+def _calculate_top_priorities(
+    concepts: list[Concept] | list[ConceptEntry],
+    user_stats: dict[int, UserConceptStats],
+    top_n: int | None = TOP_N,
+    now: datetime | None = None,
+) -> list[dict]:
+    """Vectorized _calculate_priorities, returning only the top_n entries.
+
+    Ties keep concept order, exactly like the stable sort in the scalar path.
+    """
+    n = len(concepts)
+    if n == 0:
+        return []
+    now_us = ((now or datetime.utcnow()) - _EPOCH) // _ONE_US
+
+    concept_ids = np.fromiter((c.id for c in concepts), dtype=np.int64, count=n)
+    topic_ids = np.fromiter((c.topic_id for c in concepts), dtype=np.int64, count=n)
+
+    mastery = np.zeros(n)
+    accuracy = np.zeros(n)
+    attempts = np.zeros(n)
+    last_seen_us = np.full(n, _NEVER, dtype=np.int64)
+
+    # One pass over the user's stats, then scatter onto concept positions
+    rows = [
+        (
+            s.concept_id,
+            s.mastery,
+            s.accuracy,
+            s.total_attempts,
+            (s.last_seen - _EPOCH) // _ONE_US if s.last_seen else _NEVER,
+        )
+        for s in user_stats.values()
+        if s is not None
+    ]
+    if rows:
+        stat_ids, stat_mastery, stat_accuracy, stat_attempts, stat_seen = zip(*rows)
+        stat_ids = np.array(stat_ids, dtype=np.int64)
+        order = np.argsort(concept_ids, kind="stable")
+        found = np.minimum(np.searchsorted(concept_ids[order], stat_ids), n - 1)
+        matched = concept_ids[order][found] == stat_ids
+        pos = order[found[matched]]
+
+        mastery[pos] = np.array(stat_mastery, dtype=float)[matched]
+        accuracy[pos] = np.array(stat_accuracy, dtype=float)[matched]
+        attempts[pos] = np.array(stat_attempts, dtype=float)[matched]
+        last_seen_us[pos] = np.array(stat_seen, dtype=np.int64)[matched]
+
+    seen = last_seen_us != _NEVER
+    days_since = np.full(n, 30, dtype=np.int64)  # Never seen = very stale
+    days_since[seen] = (now_us - last_seen_us[seen]) // _ONE_DAY_US
+    staleness = np.minimum(days_since / 30.0, 1.0)
+
+    review_urgency = np.select(
+        [
+            ~seen,
+            (mastery < 0.3) & (days_since > 3),
+            (mastery < 0.6) & (days_since > 7),
+            (mastery < 0.8) & (days_since > 14),
+            days_since > 21,
+        ],
+        [0.5, 1.0, 0.8, 0.6, 0.4],
+        default=0.0,
+    )
+
+    priority = (
+        (1 - mastery) * W_MASTERY
+        + staleness * W_STALENESS
+        + (1 - accuracy) * W_ACCURACY
+        + review_urgency * W_REVIEW
+    )
+
+    # Topic balance factor
+    _, topic_idx = np.unique(topic_ids, return_inverse=True)
+    topic_attempts = np.bincount(topic_idx, weights=attempts)
+    total_attempts = topic_attempts.sum() or 1
+    expected_ratio = 1.0 / len(topic_attempts)
+    deficit = np.maximum(0, expected_ratio - topic_attempts[topic_idx] / total_attempts)
+    priority += deficit * W_BALANCE
+
+    # Top-N without sorting everything; keep every tie at the cut-off
+    k = n if top_n is None else min(top_n, n)
+    if k < n:
+        cutoff = priority[np.argpartition(-priority, k - 1)[k - 1]]
+        candidates = np.flatnonzero(priority >= cutoff)
+    else:
+        candidates = np.arange(n)
+    ranked = candidates[np.lexsort((candidates, -priority[candidates]))][:k]
+
+    return [
+        {
+            "concept_id": int(concept_ids[i]),
+            "topic_id": int(topic_ids[i]),
+            "mastery": float(mastery[i]),
+            "priority": float(priority[i]),
+        }
+        for i in ranked
+    ]
+
+
 def _select_concept(priorities: list[dict]) -> dict:
     """Weighted random from top 5 priority concepts."""
-    top_n = priorities[:5]
+    top_n = priorities[:TOP_N]
     weights = [max(s["priority"], 0.01) for s in top_n]
     return random.choices(top_n, weights=weights, k=1)[0]
 
@@ -194,37 +430,33 @@ def _find_question(
     difficulty: int | None = None,
 ) -> Question | None:
     """Find an unanswered question, or least recently answered."""
-    # Get IDs of questions already answered by user for this concept
-    answered_ids = [
-        a.question_id
-        for a in db.query(Attempt.question_id)
-        .filter(Attempt.user_id == user_id)
-        .join(Question)
-        .filter(Question.concept_id == concept_id)
-        .all()
-    ]
+    candidates = _candidates(get_catalog(db), concept_id, difficulty)
+    if not candidates:
+        return None
 
     # Try to find unanswered question
-    query = db.query(Question).filter(
-        Question.concept_id == concept_id,
-        Question.is_active == True,
-    )
-    if difficulty:
-        query = query.filter(Question.difficulty.between(difficulty - 1, difficulty + 1))
-    if answered_ids:
-        query = query.filter(Question.id.notin_(answered_ids))
+    question_id = _pick_unseen(candidates, seen_for_concept(db, user_id, concept_id))
+    if question_id is not None:
+        return db.get(Question, question_id)
 
-    question = query.order_by(Question.difficulty).first()
+    # All questions answered — return least recently attempted
+    return db.get(Question, min(q.id for q in candidates))
 
-    if question:
-        return question
 
-    # All questions answered — return least recently attempted
-    query = (
-        db.query(Question)
-        .filter(Question.concept_id == concept_id, Question.is_active == True)
-    )
+def _candidates(
+    catalog: CatalogSnapshot, concept_id: int, difficulty: int | None = None
+) -> list[QuestionEntry] | tuple[QuestionEntry, ...]:
+    """Active questions for a concept within ±1 of difficulty, easiest first."""
+    candidates = catalog.questions_by_concept.get(concept_id, ())
     if difficulty:
-        query = query.filter(Question.difficulty.between(difficulty - 1, difficulty + 1))
+        candidates = [
+            q for q in candidates if difficulty - 1 <= q.difficulty <= difficulty + 1
+        ]
+    return candidates
+
 
-    return query.first()
+def _pick_unseen(candidates, seen, exclude: set[int] = frozenset()) -> int | None:
+    for entry in candidates:
+        if entry.id not in exclude and not is_seen(seen, entry.id):
+            return entry.id
+    return None
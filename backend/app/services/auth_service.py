@@ -1,18 +1,59 @@
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
+from app.config import settings
 from app.models.user import User
 from app.models.streak import Streak
-from app.utils.security import hash_password, verify_password, create_access_token
+from app.services.user_cache import principal_claims
+from app.utils.security import (
+    create_access_token,
+    hash_password_async,
+    needs_rehash,
+    verify_password_async,
+)
 
+# register_user / authenticate_user are coroutines: bcrypt runs in the hash
+# pool while the database work runs in the threadpool, so a login storm only
+# queues on the pool instead of pinning every threadpool slot.
 
-def register_user(db: Session, email: str, password: str, full_name: str) -> User:
-    existing = db.query(User).filter(User.email == email).first()
-    if existing:
+
+async def register_user(db: Session, email: str, password: str, full_name: str) -> User:
+    if await run_in_threadpool(_email_taken, db, email):
+        raise ValueError("Email already registered")
+    hashed_password = await hash_password_async(password)
+    return await run_in_threadpool(_create_user, db, email, hashed_password, full_name)
+
+
+async def authenticate_user(db: Session, email: str, password: str) -> User | None:
+    user = await run_in_threadpool(_find_user, db, email)
+    if not user or not await verify_password_async(password, user.hashed_password):
+        return None
+    if needs_rehash(user.hashed_password):
+        hashed_password = await hash_password_async(password)
+        await run_in_threadpool(_store_hash, db, user, hashed_password)
+    return user
+
+
+def create_token_for_user(user: User) -> str:
+    data = {"sub": str(user.id)}
+    if settings.TOKEN_EMBED_CLAIMS:
+        data.update(principal_claims(user))
+    return create_access_token(data=data)
+
+
+def _email_taken(db: Session, email: str) -> bool:
+    taken = db.query(User.id).filter(User.email == email).first() is not None
+    db.rollback()
+    return taken
+
+
+def _create_user(db: Session, email: str, hashed_password: str, full_name: str) -> User:
+    if _email_taken(db, email):
         raise ValueError("Email already registered")
 
     user = User(
         email=email,
-        hashed_password=hash_password(password),
+        hashed_password=hashed_password,
         full_name=full_name,
     )
     db.add(user)
@@ -23,15 +64,23 @@ def register_user(db: Session, email: str, password: str, full_name: str) -> Use
     db.add(streak)
     db.commit()
     db.refresh(user)
+    db.expunge(user)
+    db.rollback()
     return user
 
 
-def authenticate_user(db: Session, email: str, password: str) -> User | None:
+def _find_user(db: Session, email: str) -> User | None:
+    """Load a detached user and release the connection before hashing."""
     user = db.query(User).filter(User.email == email).first()
-    if not user or not verify_password(password, user.hashed_password):
-        return None
+    if user:
+        db.expunge(user)
+    db.rollback()
     return user
 
 
-def create_token_for_user(user: User) -> str:
-    return create_access_token(data={"sub": str(user.id)})
+def _store_hash(db: Session, user: User, hashed_password: str) -> None:
+    db.query(User).filter(User.id == user.id).update(
+        {User.hashed_password: hashed_password}, synchronize_session=False
+    )
+    db.commit()
+    user.hashed_password = hashed_password
@@ -0,0 +1,173 @@
+"""
+Catalog Cache - Per-process, read-mostly snapshot of the question catalog.
+
+Topics, concepts and active-question metadata only change through the admin
+endpoints, so every worker keeps one immutable snapshot in memory:
+
+    get_catalog(db)        → current snapshot (loaded on first use)
+    load_catalog(db)       → rebuild the snapshot now (called at startup)
+    invalidate_catalog()   → drop the snapshot after an admin write
+
+Every rebuild bumps the snapshot version. Other gunicorn workers do not see an
+invalidation, so snapshots also expire after CATALOG_CACHE_TTL_SECONDS.
+"""
+import threading
+import time
+from array import array
+from dataclasses import dataclass, field
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.concept import Concept
+from app.models.question import Question
+from app.models.topic import Topic
+
+
+@dataclass(frozen=True)
+class TopicEntry:
+    id: int
+    name: str
+    slug: str
+    weight_in_exam: float
+    display_order: int
+
+
+@dataclass(frozen=True)
+class ConceptEntry:
+    id: int
+    topic_id: int
+    name: str
+    slug: str
+    display_order: int
+
+
+@dataclass(frozen=True)
+class QuestionEntry:
+    id: int
+    concept_id: int
+    difficulty: int
+    expected_time_seconds: int
+
+
+@dataclass(frozen=True)
+class CatalogSnapshot:
+    version: int
+    loaded_at: float
+    topics: dict[int, TopicEntry] = field(default_factory=dict)
+    concepts: dict[int, ConceptEntry] = field(default_factory=dict)
+    # Active questions only, sorted by (difficulty, id) within each concept
+    questions_by_concept: dict[int, tuple[QuestionEntry, ...]] = field(
+        default_factory=dict
+    )
+    # Active question ids bucketed by (concept_id, difficulty), for sampling
+    question_buckets: dict[tuple[int, int], array] = field(default_factory=dict)
+    # Active question id → concept id
+    question_concepts: dict[int, int] = field(default_factory=dict)
+
+    def concept_name(self, concept_id: int | None) -> str | None:
+        concept = self.concepts.get(concept_id)
+        return concept.name if concept else None
+
+    def topic_name_for_concept(self, concept_id: int | None) -> str | None:
+        concept = self.concepts.get(concept_id)
+        topic = self.topics.get(concept.topic_id) if concept else None
+        return topic.name if topic else None
+
+    def concepts_for_topic(self, topic_id: int | None = None) -> list[ConceptEntry]:
+        return [
+            c
+            for c in self.concepts.values()
+            if topic_id is None or c.topic_id == topic_id
+        ]
+
+
+_lock = threading.Lock()
+_snapshot: CatalogSnapshot | None = None
+_version = 0
+
+
+def get_catalog(db: Session) -> CatalogSnapshot:
+    """Return the current snapshot, loading it if missing or expired."""
+    snapshot = _snapshot
+    if snapshot is None or _is_expired(snapshot):
+        return load_catalog(db)
+    return snapshot
+
+
+def load_catalog(db: Session) -> CatalogSnapshot:
+    """Rebuild the snapshot from the database and publish it."""
+    global _snapshot, _version
+
+    topics = {
+        t.id: TopicEntry(
+            id=t.id,
+            name=t.name,
+            slug=t.slug,
+            weight_in_exam=t.weight_in_exam,
+            display_order=t.display_order or 0,
+        )
+        for t in db.query(Topic).all()
+    }
+    concepts = {
+        c.id: ConceptEntry(
+            id=c.id,
+            topic_id=c.topic_id,
+            name=c.name,
+            slug=c.slug,
+            display_order=c.display_order or 0,
+        )
+        for c in db.query(Concept).all()
+    }
+
+    rows = (
+        db.query(
+            Question.id,
+            Question.concept_id,
+            Question.difficulty,
+            Question.expected_time_seconds,
+        )
+        .filter(Question.is_active == True)
+        .order_by(Question.concept_id, Question.difficulty, Question.id)
+        .all()
+    )
+    grouped: dict[int, list[QuestionEntry]] = {}
+    buckets: dict[tuple[int, int], array] = {}
+    question_concepts: dict[int, int] = {}
+    for qid, concept_id, difficulty, expected_time in rows:
+        question_concepts[qid] = concept_id
+        buckets.setdefault((concept_id, difficulty), array("I")).append(qid)
+        grouped.setdefault(concept_id, []).append(
+            QuestionEntry(
+                id=qid,
+                concept_id=concept_id,
+                difficulty=difficulty,
+                expected_time_seconds=expected_time,
+            )
+        )
+
+    with _lock:
+        _version += 1
+        snapshot = CatalogSnapshot(
+            version=_version,
+            loaded_at=time.monotonic(),
+            topics=topics,
+            concepts=concepts,
+            questions_by_concept={cid: tuple(qs) for cid, qs in grouped.items()},
+            question_buckets=buckets,
+            question_concepts=question_concepts,
+        )
+        _snapshot = snapshot
+    return snapshot
+
+
+def invalidate_catalog() -> None:
+    """Drop the snapshot so the next reader reloads it."""
+    global _snapshot
+    with _lock:
+        _snapshot = None
+
+
+def _is_expired(snapshot: CatalogSnapshot) -> bool:
+    ttl = settings.CATALOG_CACHE_TTL_SECONDS
+    return ttl > 0 and time.monotonic() - snapshot.loaded_at > ttl
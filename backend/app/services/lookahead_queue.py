@@ -0,0 +1,85 @@
+"""
+Lookahead Queue - Bounded per-user queue of precomputed next questions.
+
+When ADAPTIVE_LOOKAHEAD > 0 the adaptive engine plans several questions in
+one pass and parks the rest here as (concept_id, question_id) pairs. A queue
+is dropped once mastery updates have shifted the user's priorities by
+LOOKAHEAD_REORDER_THRESHOLD in total, and expires after LOOKAHEAD_TTL_SECONDS
+because staleness keeps changing with time.
+"""
+import threading
+import time
+from collections import OrderedDict, deque
+
+from app.config import settings
+
+_lock = threading.Lock()
+_queues: "OrderedDict[int, _Entry]" = OrderedDict()
+
+
+class _Entry:
+    __slots__ = ("filled_at", "items", "drift")
+
+    def __init__(self, items: list[tuple[int, int]]):
+        self.filled_at = time.monotonic()
+        self.items = deque(items)
+        self.drift = 0.0
+
+
+def pop(user_id: int) -> tuple[int, int] | None:
+    """Take the next queued (concept_id, question_id) for a user, if any."""
+    with _lock:
+        entry = _queues.get(user_id)
+        if not entry:
+            return None
+        if _is_expired(entry.filled_at) or not entry.items:
+            del _queues[user_id]
+            return None
+        item = entry.items.popleft()
+        if not entry.items:
+            del _queues[user_id]
+        return item
+
+
+def fill(user_id: int, items: list[tuple[int, int]]) -> None:
+    """Replace a user's queue with freshly planned questions."""
+    with _lock:
+        if not items:
+            _queues.pop(user_id, None)
+            return
+        _queues[user_id] = _Entry(items)
+        _queues.move_to_end(user_id)
+        while len(_queues) > settings.LOOKAHEAD_MAX_USERS:
+            _queues.popitem(last=False)
+
+
+def record_drift(user_id: int, shift: float) -> None:
+    """Accumulate a priority shift; drop the queue once it is large enough."""
+    with _lock:
+        entry = _queues.get(user_id)
+        if not entry:
+            return
+        entry.drift += shift
+        if entry.drift >= settings.LOOKAHEAD_REORDER_THRESHOLD:
+            del _queues[user_id]
+
+
+def invalidate(user_id: int) -> None:
+    with _lock:
+        _queues.pop(user_id, None)
+
+
+def queued(user_id: int) -> int:
+    with _lock:
+        entry = _queues.get(user_id)
+        return len(entry.items) if entry else 0
+
+
+def clear_lookahead() -> None:
+    with _lock:
+        _queues.clear()
+
+
+def _is_expired(filled_at: float) -> bool:
+    ttl = settings.LOOKAHEAD_TTL_SECONDS
+    return ttl > 0 and time.monotonic() - filled_at > ttl
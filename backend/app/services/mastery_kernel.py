@@ -0,0 +1,188 @@
+"""
+Mastery Kernel - Pure mastery math, free of ORM and clock access.
+
+    apply_event(state, event)       → next MasteryState for one answer
+    replay(state, events)           → fold an ordered event list
+    replay_streams(states, streams) → replay many (user, concept) streams at
+                                      once, vectorized across streams
+
+Update rules (per answer):
+    correct + fast  → mastery += 0.08 * (1 - mastery), streak += 1
+    correct + slow  → mastery += 0.04 * (1 - mastery), streak += 1
+    correct + guess → mastery += 0.01, streak reset
+    wrong           → mastery -= 0.06 * mastery, streak reset
+    time            → EMA: avg * 0.8 + taken * 0.2 (first answer seeds it)
+
+mastery_service (per answer), session_service (bulk submit) and the offline
+recompute job all go through this module, so changing a constant here
+changes every path at once.
+"""
+from collections.abc import Hashable, Iterable, Sequence
+from dataclasses import dataclass, replace
+from datetime import datetime
+
+import numpy as np
+
+FAST_GAIN = 0.08
+SLOW_GAIN = 0.04
+GUESS_GAIN = 0.01
+WRONG_LOSS = 0.06
+TIME_EMA_KEEP = 0.8
+TIME_EMA_NEW = 0.2
+
+
+@dataclass(frozen=True, slots=True)
+class MasteryState:
+    mastery: float = 0.0
+    difficulty_comfort: int = 1
+    total_attempts: int = 0
+    correct_attempts: int = 0
+    accuracy: float = 0.0
+    avg_time_seconds: float = 0.0
+    current_streak: int = 0
+    best_streak: int = 0
+    last_seen: datetime | None = None
+    last_correct: datetime | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class AttemptEvent:
+    is_correct: bool
+    was_guessed: bool
+    time_taken: int
+    difficulty: int
+    expected_time: int
+    at: datetime
+
+
+def apply_event(state: MasteryState, event: AttemptEvent) -> MasteryState:
+    """Return the state after one answer."""
+    total = state.total_attempts + 1
+    correct = state.correct_attempts + (1 if event.is_correct else 0)
+
+    if state.avg_time_seconds == 0:
+        avg_time = event.time_taken
+    else:
+        avg_time = (
+            state.avg_time_seconds * TIME_EMA_KEEP
+            + event.time_taken * TIME_EMA_NEW
+        )
+
+    mastery = state.mastery
+    streak = state.current_streak
+    best = state.best_streak
+    comfort = state.difficulty_comfort
+    last_correct = state.last_correct
+
+    if event.is_correct and not event.was_guessed:
+        gain = FAST_GAIN if event.time_taken <= event.expected_time else SLOW_GAIN
+        mastery = min(1.0, mastery + gain * (1 - mastery))
+        streak += 1
+        best = max(best, streak)
+        last_correct = event.at
+        comfort = max(comfort, event.difficulty)
+    elif event.is_correct:
+        mastery = min(1.0, mastery + GUESS_GAIN)
+        streak = 0
+    else:
+        mastery = max(0.0, mastery - WRONG_LOSS * mastery)
+        streak = 0
+
+    return replace(
+        state,
+        mastery=mastery,
+        difficulty_comfort=comfort,
+        total_attempts=total,
+        correct_attempts=correct,
+        accuracy=correct / total,
+        avg_time_seconds=avg_time,
+        current_streak=streak,
+        best_streak=best,
+        last_seen=event.at,
+        last_correct=last_correct,
+    )
+
+
+def replay(state: MasteryState, events: Iterable[AttemptEvent]) -> MasteryState:
+    for event in events:
+        state = apply_event(state, event)
+    return state
+
+
+def replay_streams(
+    states: dict[Hashable, MasteryState],
+    streams: dict[Hashable, Sequence[AttemptEvent]],
+) -> dict[Hashable, MasteryState]:
+    """Replay every stream from its starting state (default: empty), vectorized.
+
+    Streams advance in lockstep: step i applies each stream's i-th event to
+    all streams that have one. Streams are ordered longest first so the
+    active ones are always a prefix of the arrays.
+    """
+    keys = sorted(streams, key=lambda k: len(streams[k]), reverse=True)
+    if not keys:
+        return {}
+    start = [states.get(k) or MasteryState() for k in keys]
+    lengths = np.array([len(streams[k]) for k in keys])
+
+    mastery = np.array([s.mastery for s in start], dtype=np.float64)
+    comfort = np.array([s.difficulty_comfort for s in start], dtype=np.int64)
+    total = np.array([s.total_attempts for s in start], dtype=np.int64)
+    correct = np.array([s.correct_attempts for s in start], dtype=np.int64)
+    avg_time = np.array([s.avg_time_seconds for s in start], dtype=np.float64)
+    streak = np.array([s.current_streak for s in start], dtype=np.int64)
+    best = np.array([s.best_streak for s in start], dtype=np.int64)
+    # Index of the last (correct) event seen in each stream; -1 = keep start value
+    last_seen_step = np.full(len(keys), -1, dtype=np.int64)
+    last_correct_step = np.full(len(keys), -1, dtype=np.int64)
+
+    for step in range(int(lengths[0])):
+        n = int(np.count_nonzero(lengths > step))
+        events = [streams[k][step] for k in keys[:n]]
+        is_correct = np.fromiter((e.is_correct for e in events), dtype=bool, count=n)
+        guessed = np.fromiter((bool(e.was_guessed) for e in events), dtype=bool, count=n)
+        taken = np.fromiter((e.time_taken for e in events), dtype=np.float64, count=n)
+        expected = np.fromiter((e.expected_time for e in events), dtype=np.float64, count=n)
+        difficulty = np.fromiter((e.difficulty for e in events), dtype=np.int64, count=n)
+
+        m = mastery[:n]
+        solid = is_correct & ~guessed
+        lucky = is_correct & guessed
+        gain = np.where(taken <= expected, FAST_GAIN, SLOW_GAIN)
+        mastery[:n] = np.where(
+            solid,
+            np.minimum(1.0, m + gain * (1 - m)),
+            np.where(lucky, np.minimum(1.0, m + GUESS_GAIN), np.maximum(0.0, m - WRONG_LOSS * m)),
+        )
+
+        total[:n] += 1
+        correct[:n] += is_correct
+        a = avg_time[:n]
+        avg_time[:n] = np.where(
+            a == 0, taken, a * TIME_EMA_KEEP + taken * TIME_EMA_NEW
+        )
+        streak[:n] = np.where(solid, streak[:n] + 1, 0)
+        best[:n] = np.maximum(best[:n], streak[:n])
+        comfort[:n] = np.where(solid, np.maximum(comfort[:n], difficulty), comfort[:n])
+        last_seen_step[:n] = step
+        last_correct_step[:n] = np.where(solid, step, last_correct_step[:n])
+
+    result = {}
+    for i, key in enumerate(keys):
+        events = streams[key]
+        seen_step, correct_step = int(last_seen_step[i]), int(last_correct_step[i])
+        result[key] = MasteryState(
+            mastery=float(mastery[i]),
+            difficulty_comfort=int(comfort[i]),
+            total_attempts=int(total[i]),
+            correct_attempts=int(correct[i]),
+            accuracy=float(correct[i] / total[i]) if total[i] else start[i].accuracy,
+            avg_time_seconds=float(avg_time[i]),
+            current_streak=int(streak[i]),
+            best_streak=int(best[i]),
+            last_seen=events[seen_step].at if seen_step >= 0 else start[i].last_seen,
+            last_correct=(
+                events[correct_step].at if correct_step >= 0 else start[i].last_correct
+            ),
+        )
+    return result
@@ -1,19 +1,29 @@
 """
 Mastery Service - Updates per-concept mastery after each attempt.
 
-Mastery update formula:
+Mastery update formula (see mastery_kernel for the pure implementation):
     correct + fast  → mastery += 0.08 * (1 - current_mastery)
     correct + slow  → mastery += 0.04 * (1 - current_mastery)
     correct + guess → mastery += 0.01
     wrong           → mastery -= 0.06 * current_mastery, add to review queue
+
+This module does the ORM side: loading stats rows, converting them to and
+from MasteryState, and scheduling wrong answers for review.
 """
-from datetime import datetime, timedelta
+from dataclasses import fields
+from datetime import datetime
 
 from sqlalchemy.orm import Session
 
 from app.models.attempt import Attempt
 from app.models.question import Question
 from app.models.user_concept_stats import UserConceptStats
+from app.services.adaptive_engine import note_stats_change
+from app.services.mastery_kernel import AttemptEvent, MasteryState, apply_event
+from app.services.spaced_repetition import schedule_reviews
+from app.utils.upsert import upsert_insert
+
+MASTERY_FIELDS = tuple(f.name for f in fields(MasteryState))
 
 
 def get_or_create_stats(
@@ -34,51 +44,115 @@ def get_or_create_stats(
     return stats
 
 
+def load_stats_for_concepts(
+    db: Session, user_id: int, concept_ids: set[int]
+) -> dict[int, UserConceptStats]:
+    """Fetch a user's stats rows for several concepts at once, creating missing ones."""
+    stats = {
+        s.concept_id: s
+        for s in db.query(UserConceptStats).filter(
+            UserConceptStats.user_id == user_id,
+            UserConceptStats.concept_id.in_(concept_ids),
+        )
+    }
+    for concept_id in concept_ids - stats.keys():
+        stats[concept_id] = UserConceptStats(
+            user_id=user_id,
+            concept_id=concept_id,
+            mastery=0.0,
+            difficulty_comfort=1,
+            total_attempts=0,
+            correct_attempts=0,
+            accuracy=0.0,
+            avg_time_seconds=0.0,
+            current_streak=0,
+            best_streak=0,
+        )
+        db.add(stats[concept_id])
+    return stats
+
+
 def update_mastery(
     db: Session, user_id: int, question: Question, attempt: Attempt
 ) -> tuple[UserConceptStats, float]:
     """Update mastery and return (stats, mastery_change)."""
     stats = get_or_create_stats(db, user_id, question.concept_id)
-    old_mastery = stats.mastery
-
-    stats.total_attempts += 1
-    if attempt.is_correct:
-        stats.correct_attempts += 1
-    stats.accuracy = stats.correct_attempts / stats.total_attempts
-
-    # Running average for time
-    if stats.avg_time_seconds == 0:
-        stats.avg_time_seconds = attempt.time_taken_seconds
-    else:
-        stats.avg_time_seconds = (
-            stats.avg_time_seconds * 0.8 + attempt.time_taken_seconds * 0.2
-        )
+    now = datetime.utcnow()
+    mastery_change = apply_attempt(
+        stats,
+        user_id,
+        AttemptEvent(
+            is_correct=attempt.is_correct,
+            was_guessed=attempt.was_guessed,
+            time_taken=attempt.time_taken_seconds,
+            difficulty=question.difficulty,
+            expected_time=question.expected_time_seconds,
+            at=now,
+        ),
+    )
+    if not attempt.is_correct:
+        # Schedule for review (spaced repetition)
+        schedule_reviews(db, user_id, {question.id: attempt.id}, now)
+    return stats, mastery_change
 
-    is_fast = attempt.time_taken_seconds <= question.expected_time_seconds
-
-    if attempt.is_correct and not attempt.was_guessed:
-        delta = 0.08 * (1 - stats.mastery) if is_fast else 0.04 * (1 - stats.mastery)
-        stats.mastery = min(1.0, stats.mastery + delta)
-        stats.current_streak += 1
-        stats.best_streak = max(stats.best_streak, stats.current_streak)
-        stats.last_correct = datetime.utcnow()
-
-        # Update difficulty comfort
-        stats.difficulty_comfort = max(stats.difficulty_comfort, question.difficulty)
-    elif attempt.is_correct and attempt.was_guessed:
-        stats.mastery = min(1.0, stats.mastery + 0.01)
-        stats.current_streak = 0
-    else:
-        # Wrong answer
-        delta = 0.06 * stats.mastery
-        stats.mastery = max(0.0, stats.mastery - delta)
-        stats.current_streak = 0
 
-        # Schedule for review (spaced repetition)
-        attempt.next_review_date = datetime.utcnow() + timedelta(days=1)
-        attempt.review_interval_days = 1
-        attempt.review_count = 0
+def apply_attempt(stats: UserConceptStats, user_id: int, event: AttemptEvent) -> float:
+    """Apply one answer to an in-memory stats row; returns the mastery change."""
+    old = state_from_stats(stats)
+    new = apply_event(old, event)
+    store_state(stats, new)
+    mastery_change = new.mastery - old.mastery
+    note_stats_change(user_id, mastery_change, new.accuracy - old.accuracy)
+    return mastery_change
 
-    stats.last_seen = datetime.utcnow()
-    mastery_change = stats.mastery - old_mastery
-    return stats, mastery_change
+
+def state_from_stats(stats: UserConceptStats) -> MasteryState:
+    return MasteryState(
+        mastery=stats.mastery,
+        difficulty_comfort=stats.difficulty_comfort,
+        total_attempts=stats.total_attempts,
+        correct_attempts=stats.correct_attempts,
+        accuracy=stats.accuracy,
+        avg_time_seconds=stats.avg_time_seconds,
+        current_streak=stats.current_streak,
+        best_streak=stats.best_streak,
+        last_seen=stats.last_seen,
+        last_correct=stats.last_correct,
+    )
+
+
+def store_state(stats: UserConceptStats, state: MasteryState) -> None:
+    for field, value in _state_values(state).items():
+        setattr(stats, field, value)
+
+
+def upsert_states(db: Session, states: dict[tuple[int, int], MasteryState]) -> None:
+    """Write (user_id, concept_id) → state in bulk, inserting missing rows."""
+    if not states:
+        return
+    rows = [
+        {"user_id": user_id, "concept_id": concept_id, **_state_values(state)}
+        for (user_id, concept_id), state in states.items()
+    ]
+
+    dialect_insert = upsert_insert(db)
+    if dialect_insert is None:
+        for row in rows:
+            stats = get_or_create_stats(db, row["user_id"], row["concept_id"])
+            for field in MASTERY_FIELDS:
+                setattr(stats, field, row[field])
+        db.flush()
+        return
+
+    stmt = dialect_insert(UserConceptStats.__table__)
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=["user_id", "concept_id"],
+            set_={field: stmt.excluded[field] for field in MASTERY_FIELDS},
+        ),
+        rows,
+    )
+
+
+def _state_values(state: MasteryState) -> dict:
+    return {field: getattr(state, field) for field in MASTERY_FIELDS}
@@ -9,15 +9,17 @@ Plan structure for N minutes:
 """
 from datetime import date
 
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from app.models.daily_plan import DailyPlan, DailyPlanItem, PlanItemType
-from app.models.user import User, StudentLevel
+from app.models.user import StudentLevel
 from app.models.user_concept_stats import UserConceptStats
-from app.services.spaced_repetition import get_review_count
+from app.services.review_count_cache import get_due_count
+from app.services.user_cache import Principal
 
 
-def get_or_generate_today_plan(db: Session, user: User) -> DailyPlan:
+def get_or_generate_today_plan(db: Session, user: Principal) -> DailyPlan:
     """Get today's plan or generate a new one."""
     today = date.today()
     existing = (
@@ -27,10 +29,19 @@ def get_or_generate_today_plan(db: Session, user: User) -> DailyPlan:
     )
     if existing:
         return existing
-    return generate_daily_plan(db, user)
+    try:
+        return generate_daily_plan(db, user)
+    except IntegrityError:
+        # Created meanwhile by another request or the pre-generation job
+        db.rollback()
+        return (
+            db.query(DailyPlan)
+            .filter(DailyPlan.user_id == user.id, DailyPlan.date == today)
+            .one()
+        )
 
 
-def generate_daily_plan(db: Session, user: User) -> DailyPlan:
+def generate_daily_plan(db: Session, user: Principal) -> DailyPlan:
     """Generate a personalized daily plan."""
     today = date.today()
     total_minutes = user.daily_minutes
@@ -45,9 +56,33 @@ def generate_daily_plan(db: Session, user: User) -> DailyPlan:
         db.delete(existing)
         db.flush()
 
-    # Get weakest concepts
     weakest = _get_weakest_concepts(db, user.id, count=3)
-    review_count = get_review_count(db, user.id)
+    review_count = get_due_count(db, user.id)
+
+    plan = DailyPlan(
+        user_id=user.id,
+        date=today,
+        total_minutes=total_minutes,
+    )
+    db.add(plan)
+    db.flush()
+
+    db.add_all(
+        DailyPlanItem(plan_id=plan.id, **item)
+        for item in build_plan_items(user, weakest, review_count)
+    )
+    db.commit()
+    db.refresh(plan)
+    return plan
+
+
+def build_plan_items(user: Principal, weakest, review_count: int) -> list[dict]:
+    """DailyPlanItem column values for one plan, in display order.
+
+    weakest holds up to three rows with concept_id and difficulty_comfort,
+    weakest first. Pure, so batch generation can build plans off-session.
+    """
+    total_minutes = user.daily_minutes
 
     # Calculate time allocation
     warmup_min = max(5, int(total_minutes * 0.12))
@@ -63,93 +98,69 @@ def generate_daily_plan(db: Session, user: User) -> DailyPlan:
         warmup_min = max(5, warmup_min - 2)
         sprint_min += 2
 
-    plan = DailyPlan(
-        user_id=user.id,
-        date=today,
-        total_minutes=total_minutes,
-    )
-    db.add(plan)
-    db.flush()
-
     items = []
-    order = 0
 
     # 1. Warm-up
     items.append(
-        DailyPlanItem(
-            plan_id=plan.id,
+        dict(
             item_type=PlanItemType.WARMUP.value,
             duration_minutes=warmup_min,
             question_count=max(3, warmup_min // 2),
             difficulty_range_min=1,
             difficulty_range_max=2,
-            display_order=order,
         )
     )
-    order += 1
 
     # 2. Weak topic drills
     if weakest:
         drill_per = drill_min // len(weakest)
         for stats in weakest:
             items.append(
-                DailyPlanItem(
-                    plan_id=plan.id,
+                dict(
                     item_type=PlanItemType.WEAK_TOPIC_DRILL.value,
                     concept_id=stats.concept_id,
                     duration_minutes=max(5, drill_per),
                     question_count=max(3, drill_per // 2),
                     difficulty_range_min=stats.difficulty_comfort,
                     difficulty_range_max=min(stats.difficulty_comfort + 1, 5),
-                    display_order=order,
                 )
             )
-            order += 1
     else:
         # No stats yet — general mixed practice
         items.append(
-            DailyPlanItem(
-                plan_id=plan.id,
+            dict(
                 item_type=PlanItemType.MIXED_PRACTICE.value,
                 duration_minutes=drill_min,
                 question_count=max(5, drill_min // 2),
                 difficulty_range_min=1,
                 difficulty_range_max=3,
-                display_order=order,
             )
         )
-        order += 1
 
     # 3. Timed sprint
     items.append(
-        DailyPlanItem(
-            plan_id=plan.id,
+        dict(
             item_type=PlanItemType.TIMED_SPRINT.value,
             duration_minutes=sprint_min,
             question_count=max(5, sprint_min),
             difficulty_range_min=2,
             difficulty_range_max=4,
-            display_order=order,
         )
     )
-    order += 1
 
     # 4. Mistake review
     if review_min > 0:
         items.append(
-            DailyPlanItem(
-                plan_id=plan.id,
+            dict(
                 item_type=PlanItemType.MISTAKE_REVIEW.value,
                 duration_minutes=review_min,
                 question_count=min(review_count, max(3, review_min // 2)),
-                display_order=order,
             )
         )
 
-    db.add_all(items)
-    db.commit()
-    db.refresh(plan)
-    return plan
+    for order, item in enumerate(items):
+        item["display_order"] = order
+    return items
 
 
 def _get_weakest_concepts(
@@ -159,7 +170,7 @@ def _get_weakest_concepts(
     return (
         db.query(UserConceptStats)
         .filter(UserConceptStats.user_id == user_id)
-        .order_by(UserConceptStats.mastery.asc())
+        .order_by(UserConceptStats.mastery.asc(), UserConceptStats.id.asc())
         .limit(count)
         .all()
     )
@@ -0,0 +1,123 @@
+"""
+Question Sampler - Uniform random question sets without ORDER BY random().
+
+Strategies (selected by QUESTION_SAMPLER):
+    catalog          → draw ids from the catalog's in-memory (concept, difficulty)
+                       buckets, then load just those rows by primary key
+    order_by_random  → ORDER BY random() LIMIT n in the database (legacy;
+                       sorts every matching row on each call)
+
+Both return a uniform sample without replacement of the active questions
+matching the filters. New strategies are added with register_sampler().
+"""
+import random
+from bisect import bisect_right
+from collections.abc import Callable
+from itertools import accumulate
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.concept import Concept
+from app.models.question import Question
+from app.services.catalog import get_catalog
+
+Sampler = Callable[..., list[Question]]
+
+_SAMPLERS: dict[str, Sampler] = {}
+
+
+def register_sampler(name: str, sampler: Sampler) -> None:
+    _SAMPLERS[name] = sampler
+
+
+def sample_questions(
+    db: Session,
+    count: int,
+    topic_id: int | None = None,
+    concept_id: int | None = None,
+    difficulty: int | None = None,
+    strategy: str | None = None,
+) -> list[Question]:
+    """Pick up to count random active questions matching the filters."""
+    name = strategy or settings.QUESTION_SAMPLER
+    sampler = _SAMPLERS.get(name)
+    if sampler is None:
+        raise ValueError(f"Unknown question sampler: {name}")
+    return sampler(db, count, topic_id, concept_id, difficulty)
+
+
+def _sample_order_by_random(
+    db: Session,
+    count: int,
+    topic_id: int | None,
+    concept_id: int | None,
+    difficulty: int | None,
+) -> list[Question]:
+    query = db.query(Question).filter(Question.is_active == True)
+    if topic_id:
+        query = query.join(Concept).filter(Concept.topic_id == topic_id)
+    if concept_id:
+        query = query.filter(Question.concept_id == concept_id)
+    if difficulty:
+        query = query.filter(Question.difficulty.between(difficulty - 1, difficulty + 1))
+    return query.order_by(func.random()).limit(count).all()
+
+
+def _sample_catalog(
+    db: Session,
+    count: int,
+    topic_id: int | None,
+    concept_id: int | None,
+    difficulty: int | None,
+) -> list[Question]:
+    catalog = get_catalog(db)
+
+    if concept_id:
+        concept = catalog.concepts.get(concept_id)
+        concept_ids = {concept_id} if concept else set()
+        if concept and topic_id and concept.topic_id != topic_id:
+            concept_ids = set()
+    else:
+        concept_ids = {c.id for c in catalog.concepts_for_topic(topic_id or None)}
+
+    buckets = [
+        bucket
+        for (cid, level), bucket in catalog.question_buckets.items()
+        if cid in concept_ids
+        and (
+            not difficulty
+            or (level is not None and difficulty - 1 <= level <= difficulty + 1)
+        )
+    ]
+    ids = _draw(buckets, count)
+    if not ids:
+        return []
+
+    # Catalog may lag behind another worker's admin edits; re-check is_active
+    by_id = {
+        q.id: q
+        for q in db.query(Question)
+        .filter(Question.id.in_(ids), Question.is_active == True)
+        .all()
+    }
+    return [by_id[qid] for qid in ids if qid in by_id]
+
+
+def _draw(buckets: list, count: int) -> list[int]:
+    """Uniform sample without replacement across the concatenated buckets."""
+    offsets = list(accumulate(len(b) for b in buckets))
+    total = offsets[-1] if offsets else 0
+    picks = random.sample(range(total), min(count, total))
+
+    ids = []
+    for pick in picks:
+        i = bisect_right(offsets, pick)
+        start = offsets[i - 1] if i else 0
+        ids.append(buckets[i][pick - start])
+    return ids
+
+
+register_sampler("catalog", _sample_catalog)
+register_sampler("order_by_random", _sample_order_by_random)
@@ -0,0 +1,102 @@
+"""
+Review Count Cache - Per-user count of due review items.
+
+Clients poll /review/queue/count, so get_due_count() keeps the count per
+user together with the time the next not-yet-due item becomes due:
+
+    get_due_count()          → cached count, recomputed in one query on a miss
+    invalidate_due_count()   → drop a user after their review items change
+    clear_due_count_cache()  → drop everything (tests)
+
+An entry stays valid until that next due time, when the count grows by
+itself, or until REVIEW_COUNT_TTL_SECONDS passes, so changes made by
+another worker are picked up. schedule_reviews() and process_review()
+invalidate the entry in this worker once their transaction commits. A
+count loaded while such an invalidation ran is returned but not cached.
+"""
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+
+from sqlalchemy import case, func
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.review_item import ReviewItem
+
+_lock = threading.Lock()
+# user_id → (cached at, due count, next due date or None)
+_entries: "OrderedDict[int, tuple[float, int, datetime | None]]" = OrderedDict()
+# user_id → [generation, loads in flight], only while a load is running.
+# invalidate_due_count() bumps the generation; a load that started before
+# the bump read rows that changed since and is not stored.
+_loading: dict[int, list[int]] = {}
+
+
+def get_due_count(db: Session, user_id: int) -> int:
+    """Number of the user's review items due now."""
+    now = datetime.utcnow()
+    with _lock:
+        entry = _entries.get(user_id)
+        if entry and _is_fresh(entry, now):
+            _entries.move_to_end(user_id)
+            return entry[1]
+        state = _loading.setdefault(user_id, [0, 0])
+        state[1] += 1
+        generation = state[0]
+
+    loaded = None
+    try:
+        loaded = _load(db, user_id, now)
+    finally:
+        with _lock:
+            state[1] -= 1
+            if state[1] == 0:
+                del _loading[user_id]
+            if (
+                loaded is not None
+                and state[0] == generation
+                and settings.REVIEW_COUNT_TTL_SECONDS > 0
+            ):
+                _entries[user_id] = (time.monotonic(), *loaded)
+                _entries.move_to_end(user_id)
+                while len(_entries) > settings.REVIEW_COUNT_MAX_USERS:
+                    _entries.popitem(last=False)
+    return loaded[0]
+
+
+def invalidate_due_count(user_id: int) -> None:
+    with _lock:
+        _entries.pop(user_id, None)
+        state = _loading.get(user_id)
+        if state:
+            state[0] += 1
+
+
+def clear_due_count_cache() -> None:
+    with _lock:
+        _entries.clear()
+        for state in _loading.values():
+            state[0] += 1
+
+
+def _is_fresh(entry: tuple[float, int, datetime | None], now: datetime) -> bool:
+    cached_at, _, next_due = entry
+    if time.monotonic() - cached_at >= settings.REVIEW_COUNT_TTL_SECONDS:
+        return False
+    return next_due is None or now < next_due
+
+
+def _load(db: Session, user_id: int, now: datetime) -> tuple[int, datetime | None]:
+    """Due count and the earliest future due date, in one pass over the user's items."""
+    is_due = ReviewItem.next_review_date <= now
+    count, next_due = (
+        db.query(
+            func.count(case((is_due, 1))),
+            func.min(case((~is_due, ReviewItem.next_review_date))),
+        )
+        .filter(ReviewItem.user_id == user_id)
+        .one()
+    )
+    return count, next_due
@@ -0,0 +1,114 @@
+"""
+Rollup Service - Lifetime attempt counters per user.
+
+user_rollups holds total/correct/time-sum counters so dashboards read one
+row instead of aggregating a user's whole attempt history:
+
+    record_attempts()  → add to the counters inside the caller's transaction
+    ensure_rollup()    → create an empty row if the user has none
+    rebuild_rollups()  → recompute counters from attempts (backfill/repair)
+
+Increments are a single INSERT ... ON CONFLICT DO UPDATE so concurrent
+writers (other workers, other requests) never lose an update.
+"""
+from datetime import datetime
+
+from sqlalchemy import case, delete, func, insert, select
+from sqlalchemy.orm import Session
+
+from app.models.attempt import Attempt
+from app.models.user_rollup import UserRollup
+from app.utils.upsert import upsert_insert
+
+
+def record_attempts(
+    db: Session, user_id: int, count: int, correct: int, time_seconds: int
+) -> None:
+    """Add attempts to a user's counters (committed with the attempts)."""
+    if count <= 0:
+        return
+    values = {
+        "user_id": user_id,
+        "total_attempts": count,
+        "correct_attempts": correct,
+        "total_time_seconds": time_seconds,
+        "updated_at": datetime.utcnow(),
+    }
+
+    dialect_insert = upsert_insert(db)
+    if dialect_insert is None:
+        rollup = _get_or_create(db, user_id)
+        rollup.total_attempts += count
+        rollup.correct_attempts += correct
+        rollup.total_time_seconds += time_seconds
+        db.flush()
+        return
+
+    stmt = dialect_insert(UserRollup).values(**values)
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[UserRollup.user_id],
+            set_={
+                "total_attempts": UserRollup.total_attempts + stmt.excluded.total_attempts,
+                "correct_attempts": UserRollup.correct_attempts
+                + stmt.excluded.correct_attempts,
+                "total_time_seconds": UserRollup.total_time_seconds
+                + stmt.excluded.total_time_seconds,
+                "updated_at": stmt.excluded.updated_at,
+            },
+        )
+    )
+
+
+def ensure_rollup(db: Session, user_id: int) -> None:
+    """Create a zeroed row for a user that has none yet."""
+    dialect_insert = upsert_insert(db)
+    if dialect_insert is None:
+        _get_or_create(db, user_id)
+        return
+    db.execute(
+        dialect_insert(UserRollup)
+        .values(user_id=user_id, updated_at=datetime.utcnow())
+        .on_conflict_do_nothing(index_elements=[UserRollup.user_id])
+    )
+
+
+def rebuild_rollups(db: Session, user_ids: list[int] | None = None) -> int:
+    """Recompute counters from attempts; returns the number of rows written."""
+    scope = delete(UserRollup)
+    source = select(
+        Attempt.user_id,
+        func.count(Attempt.id),
+        func.sum(case((Attempt.is_correct == True, 1), else_=0)),
+        func.coalesce(func.sum(Attempt.time_taken_seconds), 0),
+        func.now(),
+    ).group_by(Attempt.user_id)
+    if user_ids is not None:
+        scope = scope.where(UserRollup.user_id.in_(user_ids))
+        source = source.where(Attempt.user_id.in_(user_ids))
+
+    db.execute(scope)
+    result = db.execute(
+        insert(UserRollup).from_select(
+            [
+                "user_id",
+                "total_attempts",
+                "correct_attempts",
+                "total_time_seconds",
+                "updated_at",
+            ],
+            source,
+        )
+    )
+    return result.rowcount
+
+
+def _get_or_create(db: Session, user_id: int) -> UserRollup:
+    rollup = db.query(UserRollup).filter(UserRollup.user_id == user_id).first()
+    if not rollup:
+        rollup = UserRollup(
+            user_id=user_id, total_attempts=0, correct_attempts=0, total_time_seconds=0
+        )
+        db.add(rollup)
+        db.flush()
+    return rollup
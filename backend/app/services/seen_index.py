@@ -0,0 +1,113 @@
+"""
+Seen Index - Per-user record of which questions a student has answered.
+
+Layout:
+    {user_id: {concept_id: array('I') of sorted question ids}}
+
+A user's entry is built from attempts on first use, then kept current by
+mark_seen() as new attempts are recorded. Entries are LRU-bounded by
+SEEN_INDEX_MAX_USERS and expire after SEEN_INDEX_TTL_SECONDS, so attempts
+handled by another worker are picked up eventually.
+"""
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.attempt import Attempt
+from app.models.question import Question
+from app.services.catalog import get_catalog
+
+_EMPTY = array("I")
+
+_lock = threading.Lock()
+_entries: "OrderedDict[int, tuple[float, dict[int, array]]]" = OrderedDict()
+
+
+def get_seen(db: Session, user_id: int) -> dict[int, array]:
+    """Return the user's seen question ids grouped by concept."""
+    with _lock:
+        entry = _entries.get(user_id)
+        if entry and not _is_expired(entry[0]):
+            _entries.move_to_end(user_id)
+            return entry[1]
+
+    by_concept = _load(db, user_id)
+    with _lock:
+        _entries[user_id] = (time.monotonic(), by_concept)
+        _entries.move_to_end(user_id)
+        while len(_entries) > settings.SEEN_INDEX_MAX_USERS:
+            _entries.popitem(last=False)
+    return by_concept
+
+
+def seen_for_concept(db: Session, user_id: int, concept_id: int) -> array:
+    return get_seen(db, user_id).get(concept_id, _EMPTY)
+
+
+def is_seen(seen: array, question_id: int) -> bool:
+    i = bisect_left(seen, question_id)
+    return i < len(seen) and seen[i] == question_id
+
+
+def mark_seen(user_id: int, concept_id: int, question_id: int) -> None:
+    """Record an answered question for a user whose index is loaded."""
+    with _lock:
+        entry = _entries.get(user_id)
+        if not entry:
+            return  # Built from attempts on next use
+        ids = entry[1].setdefault(concept_id, array("I"))
+        i = bisect_left(ids, question_id)
+        if i == len(ids) or ids[i] != question_id:
+            ids.insert(i, question_id)
+
+
+def invalidate_user(user_id: int) -> None:
+    with _lock:
+        _entries.pop(user_id, None)
+
+
+def clear_seen_index() -> None:
+    with _lock:
+        _entries.clear()
+
+
+def _load(db: Session, user_id: int) -> dict[int, array]:
+    # Only the user's slice of ix_attempts_user_question; concepts come from
+    # the catalog rather than a join that would walk the questions table
+    question_ids = [
+        qid
+        for (qid,) in db.query(Attempt.question_id)
+        .filter(Attempt.user_id == user_id)
+        .distinct()
+        .order_by(Attempt.question_id)
+        .all()
+    ]
+    concept_of = get_catalog(db).question_concepts
+    missing = [qid for qid in question_ids if qid not in concept_of]
+    if missing:
+        # Inactive, or added since this worker's snapshot
+        concept_of = {
+            **concept_of,
+            **dict(
+                db.query(Question.id, Question.concept_id)
+                .filter(Question.id.in_(missing))
+                .all()
+            ),
+        }
+
+    by_concept: dict[int, array] = {}
+    for qid in question_ids:
+        concept_id = concept_of.get(qid)
+        if concept_id is not None:
+            by_concept.setdefault(concept_id, array("I")).append(qid)
+    return by_concept
+
+
+def _is_expired(loaded_at: float) -> bool:
+    ttl = settings.SEEN_INDEX_TTL_SECONDS
+    return ttl > 0 and time.monotonic() - loaded_at > ttl
@@ -1,14 +1,21 @@
 """Session Service - Manages timed sets and exam simulations."""
 from datetime import datetime
 
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 
 from app.models.attempt import Attempt
-from app.models.concept import Concept
 from app.models.question import Question
 from app.models.study_session import StudySession
-from app.models.topic import Topic
-from app.services.mastery_service import update_mastery
+from app.services.activity_service import record_activity
+from app.services.catalog import get_catalog
+from app.services.mastery_kernel import AttemptEvent
+from app.services.mastery_service import apply_attempt, load_stats_for_concepts
+from app.services.question_sampler import sample_questions
+from app.services.rollup_service import record_attempts
+from app.services.seen_index import mark_seen
+from app.services.spaced_repetition import schedule_reviews
+from app.utils.after_commit import after_commit
 
 
 def start_session(
@@ -28,17 +35,10 @@ def start_session(
     db.add(session)
     db.flush()
 
-    # Select questions
-    query = db.query(Question).filter(Question.is_active == True)
-    if topic_id:
-        query = query.join(Concept).filter(Concept.topic_id == topic_id)
-    if difficulty:
-        query = query.filter(
-            Question.difficulty.between(difficulty - 1, difficulty + 1)
-        )
-
-    # Randomize and limit
-    questions = query.order_by(func.random()).limit(question_count).all()
+    # Select random questions
+    questions = sample_questions(
+        db, question_count, topic_id=topic_id, difficulty=difficulty
+    )
     db.commit()
     return session, questions
 
@@ -54,12 +54,34 @@ def submit_session(
     if not session or session.user_id != user_id:
         raise ValueError("Session not found")
 
+    catalog = get_catalog(db)
+    now = datetime.utcnow()
+
+    # Prefetch every answered question, then every affected stats row
+    question_ids = {answer["question_id"] for answer in answers}
+    questions = {
+        q.id: q
+        for q in db.query(
+            Question.id,
+            Question.concept_id,
+            Question.difficulty,
+            Question.correct_option,
+            Question.expected_time_seconds,
+        ).filter(Question.id.in_(question_ids))
+    }
+    stats_by_concept = load_stats_for_concepts(
+        db, user_id, {q.concept_id for q in questions.values()}
+    )
+
     correct_count = 0
     total_time = 0
+    recorded = []
+    attempt_rows = []
     topic_stats: dict[str, dict] = {}
 
+    # Mastery is applied in memory, in answer order
     for answer in answers:
-        question = db.query(Question).get(answer["question_id"])
+        question = questions.get(answer["question_id"])
         if not question:
             continue
 
@@ -70,25 +92,36 @@ def submit_session(
             correct_count += 1
         total_time += time_taken
 
-        # Record attempt
-        attempt = Attempt(
-            user_id=user_id,
-            question_id=question.id,
-            selected_option=answer["selected_option"],
-            is_correct=is_correct,
-            time_taken_seconds=time_taken,
-            session_id=session_id,
+        apply_attempt(
+            stats_by_concept[question.concept_id],
+            user_id,
+            AttemptEvent(
+                is_correct=is_correct,
+                was_guessed=False,
+                time_taken=time_taken,
+                difficulty=question.difficulty,
+                expected_time=question.expected_time_seconds,
+                at=now,
+            ),
         )
-        db.add(attempt)
-        db.flush()
-
-        # Update mastery
-        update_mastery(db, user_id, question, attempt)
+        attempt_rows.append(
+            {
+                "user_id": user_id,
+                "question_id": question.id,
+                "selected_option": answer["selected_option"],
+                "is_correct": is_correct,
+                "time_taken_seconds": time_taken,
+                "was_guessed": False,
+                "hint_used": False,
+                "session_id": session_id,
+                "created_at": now,
+            }
+        )
+        recorded.append((question.concept_id, is_correct, time_taken))
+        after_commit(db, mark_seen, user_id, question.concept_id, question.id)
 
         # Track per-topic stats
-        concept = db.query(Concept).get(question.concept_id)
-        topic = db.query(Topic).get(concept.topic_id) if concept else None
-        topic_name = topic.name if topic else "Unknown"
+        topic_name = catalog.topic_name_for_concept(question.concept_id) or "Unknown"
 
         if topic_name not in topic_stats:
             topic_stats[topic_name] = {"correct": 0, "total": 0, "time": 0}
@@ -97,10 +130,27 @@ def submit_session(
             topic_stats[topic_name]["correct"] += 1
         topic_stats[topic_name]["time"] += time_taken
 
+    if attempt_rows:
+        # Core table insert → one executemany (the ORM bulk path inserts row by row here)
+        attempts = Attempt.__table__
+        inserted = db.execute(
+            insert(attempts).returning(attempts.c.id, attempts.c.question_id, attempts.c.is_correct),
+            attempt_rows,
+        )
+        # Wrong answers are scheduled for review (spaced repetition). RETURNING
+        # rows come back unordered; the latest wrong attempt per question wins
+        wrong: dict[int, int] = {}
+        for attempt_id, question_id, is_correct in inserted:
+            if not is_correct:
+                wrong[question_id] = max(attempt_id, wrong.get(question_id, 0))
+        schedule_reviews(db, user_id, wrong, now)
+    record_attempts(db, user_id, len(recorded), correct_count, total_time)
+    record_activity(db, user_id, recorded, day=now.date())
+
     # Update session
     session.correct_count = correct_count
     session.total_time_seconds = total_time
-    session.ended_at = datetime.utcnow()
+    session.ended_at = now
     session.is_completed = True
     db.commit()
 
@@ -136,6 +186,3 @@ def submit_session(
         "score_percentile": None,
     }
 
-
-# Need this import for func.random()
-from sqlalchemy import func
@@ -5,41 +5,161 @@ Interval progression: 1 -> 3 -> 7 -> 14 -> 30 days
 - Correct + fast on review: advance to next interval
 - Correct + slow: stay at current interval
 - Wrong on review: reset to 1 day
+
+Review state lives in review_items, one row per (user, question), so the
+due queue never touches the attempts table:
+
+    schedule_reviews()  → (re)schedule wrong answers, inside the caller's transaction
+    get_review_page()   → one page of due items, keyset-paged on (next_review_date, id)
+    process_review()    → record a review and schedule the next one
+    process_reviews()   → the same for a batch, loaded in one query
+
+A repeated mistake on the same question resets its item rather than adding
+another one. Both writers invalidate the user's cached due count
+(review_count_cache).
 """
 from datetime import datetime, timedelta
 
+from sqlalchemy import and_, tuple_
 from sqlalchemy.orm import Session
 
+from app.config import settings
 from app.models.attempt import Attempt
+from app.models.question import Question
+from app.models.review_item import ReviewItem
+from app.services.review_count_cache import invalidate_due_count
+from app.utils.after_commit import after_commit
+from app.utils.upsert import upsert_insert
 
 INTERVALS = [1, 3, 7, 14, 30]
+# Reset when a question is answered wrong again
+_SCHEDULE_FIELDS = ("attempt_id", "next_review_date", "review_interval_days", "review_count")
+
+
+def schedule_reviews(
+    db: Session, user_id: int, wrong: dict[int, int], now: datetime | None = None
+) -> None:
+    """Schedule question_id → wrong attempt_id for review tomorrow (upsert)."""
+    if not wrong:
+        return
+    # After commit, so a poll in between cannot cache the rows being replaced
+    after_commit(db, invalidate_due_count, user_id)
+    due = (now or datetime.utcnow()) + timedelta(days=INTERVALS[0])
+    rows = [
+        {
+            "user_id": user_id,
+            "question_id": question_id,
+            "attempt_id": attempt_id,
+            "next_review_date": due,
+            "review_interval_days": INTERVALS[0],
+            "review_count": 0,
+        }
+        for question_id, attempt_id in wrong.items()
+    ]
 
+    dialect_insert = upsert_insert(db)
+    if dialect_insert is None:
+        for row in rows:
+            item = get_review_item(db, user_id, row["question_id"])
+            if item is None:
+                db.add(ReviewItem(**row))
+            else:
+                for field, value in row.items():
+                    setattr(item, field, value)
+        db.flush()
+        return
 
-def get_due_reviews(db: Session, user_id: int, limit: int = 20) -> list[Attempt]:
-    """Get attempts due for review today."""
+    stmt = dialect_insert(ReviewItem.__table__)
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=["user_id", "question_id"],
+            set_={field: stmt.excluded[field] for field in _SCHEDULE_FIELDS},
+        ),
+        rows,
+    )
+
+
+def get_review_item(db: Session, user_id: int, question_id: int) -> ReviewItem | None:
     return (
-        db.query(Attempt)
+        db.query(ReviewItem)
+        .filter(ReviewItem.user_id == user_id, ReviewItem.question_id == question_id)
+        .first()
+    )
+
+
+def get_due_reviews(db: Session, user_id: int, limit: int = 20) -> list[ReviewItem]:
+    """Get review items due today."""
+    return (
+        db.query(ReviewItem)
         .filter(
-            Attempt.user_id == user_id,
-            Attempt.is_correct == False,
-            Attempt.next_review_date != None,
-            Attempt.next_review_date <= datetime.utcnow(),
+            ReviewItem.user_id == user_id,
+            ReviewItem.next_review_date <= datetime.utcnow(),
         )
-        .order_by(Attempt.next_review_date.asc())
+        .order_by(ReviewItem.next_review_date.asc())
         .limit(limit)
         .all()
     )
 
 
+def get_review_page(
+    db: Session, user_id: int, cursor: str | None = None, limit: int | None = None
+) -> tuple[list, str | None]:
+    """One page of due reviews with question fields, and the next page's cursor."""
+    limit = limit or settings.REVIEW_PAGE_SIZE
+    query = (
+        db.query(
+            ReviewItem.id,
+            ReviewItem.attempt_id,
+            ReviewItem.question_id,
+            ReviewItem.review_count,
+            ReviewItem.next_review_date,
+            Attempt.selected_option,
+            Attempt.mistake_type,
+            Question.concept_id,
+            Question.text,
+            Question.correct_option,
+        )
+        .join(Attempt, Attempt.id == ReviewItem.attempt_id)
+        .join(Question, Question.id == ReviewItem.question_id)
+        .filter(
+            ReviewItem.user_id == user_id,
+            ReviewItem.next_review_date <= datetime.utcnow(),
+        )
+    )
+    if cursor:
+        query = query.filter(
+            tuple_(ReviewItem.next_review_date, ReviewItem.id) > decode_review_cursor(cursor)
+        )
+    rows = (
+        query.order_by(ReviewItem.next_review_date.asc(), ReviewItem.id.asc())
+        .limit(limit + 1)
+        .all()
+    )
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_review_cursor(rows[-1].next_review_date, rows[-1].id)
+    return rows, next_cursor
+
+
+def encode_review_cursor(next_review_date: datetime, item_id: int) -> str:
+    return f"{next_review_date.isoformat()}_{item_id}"
+
+
+def decode_review_cursor(cursor: str) -> tuple[datetime, int]:
+    """Inverse of encode_review_cursor; raises ValueError if malformed."""
+    when, _, item_id = cursor.rpartition("_")
+    return datetime.fromisoformat(when), int(item_id)
+
+
 def get_review_count(db: Session, user_id: int) -> int:
     """Count of items due for review today."""
     return (
-        db.query(Attempt)
+        db.query(ReviewItem)
         .filter(
-            Attempt.user_id == user_id,
-            Attempt.is_correct == False,
-            Attempt.next_review_date != None,
-            Attempt.next_review_date <= datetime.utcnow(),
+            ReviewItem.user_id == user_id,
+            ReviewItem.next_review_date <= datetime.utcnow(),
         )
         .count()
     )
@@ -47,30 +167,65 @@ def get_review_count(db: Session, user_id: int) -> int:
 
 def process_review(
     db: Session,
-    attempt: Attempt,
+    item: ReviewItem,
     got_correct: bool,
     time_taken: int,
     expected_time: int,
-) -> Attempt:
+) -> ReviewItem:
     """Process a review result and schedule next review."""
-    attempt.review_count += 1
+    after_commit(db, invalidate_due_count, item.user_id)
+    item.review_count += 1
 
     if got_correct and time_taken <= expected_time:
         # Advance to next interval
         try:
-            current_idx = INTERVALS.index(attempt.review_interval_days)
+            current_idx = INTERVALS.index(item.review_interval_days)
         except ValueError:
             current_idx = 0
         next_idx = min(current_idx + 1, len(INTERVALS) - 1)
-        attempt.review_interval_days = INTERVALS[next_idx]
+        item.review_interval_days = INTERVALS[next_idx]
     elif got_correct:
         # Correct but slow — stay at current interval
         pass
     else:
         # Wrong again — reset
-        attempt.review_interval_days = 1
+        item.review_interval_days = 1
 
-    attempt.next_review_date = datetime.utcnow() + timedelta(
-        days=attempt.review_interval_days
+    item.next_review_date = datetime.utcnow() + timedelta(
+        days=item.review_interval_days
     )
-    return attempt
+    return item
+
+
+def process_reviews(
+    db: Session, user_id: int, results: list[tuple[int, bool, int]]
+) -> dict[int, ReviewItem]:
+    """Apply (attempt_id, got_correct, time_taken) reviews in order.
+
+    Returns attempt_id → updated item for the attempts that belong to the
+    user and are scheduled for review; the rest are left out.
+    """
+    rows = (
+        db.query(Attempt.id, ReviewItem, Question.expected_time_seconds)
+        .join(
+            ReviewItem,
+            and_(
+                ReviewItem.user_id == Attempt.user_id,
+                ReviewItem.question_id == Attempt.question_id,
+            ),
+        )
+        .outerjoin(Question, Question.id == Attempt.question_id)
+        .filter(Attempt.user_id == user_id, Attempt.id.in_({r[0] for r in results}))
+        .all()
+    )
+    found = {attempt_id: (item, expected_time) for attempt_id, item, expected_time in rows}
+
+    updated = {}
+    for attempt_id, got_correct, time_taken in results:
+        if attempt_id not in found:
+            continue
+        item, expected_time = found[attempt_id]
+        updated[attempt_id] = process_review(
+            db, item, got_correct, time_taken, expected_time or 90
+        )
+    return updated
@@ -1,125 +1,137 @@
 """Stats Service - Aggregates dashboard data, mastery maps, and trends."""
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 
-from sqlalchemy import func
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 
-from app.models.attempt import Attempt
 from app.models.concept import Concept
 from app.models.question import Question
 from app.models.streak import Streak
 from app.models.study_session import StudySession
-from app.models.topic import Topic
 from app.models.user_concept_stats import UserConceptStats
+from app.models.user_daily_activity import UserDailyActivity
+from app.models.user_rollup import UserRollup
+from app.services.activity_service import daily_totals
+from app.services.catalog import get_catalog
 
 
 def get_dashboard_data(db: Session, user_id: int) -> dict:
-    """Aggregate dashboard stats."""
-    # Total attempts
-    total = db.query(Attempt).filter(Attempt.user_id == user_id).count()
-    correct = (
-        db.query(Attempt)
-        .filter(Attempt.user_id == user_id, Attempt.is_correct == True)
-        .count()
-    )
+    """Aggregate dashboard stats in three queries, whatever the history size."""
+    # 1. Lifetime counters, streak and study time in one row
+    totals = db.execute(
+        select(
+            _for_user(UserRollup.total_attempts, UserRollup.user_id, user_id),
+            _for_user(UserRollup.correct_attempts, UserRollup.user_id, user_id),
+            _for_user(UserRollup.total_time_seconds, UserRollup.user_id, user_id),
+            _for_user(Streak.current_streak, Streak.user_id, user_id),
+            _for_user(Streak.longest_streak, Streak.user_id, user_id),
+            _for_user(
+                func.sum(StudySession.total_time_seconds), StudySession.user_id, user_id
+            ),
+        )
+    ).one()
+    total = totals[0] or 0
+    correct = totals[1] or 0
     accuracy = correct / total if total > 0 else 0.0
+    avg_time = (totals[2] or 0) / total if total > 0 else 0.0
+    total_seconds = totals[5] or 0
 
-    # Avg time
-    avg_time_row = (
-        db.query(func.avg(Attempt.time_taken_seconds))
-        .filter(Attempt.user_id == user_id)
-        .scalar()
-    )
-    avg_time = avg_time_row or 0.0
-
-    # Streak
-    streak = db.query(Streak).filter(Streak.user_id == user_id).first()
-    current_streak = streak.current_streak if streak else 0
-    longest_streak = streak.longest_streak if streak else 0
-
-    # Total study minutes
-    total_seconds = (
-        db.query(func.sum(StudySession.total_time_seconds))
-        .filter(StudySession.user_id == user_id)
-        .scalar()
-    ) or 0
-
-    # Mastery summary by topic
+    # 2. Mastery summary by topic
+    catalog = get_catalog(db)
     mastery_summary = {}
-    stats_rows = (
-        db.query(UserConceptStats, Concept, Topic)
+    for topic_id, avg_mastery in (
+        db.query(Concept.topic_id, func.avg(UserConceptStats.mastery))
         .join(Concept, UserConceptStats.concept_id == Concept.id)
-        .join(Topic, Concept.topic_id == Topic.id)
         .filter(UserConceptStats.user_id == user_id)
+        .group_by(Concept.topic_id)
         .all()
-    )
-    topic_masteries: dict[str, list[float]] = {}
-    for s, c, t in stats_rows:
-        topic_masteries.setdefault(t.name, []).append(s.mastery)
-    for topic_name, values in topic_masteries.items():
-        mastery_summary[topic_name] = sum(values) / len(values) if values else 0.0
-
-    # Weakest concepts
-    weakest = (
-        db.query(UserConceptStats)
-        .filter(UserConceptStats.user_id == user_id)
-        .order_by(UserConceptStats.mastery.asc())
-        .limit(5)
-        .all()
-    )
-    weakest_list = []
-    for s in weakest:
-        concept = db.query(Concept).get(s.concept_id)
-        topic = db.query(Topic).get(concept.topic_id) if concept else None
-        weakest_list.append(
-            {
-                "concept_id": s.concept_id,
-                "concept_name": concept.name if concept else "",
-                "topic_name": topic.name if topic else "",
-                "mastery": s.mastery,
-                "accuracy": s.accuracy,
-                "avg_time_seconds": s.avg_time_seconds,
-                "total_attempts": s.total_attempts,
-                "current_streak": s.current_streak,
-            }
-        )
+    ):
+        topic = catalog.topics.get(topic_id)
+        if topic:
+            mastery_summary[topic.name] = float(avg_mastery or 0.0)
+
+    # 3. Weakest concepts
+    weakest_list = get_weakest_concepts(db, user_id, limit=5)
 
     return {
         "total_questions_done": total,
         "total_correct": correct,
         "overall_accuracy": round(accuracy, 3),
         "avg_time_per_question": round(avg_time, 1),
-        "current_streak": current_streak,
-        "longest_streak": longest_streak,
+        "current_streak": totals[3] or 0,
+        "longest_streak": totals[4] or 0,
         "total_study_minutes": total_seconds // 60,
         "mastery_summary": mastery_summary,
         "weakest_concepts": weakest_list,
     }
 
 
+def _for_user(column, owner_column, user_id: int):
+    """Scalar subquery selecting column from the user's row(s)."""
+    return select(column).where(owner_column == user_id).scalar_subquery()
+
+
+def get_weakest_concepts(db: Session, user_id: int, limit: int = 5) -> list[dict]:
+    """Lowest-mastery concepts for a user, names filled from the catalog."""
+    # Single user: an index-ordered LIMIT on (user_id, mastery) is all the
+    # per-user top-N needs
+    rows = (
+        db.query(
+            UserConceptStats.concept_id,
+            UserConceptStats.mastery,
+            UserConceptStats.accuracy,
+            UserConceptStats.avg_time_seconds,
+            UserConceptStats.total_attempts,
+            UserConceptStats.current_streak,
+        )
+        .filter(UserConceptStats.user_id == user_id)
+        .order_by(UserConceptStats.mastery.asc())
+        .limit(limit)
+        .all()
+    )
+    catalog = get_catalog(db)
+    return [
+        {
+            "concept_id": r.concept_id,
+            "concept_name": catalog.concept_name(r.concept_id) or "",
+            "topic_name": catalog.topic_name_for_concept(r.concept_id) or "",
+            "mastery": r.mastery,
+            "accuracy": r.accuracy,
+            "avg_time_seconds": r.avg_time_seconds,
+            "total_attempts": r.total_attempts,
+            "current_streak": r.current_streak,
+        }
+        for r in rows
+    ]
+
+
 def get_mastery_map(db: Session, user_id: int) -> list[dict]:
-    """Get mastery grouped by topic -> concepts."""
-    topics = db.query(Topic).order_by(Topic.display_order).all()
-    result = []
+    """Get mastery grouped by topic -> concepts (catalog + one stats query)."""
+    catalog = get_catalog(db)
+    stats = {
+        row.concept_id: row
+        for row in db.query(
+            UserConceptStats.concept_id,
+            UserConceptStats.mastery,
+            UserConceptStats.accuracy,
+            UserConceptStats.total_attempts,
+        )
+        .filter(UserConceptStats.user_id == user_id)
+        .all()
+    }
 
-    for topic in topics:
+    result = []
+    for topic in sorted(catalog.topics.values(), key=lambda t: (t.display_order, t.id)):
         concepts_data = []
-        for concept in topic.concepts:
-            stats = (
-                db.query(UserConceptStats)
-                .filter(
-                    UserConceptStats.user_id == user_id,
-                    UserConceptStats.concept_id == concept.id,
-                )
-                .first()
-            )
+        for concept in sorted(catalog.concepts_for_topic(topic.id), key=lambda c: c.id):
+            s = stats.get(concept.id)
             concepts_data.append(
                 {
                     "id": concept.id,
                     "name": concept.name,
-                    "mastery": stats.mastery if stats else 0.0,
-                    "accuracy": stats.accuracy if stats else 0.0,
-                    "total_attempts": stats.total_attempts if stats else 0,
+                    "mastery": s.mastery if s else 0.0,
+                    "accuracy": s.accuracy if s else 0.0,
+                    "total_attempts": s.total_attempts if s else 0,
                 }
             )
         result.append(
@@ -133,36 +145,101 @@ def get_mastery_map(db: Session, user_id: int) -> list[dict]:
     return result
 
 
-def get_trends(db: Session, user_id: int, days: int = 7) -> list[dict]:
-    """Get accuracy and speed trends over the last N days."""
-    trends = []
-    for i in range(days - 1, -1, -1):
-        day = datetime.utcnow().date() - timedelta(days=i)
-        day_start = datetime.combine(day, datetime.min.time())
-        day_end = datetime.combine(day, datetime.max.time())
-
-        attempts = (
-            db.query(Attempt)
-            .filter(
-                Attempt.user_id == user_id,
-                Attempt.created_at.between(day_start, day_end),
-            )
-            .all()
+TREND_BUCKETS = ("day", "week", "month")
+
+
+def get_trends(
+    db: Session,
+    user_id: int,
+    days: int = 7,
+    bucket: str = "day",
+    topic_id: int | None = None,
+) -> list[dict]:
+    """Get accuracy and speed trends over the last N days, per day/week/month."""
+    if bucket not in TREND_BUCKETS:
+        raise ValueError(f"Unknown trend bucket: {bucket}")
+    today = datetime.utcnow().date()
+    first_day = today - timedelta(days=days - 1)
+    daily = daily_totals(db, user_id, first_day, topic_id)
+
+    # Every bucket in the window appears, even with no activity
+    buckets: dict[date, list[int]] = {}
+    day = first_day
+    while day <= today:
+        buckets.setdefault(_bucket_start(day, bucket), [0, 0, 0])
+        day += timedelta(days=1)
+    for day, (total, correct, time_sum) in daily.items():
+        totals = buckets.get(_bucket_start(day, bucket))
+        if totals is None:
+            continue  # Clock skew: attempt stamped after "today"
+        totals[0] += total
+        totals[1] += correct
+        totals[2] += time_sum
+
+    return [
+        {
+            "date": start.isoformat(),
+            "accuracy": round(correct / total, 3) if total > 0 else 0.0,
+            "avg_time": round(time_sum / total, 1) if total > 0 else 0.0,
+            "questions_done": total,
+        }
+        for start, (total, correct, time_sum) in buckets.items()
+    ]
+
+
+def get_heatmap(db: Session, user_id: int, days: int = 365) -> dict:
+    """Per-day activity for a calendar heatmap, with each day's topic split."""
+    today = datetime.utcnow().date()
+    first_day = today - timedelta(days=days - 1)
+    catalog = get_catalog(db)
+
+    by_day: dict[date, dict] = {}
+    for day, topic_id, attempts, correct, time_seconds in (
+        db.query(
+            UserDailyActivity.activity_date,
+            UserDailyActivity.topic_id,
+            UserDailyActivity.attempts,
+            UserDailyActivity.correct,
+            UserDailyActivity.time_seconds,
         )
-
-        total = len(attempts)
-        correct = sum(1 for a in attempts if a.is_correct)
-        avg_time = (
-            sum(a.time_taken_seconds for a in attempts) / total if total > 0 else 0.0
+        .filter(
+            UserDailyActivity.user_id == user_id,
+            UserDailyActivity.activity_date >= first_day,
         )
-
-        trends.append(
+        .order_by(UserDailyActivity.activity_date)
+        .all()
+    ):
+        entry = by_day.setdefault(
+            day,
             {
                 "date": day.isoformat(),
-                "accuracy": round(correct / total, 3) if total > 0 else 0.0,
-                "avg_time": round(avg_time, 1),
-                "questions_done": total,
-            }
+                "questions_done": 0,
+                "correct": 0,
+                "minutes": 0,
+                "topics": {},
+            },
         )
+        entry["questions_done"] += attempts
+        entry["correct"] += correct
+        entry["minutes"] += time_seconds
+        topic = catalog.topics.get(topic_id)
+        entry["topics"][topic.name if topic else str(topic_id)] = attempts
+
+    active = list(by_day.values())
+    for entry in active:
+        entry["minutes"] = round(entry["minutes"] / 60, 1)
+    return {
+        "start_date": first_day.isoformat(),
+        "end_date": today.isoformat(),
+        "active_days": len(active),
+        "max_questions": max((e["questions_done"] for e in active), default=0),
+        "days": active,
+    }
+
 
-    return trends
+def _bucket_start(day: date, bucket: str) -> date:
+    if bucket == "week":
+        return day - timedelta(days=day.weekday())
+    if bucket == "month":
+        return day.replace(day=1)
+    return day
@@ -1,9 +1,10 @@
 """Streak Service - Tracks daily study streaks."""
-from datetime import date, timedelta
+from datetime import date, datetime, timedelta
 
 from sqlalchemy.orm import Session
 
 from app.models.streak import Streak
+from app.services.activity_service import active_days
 
 
 def get_streak(db: Session, user_id: int) -> Streak:
@@ -39,3 +40,34 @@ def check_in(db: Session, user_id: int) -> Streak:
     db.commit()
     db.refresh(streak)
     return streak
+
+
+def rebuild_streak(db: Session, user_id: int) -> Streak:
+    """Recompute a streak from daily activity (days with answers); caller commits."""
+    streak = get_streak(db, user_id)
+    days = active_days(db, user_id)
+
+    longest = run = 0
+    previous = None
+    for day in days:
+        run = run + 1 if previous and day - previous == timedelta(days=1) else 1
+        longest = max(longest, run)
+        previous = day
+
+    # Activity days are UTC dates (attempt created_at)
+    today = datetime.utcnow().date()
+    current = 0
+    start = None
+    if days and days[-1] >= today - timedelta(days=1):
+        # The latest run is still alive; walk back to where it began
+        active = set(days)
+        start = days[-1]
+        while start - timedelta(days=1) in active:
+            start -= timedelta(days=1)
+        current = (days[-1] - start).days + 1
+
+    streak.current_streak = current
+    streak.longest_streak = max(longest, current)
+    streak.last_activity_date = days[-1] if days else None
+    streak.streak_start_date = start
+    return streak
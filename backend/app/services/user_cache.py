@@ -0,0 +1,111 @@
+"""
+User Cache - Lightweight principals for authenticated requests.
+
+Most routes only need a few user fields (id, is_admin, level,
+daily_minutes). get_principal() serves them from a per-process LRU with a
+short TTL instead of querying users on every request:
+
+    get_principal()     → cached Principal, loaded on a miss
+    invalidate_user()   → drop a user after a write to those fields
+    clear_user_cache()  → drop everything (tests)
+
+Batch jobs that already hold the user columns build principals directly
+with principal_from_row().
+
+Invalidation only reaches the current worker; other workers pick up the
+change when their entry expires (USER_CACHE_TTL_SECONDS).
+
+With TOKEN_EMBED_CLAIMS the same fields are carried in the access token
+(principal_claims / principal_from_claims), so requests skip the cache and
+the database entirely. Claims stay as issued until the token expires, so
+routes that store values derived from them (daily plans) resolve the
+principal through get_principal() instead.
+"""
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.user import StudentLevel, User
+
+CLAIM_FIELDS = ("is_admin", "level", "daily_minutes")
+
+
+@dataclass(frozen=True, slots=True)
+class Principal:
+    id: int
+    is_admin: bool
+    level: str
+    daily_minutes: int
+
+
+_lock = threading.Lock()
+_entries: "OrderedDict[int, tuple[float, Principal]]" = OrderedDict()
+
+
+def get_principal(db: Session, user_id: int) -> Principal | None:
+    """Return the user's principal, or None if the user does not exist."""
+    with _lock:
+        entry = _entries.get(user_id)
+        if entry and time.monotonic() - entry[0] < settings.USER_CACHE_TTL_SECONDS:
+            _entries.move_to_end(user_id)
+            return entry[1]
+
+    row = (
+        db.query(User.id, User.is_admin, User.level, User.daily_minutes)
+        .filter(User.id == user_id)
+        .first()
+    )
+    if row is None:
+        return None
+    principal = principal_from_row(row)
+    if settings.USER_CACHE_TTL_SECONDS > 0:
+        with _lock:
+            _entries[user_id] = (time.monotonic(), principal)
+            _entries.move_to_end(user_id)
+            while len(_entries) > settings.USER_CACHE_MAX_USERS:
+                _entries.popitem(last=False)
+    return principal
+
+
+def invalidate_user(user_id: int) -> None:
+    with _lock:
+        _entries.pop(user_id, None)
+
+
+def clear_user_cache() -> None:
+    with _lock:
+        _entries.clear()
+
+
+def principal_claims(user: User) -> dict:
+    """Token claims carrying the principal fields of a user."""
+    return {
+        "is_admin": bool(user.is_admin),
+        "level": user.level,
+        "daily_minutes": user.daily_minutes,
+    }
+
+
+def principal_from_row(row) -> Principal:
+    """Principal from a row with id, is_admin, level and daily_minutes columns."""
+    return _principal(row.id, row.is_admin, row.level, row.daily_minutes)
+
+
+def principal_from_claims(user_id: int, payload: dict) -> Principal | None:
+    """Principal from embedded token claims, or None if they are absent."""
+    if any(field not in payload for field in CLAIM_FIELDS):
+        return None
+    return _principal(user_id, payload["is_admin"], payload["level"], payload["daily_minutes"])
+
+
+def _principal(user_id: int, is_admin, level, daily_minutes) -> Principal:
+    return Principal(
+        id=user_id,
+        is_admin=bool(is_admin),
+        level=level or StudentLevel.AVERAGE.value,
+        daily_minutes=daily_minutes if daily_minutes is not None else 45,
+    )
@@ -0,0 +1,23 @@
+"""Defer in-process cache updates until the session's transaction commits."""
+from collections.abc import Callable
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+_KEY = "after_commit"
+
+
+def after_commit(db: Session, fn: Callable, *args) -> None:
+    """Call fn(*args) once db's transaction commits; dropped if it rolls back."""
+    db.info.setdefault(_KEY, []).append((fn, args))
+
+
+@event.listens_for(Session, "after_commit")
+def _run_callbacks(session: Session) -> None:
+    for fn, args in session.info.pop(_KEY, ()):
+        fn(*args)
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_callbacks(session: Session) -> None:
+    session.info.pop(_KEY, None)
@@ -0,0 +1,19 @@
+"""ETag helpers for conditional GETs on JSON payloads."""
+import hashlib
+import json
+
+
+def json_etag(payload) -> str:
+    """Strong ETag derived from the payload's canonical JSON."""
+    body = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return '"' + hashlib.sha256(body.encode("utf-8")).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """True if an If-None-Match header covers etag (weak comparison)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
@@ -0,0 +1,109 @@
+"""
+Connection pool checkout metrics.
+
+TimedQueuePool / TimedAsyncAdaptedQueuePool time every checkout: the wait for
+a free connection, plus connect time when the pool opens a new one. The
+counters are per process (each gunicorn worker has its own pool). A steady
+share of slow checkouts means the workers need more connections than
+pool_size + max_overflow allows.
+"""
+import bisect
+import threading
+import time
+
+from sqlalchemy import exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+# Upper bounds (seconds) of the wait histogram; the last bucket is open-ended
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+
+class PoolMetrics:
+    """Checkout count, wait totals and a wait histogram for one pool."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.checkouts = 0
+            self.timeouts = 0
+            self.wait_total = 0.0
+            self.wait_max = 0.0
+            self.buckets = [0] * (len(WAIT_BUCKETS) + 1)
+
+    def record(self, wait: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.wait_total += wait
+            self.wait_max = max(self.wait_max, wait)
+            self.buckets[bisect.bisect_left(WAIT_BUCKETS, wait)] += 1
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            labels = [f"<={b * 1000:g}ms" for b in WAIT_BUCKETS] + [
+                f">{WAIT_BUCKETS[-1] * 1000:g}ms"
+            ]
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_avg_ms": (
+                    self.wait_total / self.checkouts * 1000 if self.checkouts else 0.0
+                ),
+                "wait_max_ms": self.wait_max * 1000,
+                "wait_histogram": dict(zip(labels, self.buckets)),
+            }
+
+
+class _TimedCheckout:
+    metrics: PoolMetrics
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.record_timeout()
+            raise
+        self.metrics.record(time.perf_counter() - start)
+        return connection
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+class TimedQueuePool(_TimedCheckout, QueuePool):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+
+class TimedAsyncAdaptedQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+
+def pool_status(engine: Engine) -> dict:
+    """Current occupancy plus checkout metrics (if the pool records them)."""
+    pool = engine.pool
+    status = {"pool": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            checked_in=pool.checkedin(),
+            overflow=pool.overflow(),
+        )
+    metrics = getattr(pool, "metrics", None)
+    if metrics is not None:
+        status.update(metrics.snapshot())
+    return status
@@ -1,14 +1,22 @@
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
 
 import bcrypt
 from jose import JWTError, jwt
+from starlette.concurrency import run_in_threadpool
 
 from app.config import settings
 
+_hash_pool: ProcessPoolExecutor | None = None
+_hash_pool_lock = threading.Lock()
 
-def hash_password(password: str) -> str:
+
+def hash_password(password: str, rounds: int | None = None) -> str:
     password_bytes = password.encode("utf-8")
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds or settings.BCRYPT_ROUNDS)
     return bcrypt.hashpw(password_bytes, salt).decode("utf-8")
 
 
@@ -18,6 +26,53 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     )
 
 
+def needs_rehash(hashed_password: str) -> bool:
+    """True if the hash was made with a cost factor other than BCRYPT_ROUNDS."""
+    # "$2b$12$<salt+hash>"
+    try:
+        return int(hashed_password.split("$")[2]) != settings.BCRYPT_ROUNDS
+    except (IndexError, ValueError):
+        return True
+
+
+async def hash_password_async(password: str) -> str:
+    """hash_password() off the event loop, in the password hash pool."""
+    return await _run_hash(hash_password, password, settings.BCRYPT_ROUNDS)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """verify_password() off the event loop, in the password hash pool."""
+    return await _run_hash(verify_password, plain_password, hashed_password)
+
+
+def shutdown_hash_pool() -> None:
+    global _hash_pool
+    with _hash_pool_lock:
+        if _hash_pool is not None:
+            _hash_pool.shutdown(wait=False, cancel_futures=True)
+            _hash_pool = None
+
+
+async def _run_hash(fn, *args):
+    # At most PASSWORD_HASH_WORKERS hashes run at once per worker process;
+    # the rest queue without holding threadpool slots. 0 = AnyIO threadpool.
+    if settings.PASSWORD_HASH_WORKERS <= 0:
+        return await run_in_threadpool(fn, *args)
+    return await asyncio.get_running_loop().run_in_executor(_get_hash_pool(), fn, *args)
+
+
+def _get_hash_pool() -> ProcessPoolExecutor:
+    global _hash_pool
+    with _hash_pool_lock:
+        if _hash_pool is None:
+            # Spawned, not forked: the server process is multi-threaded
+            _hash_pool = ProcessPoolExecutor(
+                max_workers=settings.PASSWORD_HASH_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _hash_pool
+
+
 def create_access_token(data: dict, expires_delta: timedelta | None = None) -> str:
     to_encode = data.copy()
     expire = datetime.utcnow() + (
@@ -0,0 +1,12 @@
+"""Dialect-aware INSERT ... ON CONFLICT for counter tables."""
+from collections.abc import Callable
+
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+_DIALECT_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def upsert_insert(db: Session) -> Callable | None:
+    """insert() supporting on_conflict_* for the session's dialect, if any."""
+    return _DIALECT_INSERTS.get(db.bind.dialect.name)
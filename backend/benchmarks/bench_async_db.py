@@ -0,0 +1,106 @@
+"""
+Benchmark: sync vs async database stack on the hot routes.
+
+Starts `uvicorn app.main:app` once with ASYNC_DB=false and once with
+ASYNC_DB=true against the same DATABASE_URL. Both runs get the same load:
+many concurrent students answering questions and reading the dashboard and
+review queue. Requests per second and latency percentiles are printed per
+mode.
+
+In sync mode every request holds one of AnyIO's threadpool slots (40 by
+default) while it waits on the database. In async mode the hot routes wait
+on the event loop instead.
+
+Usage (from backend/):
+    python -m seeds.synthetic --users 1000
+    python -m benchmarks.bench_async_db [--concurrency 500] [--duration 30] [--workers 1]
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+
+from benchmarks.loadtest import run
+
+HOT_SCENARIO = [
+    (40, "answer"),
+    (20, "dashboard"),
+    (20, "review_queue"),
+]
+
+
+def _start_server(async_db: bool, port: int, workers: int) -> subprocess.Popen:
+    env = {**os.environ, "ASYNC_DB": "true" if async_db else "false"}
+    server = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "app.main:app",
+            "--port", str(port), "--workers", str(workers), "--log-level", "warning",
+        ],
+        env=env,
+    )
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/api/health").status_code == 200:
+                return server
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    server.kill()
+    raise SystemExit("Server did not come up")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--concurrency", type=int, default=500)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--users", type=int, default=1000, help="Distinct students to sample")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    results = {}
+    for async_db in (False, True):
+        mode = "async" if async_db else "sync"
+        server = _start_server(async_db, args.port, args.workers)
+        try:
+            report, elapsed = asyncio.run(
+                run(
+                    f"http://127.0.0.1:{args.port}",
+                    args.concurrency,
+                    args.duration,
+                    args.users,
+                    args.seed,
+                    HOT_SCENARIO,
+                )
+            )
+        finally:
+            server.terminate()
+            server.wait()
+        results[mode] = (report, elapsed)
+
+    print(f"\n{args.concurrency} clients, {args.duration:.0f}s per mode, {args.workers} worker(s)")
+    print(
+        f"{'mode':<7}{'router':<12}{'requests':>10}{'errors':>8}{'req/s':>9}"
+        f"{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+    )
+    for mode, (report, elapsed) in results.items():
+        total = sum(r["requests"] for r in report.values())
+        errors = sum(r["errors"] for r in report.values())
+        print(f"{mode:<7}{'(all)':<12}{total:>10}{errors:>8}{total / elapsed:>9.1f}")
+        for router, r in report.items():
+            print(
+                f"{'':<7}{router:<12}{r['requests']:>10}{r['errors']:>8}{r['rps']:>9.1f}"
+                f"{r['p50']:>9.1f}{r['p95']:>9.1f}{r['p99']:>9.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Benchmark: login throughput under concurrent load.
+
+Many clients log in as synthetic students in a loop while a few others keep
+reading GET /streaks/current. That runs once with bcrypt in the AnyIO
+threadpool (PASSWORD_HASH_WORKERS=0) and once with the password hash pool.
+Both runs report logins per second and the latency of the cheap route
+running alongside: it shows whether the login storm starves the rest of the
+API.
+
+The app runs in-process over httpx's ASGI transport against DATABASE_URL.
+
+Usage (from backend/):
+    python -m seeds.synthetic --users 1000
+    python -m benchmarks.bench_login [--logins 100] [--probes 10] [--duration 20]
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+
+from app.config import settings
+from app.utils.security import create_access_token, shutdown_hash_pool
+from benchmarks.loadtest import Recorder, _load_user_ids
+from seeds.synthetic import PASSWORD
+
+
+async def _login_loop(client, recorder, user_ids, deadline, rng):
+    while time.perf_counter() < deadline:
+        await recorder.call(
+            client,
+            "POST",
+            "/auth/login",
+            json={"email": f"synthetic{rng.choice(user_ids)}@example.com", "password": PASSWORD},
+        )
+
+
+async def _probe_loop(client, recorder, token, deadline):
+    headers = {"Authorization": f"Bearer {token}"}
+    while time.perf_counter() < deadline:
+        await recorder.call(client, "GET", "/streaks/current", headers=headers)
+
+
+async def run(logins: int, probes: int, duration: float, users: int, seed: int):
+    from app.main import app
+
+    user_ids = _load_user_ids(users, seed)
+    if not user_ids:
+        raise SystemExit("No synthetic users found; run `python -m seeds.synthetic` first.")
+
+    limits = httpx.Limits(max_connections=logins + probes)
+    client = httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app),
+        base_url="http://bench",
+        timeout=120,
+        limits=limits,
+    )
+    recorder = Recorder()
+    rng = random.Random(seed)
+    async with client, app.router.lifespan_context(app):
+        # Warm-up: first login per process spawns the hash pool
+        await recorder.call(
+            client,
+            "POST",
+            "/auth/login",
+            json={"email": f"synthetic{user_ids[0]}@example.com", "password": PASSWORD},
+        )
+        recorder = Recorder()
+        start = time.perf_counter()
+        deadline = start + duration
+        await asyncio.gather(
+            *(
+                _login_loop(client, recorder, user_ids, deadline, random.Random(rng.random()))
+                for _ in range(logins)
+            ),
+            *(
+                _probe_loop(
+                    client, recorder, create_access_token({"sub": str(uid)}), deadline
+                )
+                for uid in user_ids[:probes]
+            ),
+        )
+        elapsed = time.perf_counter() - start
+    return recorder.report(elapsed)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--logins", type=int, default=100, help="Concurrent login clients")
+    parser.add_argument("--probes", type=int, default=10, help="Concurrent /streaks clients")
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--users", type=int, default=200, help="Distinct students to sample")
+    parser.add_argument(
+        "--hash-workers", type=int, default=settings.PASSWORD_HASH_WORKERS or 2
+    )
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    results = {}
+    for mode, workers in (("threadpool", 0), ("hash pool", args.hash_workers)):
+        settings.PASSWORD_HASH_WORKERS = workers
+        results[mode] = asyncio.run(
+            run(args.logins, args.probes, args.duration, args.users, args.seed)
+        )
+        shutdown_hash_pool()
+
+    print(
+        f"\n{args.logins} login + {args.probes} probe clients, {args.duration:.0f}s per mode, "
+        f"bcrypt cost {settings.BCRYPT_ROUNDS}, {args.hash_workers} hash worker(s)"
+    )
+    print(
+        f"{'mode':<12}{'route':<10}{'requests':>10}{'errors':>8}{'req/s':>9}"
+        f"{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+    )
+    for mode, report in results.items():
+        for router, r in report.items():
+            print(
+                f"{mode:<12}{router:<10}{r['requests']:>10}{r['errors']:>8}{r['rps']:>9.1f}"
+                f"{r['p50']:>9.1f}{r['p95']:>9.1f}{r['p99']:>9.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Benchmark: /questions/next latency with and without lookahead.
+
+Simulates one student answering questions back to back. Only the
+get_next_question call is timed; recording each answer (attempt insert,
+mastery update, seen-index update) happens between samples like it would
+between requests.
+
+Usage (from backend/):
+    python -m benchmarks.bench_next_question [--questions 400] [--lookahead 8]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config import settings
+from app.models.attempt import Attempt
+from app.services.adaptive_engine import get_next_question
+from app.services.catalog import invalidate_catalog
+from app.services.lookahead_queue import clear_lookahead
+from app.services.mastery_service import update_mastery
+from app.services.seen_index import clear_seen_index, mark_seen
+from benchmarks.common import make_session, percentiles, seed_catalog
+
+
+def run(lookahead: int, n_questions: int, concepts_per_topic: int) -> dict:
+    settings.ADAPTIVE_LOOKAHEAD = lookahead
+    invalidate_catalog()
+    clear_seen_index()
+    clear_lookahead()
+
+    db = make_session()
+    seed_catalog(db, concepts_per_topic=concepts_per_topic, questions_per_concept=40)
+    rng = random.Random(7)
+
+    samples = []
+    for _ in range(n_questions):
+        start = time.perf_counter()
+        question = get_next_question(db, 1)
+        samples.append((time.perf_counter() - start) * 1000)
+
+        attempt = Attempt(
+            user_id=1,
+            question_id=question.id,
+            selected_option="a",
+            is_correct=rng.random() < 0.7,
+            time_taken_seconds=rng.randint(20, 120),
+            was_guessed=False,
+        )
+        db.add(attempt)
+        db.flush()
+        mark_seen(1, question.concept_id, question.id)
+        update_mastery(db, 1, question, attempt)
+        db.commit()
+
+    db.close()
+    return percentiles(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--questions", type=int, default=400)
+    parser.add_argument("--lookahead", type=int, default=8)
+    parser.add_argument("--concepts-per-topic", type=int, default=50)
+    args = parser.parse_args()
+
+    print(
+        f"{args.questions} requests, {3 * args.concepts_per_topic} concepts, "
+        "40 questions each"
+    )
+    for label, k in [("on-demand", 0), (f"lookahead={args.lookahead}", args.lookahead)]:
+        p = run(k, args.questions, args.concepts_per_topic)
+        print(
+            f"  {label:<14} p50 {p['p50']:7.2f} ms   p95 {p['p95']:7.2f} ms"
+            f"   p99 {p['p99']:7.2f} ms   max {p['max']:7.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
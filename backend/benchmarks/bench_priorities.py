@@ -0,0 +1,96 @@
+"""
+Benchmark: concept priority scoring.
+
+Compares the scalar reference (_calculate_priorities + sort) with the
+vectorized top-N path used by the adaptive engine.
+
+Usage (from backend/):
+    python -m benchmarks.bench_priorities [--concepts 10000] [--repeat 20]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from collections import namedtuple
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.adaptive_engine import (
+    TOP_N,
+    _calculate_priorities,
+    _calculate_top_priorities,
+)
+from app.services.catalog import ConceptEntry
+
+# Same shape as the rows returned by adaptive_engine._load_user_stats
+StatsRow = namedtuple(
+    "StatsRow",
+    "concept_id mastery accuracy total_attempts current_streak last_seen",
+)
+
+
+def build_inputs(n_concepts: int, n_topics: int = 3, seed: int = 42):
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    concepts = [
+        ConceptEntry(
+            id=i + 1,
+            topic_id=rng.randint(1, n_topics),
+            name=f"Concept {i}",
+            slug=f"concept-{i}",
+            display_order=i,
+        )
+        for i in range(n_concepts)
+    ]
+    stats = {}
+    for concept in concepts:
+        if rng.random() < 0.2:
+            continue
+        stats[concept.id] = StatsRow(
+            concept_id=concept.id,
+            mastery=rng.random(),
+            accuracy=rng.random(),
+            total_attempts=rng.randint(0, 50),
+            current_streak=0,
+            last_seen=now - timedelta(days=rng.randint(0, 45)),
+        )
+    return concepts, stats
+
+
+def _time(fn, repeat: int) -> list[float]:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--concepts", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    concepts, stats = build_inputs(args.concepts)
+    print(f"{args.concepts} concepts, {len(stats)} with stats, top {TOP_N}")
+
+    reference = _calculate_priorities(concepts, stats)[:TOP_N]
+    vectorized = _calculate_top_priorities(concepts, stats, TOP_N)
+    print(f"  parity: {'OK' if reference == vectorized else 'MISMATCH'}")
+
+    for label, fn in [
+        ("scalar", lambda: _calculate_priorities(concepts, stats)[:TOP_N]),
+        ("vectorized", lambda: _calculate_top_priorities(concepts, stats, TOP_N)),
+    ]:
+        samples = sorted(_time(fn, args.repeat))
+        print(
+            f"  {label:<11} median {samples[len(samples) // 2]:8.2f} ms"
+            f"   min {samples[0]:8.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
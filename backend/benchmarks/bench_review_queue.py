@@ -0,0 +1,130 @@
+"""
+Benchmark: review queue for a student with thousands of due mistakes.
+
+Compares loading a page item by item (get_due_reviews, then the attempt and
+question of each item) with get_review_page's single joined query, per page of
+REVIEW_PAGE_SIZE items. Also walks the whole queue with the cursor to show
+that later pages cost the same as the first.
+
+Usage (from backend/):
+    python -m benchmarks.bench_review_queue [--mistakes 5000] [--repeat 20]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event
+
+from app.config import settings
+from app.models import Attempt, Question, ReviewItem
+from app.services.spaced_repetition import get_due_reviews, get_review_page
+from benchmarks.common import make_session, seed_catalog
+
+USER_ID = 1
+
+
+def seed_mistakes(db, n_mistakes: int, seed: int = 42) -> None:
+    """n_mistakes wrong attempts at distinct questions, each with a due review item."""
+    rng = random.Random(seed)
+    question_ids = rng.sample([qid for (qid,) in db.query(Question.id)], n_mistakes)
+    now = datetime.utcnow()
+    db.execute(
+        Attempt.__table__.insert(),
+        [
+            {
+                "user_id": USER_ID,
+                "question_id": question_id,
+                "selected_option": "a",
+                "is_correct": False,
+                "time_taken_seconds": 60,
+                "created_at": now - timedelta(days=60),
+            }
+            for question_id in question_ids
+        ],
+    )
+    db.execute(
+        ReviewItem.__table__.insert(),
+        [
+            {
+                "user_id": USER_ID,
+                "question_id": question_id,
+                "attempt_id": attempt_id,
+                "next_review_date": now - timedelta(minutes=rng.randint(1, 60 * 24 * 30)),
+                "review_interval_days": 1,
+                "review_count": 0,
+            }
+            for attempt_id, question_id in db.query(Attempt.id, Attempt.question_id)
+        ],
+    )
+    db.commit()
+
+
+def per_item_page(db) -> int:
+    """get_due_reviews plus per-item attempt and question lookups."""
+    reviews = get_due_reviews(db, USER_ID, limit=settings.REVIEW_PAGE_SIZE)
+    for item in reviews:
+        db.get(Attempt, item.attempt_id)
+        db.get(Question, item.question_id)
+    return len(reviews)
+
+
+def walk_all_pages(db) -> int:
+    pages, cursor = 0, None
+    while True:
+        _, cursor = get_review_page(db, USER_ID, cursor)
+        pages += 1
+        if cursor is None:
+            return pages
+
+
+def _time(db, fn, repeat: int) -> tuple[list[float], int]:
+    statements = []
+
+    def count(*_):
+        statements.append(1)
+
+    engine = db.get_bind()
+    event.listen(engine, "before_cursor_execute", count)
+    samples = []
+    try:
+        for _ in range(repeat):
+            db.expunge_all()
+            start = time.perf_counter()
+            fn()
+            samples.append((time.perf_counter() - start) * 1000)
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+    return sorted(samples), len(statements) // repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--mistakes", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--db", default="sqlite:///:memory:")
+    args = parser.parse_args()
+
+    db = make_session(args.db)
+    seed_catalog(db, questions_per_concept=-(-args.mistakes // 15))
+    seed_mistakes(db, args.mistakes)
+    print(f"{args.mistakes} due mistakes, page size {settings.REVIEW_PAGE_SIZE}")
+
+    for label, fn, repeat in [
+        ("per-item page", lambda: per_item_page(db), args.repeat),
+        ("joined page", lambda: get_review_page(db, USER_ID), args.repeat),
+        ("all pages", lambda: walk_all_pages(db), max(1, args.repeat // 10)),
+    ]:
+        samples, queries = _time(db, fn, repeat)
+        print(
+            f"  {label:<14} median {samples[len(samples) // 2]:9.2f} ms"
+            f"   min {samples[0]:9.2f} ms   {queries:>5} queries"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Benchmark: random question sampling strategies.
+
+Times a 50-question draw (whole bank, and filtered to one topic) for each
+registered sampler, at several question-bank sizes.
+
+Usage (from backend/):
+    python -m benchmarks.bench_sampling [--sizes 10000,100000,1000000] [--repeat 20]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.catalog import invalidate_catalog, load_catalog
+from app.services.question_sampler import _SAMPLERS, sample_questions
+from benchmarks.common import make_session, seed_catalog
+
+CONCEPTS_PER_TOPIC = 50
+
+
+def _median_ms(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return samples[len(samples) // 2]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", default="10000,100000,1000000")
+    parser.add_argument("--count", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    for size in [int(s) for s in args.sizes.split(",")]:
+        invalidate_catalog()
+        db = make_session()
+        start = time.perf_counter()
+        seed_catalog(
+            db,
+            concepts_per_topic=CONCEPTS_PER_TOPIC,
+            questions_per_concept=max(1, size // (3 * CONCEPTS_PER_TOPIC)),
+        )
+        print(f"{size} questions (seeded in {time.perf_counter() - start:.1f}s)")
+
+        start = time.perf_counter()
+        load_catalog(db)
+        print(f"  catalog load {(time.perf_counter() - start) * 1000:9.1f} ms")
+
+        for name in _SAMPLERS:
+            whole = _median_ms(
+                lambda: sample_questions(db, args.count, strategy=name), args.repeat
+            )
+            topic = _median_ms(
+                lambda: sample_questions(db, args.count, topic_id=2, strategy=name),
+                args.repeat,
+            )
+            print(f"  {name:<16} all {whole:9.2f} ms   topic {topic:9.2f} ms")
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Shared helpers for the benchmark scripts."""
+import random
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base
+from app.models import Concept, Question, Streak, Topic, User
+
+
+def make_session(db_url: str = "sqlite:///:memory:"):
+    """Create a fresh schema and return a session bound to it."""
+    engine = create_engine(
+        db_url,
+        connect_args={"check_same_thread": False} if "sqlite" in db_url else {},
+        poolclass=StaticPool if db_url.endswith(":memory:") else None,
+    )
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(bind=engine)()
+
+
+def seed_catalog(
+    db,
+    n_topics: int = 3,
+    concepts_per_topic: int = 5,
+    questions_per_concept: int = 10,
+    n_users: int = 1,
+    seed: int = 42,
+) -> None:
+    """Insert a synthetic catalog plus users with ids 1..n_users."""
+    rng = random.Random(seed)
+    concept_id = 0
+    for t in range(1, n_topics + 1):
+        db.add(Topic(id=t, name=f"Topic {t}", slug=f"topic-{t}"))
+    db.flush()
+
+    questions = []
+    for t in range(1, n_topics + 1):
+        for _ in range(concepts_per_topic):
+            concept_id += 1
+            db.add(
+                Concept(
+                    id=concept_id,
+                    topic_id=t,
+                    name=f"Concept {concept_id}",
+                    slug=f"concept-{concept_id}",
+                )
+            )
+            db.flush()
+            for _ in range(questions_per_concept):
+                if len(questions) >= 10_000:
+                    db.execute(Question.__table__.insert(), questions)
+                    questions = []
+                questions.append(
+                    {
+                        "concept_id": concept_id,
+                        "text": "Synthetic question?",
+                        "difficulty": rng.randint(1, 5),
+                        "option_a": "A",
+                        "option_b": "B",
+                        "option_c": "C",
+                        "option_d": "D",
+                        "correct_option": rng.choice("abcd"),
+                        "explanation": "Synthetic.",
+                        "expected_time_seconds": 60,
+                        "is_active": True,
+                    }
+                )
+    if questions:
+        db.execute(Question.__table__.insert(), questions)
+
+    for u in range(1, n_users + 1):
+        db.add(
+            User(
+                id=u,
+                email=f"bench{u}@example.com",
+                hashed_password="x",
+                full_name=f"Bench User {u}",
+            )
+        )
+        db.add(Streak(user_id=u))
+    db.commit()
+
+
+def percentiles(samples_ms: list[float]) -> dict[str, float]:
+    """p50/p95/p99/max of a list of latencies in milliseconds."""
+    if not samples_ms:
+        return {"p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+    ordered = sorted(samples_ms)
+
+    def pick(q: float) -> float:
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    return {"p50": pick(0.50), "p95": pick(0.95), "p99": pick(0.99), "max": ordered[-1]}
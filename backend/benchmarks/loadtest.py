@@ -0,0 +1,244 @@
+"""
+Load test: drive the API with many concurrent simulated students.
+
+Each virtual user loops over a weighted mix of student requests (next
+question → answer it, dashboard, review queue, plan, trends, ...) until the
+duration runs out. Latencies are grouped by router and reported as
+throughput plus p50/p95/p99.
+
+The app runs in-process over httpx's ASGI transport by default, or is
+reached over HTTP with --url (e.g. a local `uvicorn app.main:app`). Either
+way the tokens are minted with the app's SECRET_KEY for users already in
+DATABASE_URL, so generate them first:
+
+Usage (from backend/):
+    python -m seeds.synthetic --users 1000
+    python -m benchmarks.loadtest [--concurrency 50] [--duration 30] [--url URL]
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from collections import defaultdict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+
+from app.config import settings
+from app.utils.security import create_access_token
+from benchmarks.common import percentiles
+
+PREFIX = settings.API_V1_PREFIX
+
+# (weight, name); "answer" is GET /questions/next followed by POST /attempts/
+SCENARIO = [
+    (30, "answer"),
+    (10, "dashboard"),
+    (5, "mastery"),
+    (5, "trends"),
+    (10, "review_queue"),
+    (5, "review_count"),
+    (8, "plan_today"),
+    (5, "history"),
+    (5, "streak"),
+    (5, "next_batch"),
+]
+
+
+class Recorder:
+    """Latency samples and error counts grouped by router."""
+
+    def __init__(self):
+        self.samples: dict[str, list[float]] = defaultdict(list)
+        self.errors: dict[str, int] = defaultdict(int)
+
+    async def call(self, client: httpx.AsyncClient, method: str, path: str, **kwargs):
+        router = path.split("/")[1]
+        start = time.perf_counter()
+        try:
+            response = await client.request(method, f"{PREFIX}{path}", **kwargs)
+        except httpx.HTTPError:
+            self.errors[router] += 1
+            return None
+        self.samples[router].append((time.perf_counter() - start) * 1000)
+        if response.status_code >= 400:
+            self.errors[router] += 1
+            return None
+        return response
+
+    def report(self, elapsed: float) -> dict[str, dict]:
+        result = {}
+        for router in sorted(self.samples.keys() | self.errors.keys()):
+            samples = self.samples[router]
+            result[router] = {
+                "requests": len(samples),
+                "errors": self.errors[router],
+                "rps": len(samples) / elapsed if elapsed else 0.0,
+                **percentiles(samples),
+            }
+        return result
+
+
+async def virtual_user(
+    client: httpx.AsyncClient,
+    recorder: Recorder,
+    token: str,
+    deadline: float,
+    rng: random.Random,
+    scenario: list[tuple[int, str]] = SCENARIO,
+):
+    headers = {"Authorization": f"Bearer {token}"}
+    weights = [w for w, _ in scenario]
+    names = [n for _, n in scenario]
+
+    while time.perf_counter() < deadline:
+        action = rng.choices(names, weights=weights)[0]
+        if action == "answer":
+            response = await recorder.call(client, "GET", "/questions/next", headers=headers)
+            if response is not None:
+                await recorder.call(
+                    client,
+                    "POST",
+                    "/attempts/",
+                    headers=headers,
+                    json={
+                        "question_id": response.json()["id"],
+                        "selected_option": rng.choice("abcd"),
+                        "time_taken_seconds": rng.randint(15, 150),
+                    },
+                )
+        elif action == "dashboard":
+            await recorder.call(client, "GET", "/stats/dashboard", headers=headers)
+        elif action == "mastery":
+            await recorder.call(client, "GET", "/stats/mastery", headers=headers)
+        elif action == "trends":
+            await recorder.call(client, "GET", "/stats/trends?days=30", headers=headers)
+        elif action == "review_queue":
+            await recorder.call(client, "GET", "/review/queue", headers=headers)
+        elif action == "review_count":
+            await recorder.call(client, "GET", "/review/queue/count", headers=headers)
+        elif action == "plan_today":
+            await recorder.call(client, "GET", "/plan/today", headers=headers)
+        elif action == "history":
+            await recorder.call(client, "GET", "/attempts/history", headers=headers)
+        elif action == "streak":
+            await recorder.call(client, "GET", "/streaks/current", headers=headers)
+        elif action == "next_batch":
+            await recorder.call(
+                client, "GET", "/questions/next/batch?count=10", headers=headers
+            )
+
+
+def _load_user_ids(limit: int, seed: int) -> list[int]:
+    """Pick up to limit random synthetic student ids from DATABASE_URL."""
+    from app.database import SessionLocal
+    from app.models.user import User
+
+    db = SessionLocal()
+    try:
+        ids = [
+            uid
+            for (uid,) in db.query(User.id)
+            .filter(User.email.like("synthetic%@example.com"))
+            .all()
+        ]
+    finally:
+        db.close()
+    random.Random(seed).shuffle(ids)
+    return ids[:limit]
+
+
+async def run(
+    url: str | None,
+    concurrency: int,
+    duration: float,
+    users: int,
+    seed: int,
+    scenario: list[tuple[int, str]] = SCENARIO,
+):
+    user_ids = _load_user_ids(max(users, concurrency), seed)
+    if not user_ids:
+        raise SystemExit("No synthetic users found; run `python -m seeds.synthetic` first.")
+    tokens = [create_access_token({"sub": str(uid)}) for uid in user_ids]
+
+    # httpx pools 100 connections by default; give every virtual user one
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    if url:
+        client = httpx.AsyncClient(base_url=url, timeout=60, limits=limits)
+        lifespan = None
+    else:
+        from app.main import app
+
+        client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app),
+            base_url="http://loadtest",
+            timeout=60,
+            limits=limits,
+        )
+        lifespan = app.router.lifespan_context(app)
+
+    recorder = Recorder()
+    rng = random.Random(seed)
+    async with client:
+        if lifespan:
+            await lifespan.__aenter__()
+        try:
+            start = time.perf_counter()
+            deadline = start + duration
+            await asyncio.gather(
+                *(
+                    virtual_user(
+                        client,
+                        recorder,
+                        tokens[i % len(tokens)],
+                        deadline,
+                        random.Random(rng.random()),
+                        scenario,
+                    )
+                    for i in range(concurrency)
+                )
+            )
+            elapsed = time.perf_counter() - start
+        finally:
+            if lifespan:
+                await lifespan.__aexit__(None, None, None)
+    return recorder.report(elapsed), elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", help="Base URL of a running server (default: in-process)")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--users", type=int, default=200, help="Distinct students to sample")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    report, elapsed = asyncio.run(
+        run(args.url, args.concurrency, args.duration, args.users, args.seed)
+    )
+    if args.json:
+        print(json.dumps({"elapsed_s": elapsed, "routers": report}, indent=2))
+        return
+
+    total = sum(r["requests"] for r in report.values())
+    target = args.url or "in-process"
+    print(f"\n{target}: {args.concurrency} clients, {elapsed:.1f}s, {total / elapsed:.1f} req/s")
+    print(
+        f"{'router':<12}{'requests':>10}{'errors':>8}{'req/s':>9}"
+        f"{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}"
+    )
+    for router, r in report.items():
+        print(
+            f"{router:<12}{r['requests']:>10}{r['errors']:>8}{r['rps']:>9.1f}"
+            f"{r['p50']:>9.1f}{r['p95']:>9.1f}{r['p99']:>9.1f}{r['max']:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
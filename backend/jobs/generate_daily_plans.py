@@ -0,0 +1,289 @@
+"""
+Pre-generate today's daily plans for active students.
+
+Without it, each student's first /plan/today of the day builds the plan
+inline, so the morning rush is a burst of weakest-concept queries, review
+counts and plan inserts. This job builds the plans ahead of time. After it
+runs, those first requests only read.
+
+Active students (activity in the last --active-days days) are streamed by
+id in chunks of --chunk-users. A thread pool handles the chunks. Each
+thread uses its own session and does four things:
+
+    1. Skips students who already have a plan for the day. The unique
+       (user_id, date) index settles races with /plan/today: conflicting
+       rows are skipped on insert.
+    2. Loads the 3 weakest concepts of every student in the chunk with one
+       ROW_NUMBER() window query, and due-review counts with one grouped
+       query.
+    3. Builds the plans with plan_service.build_plan_items (pure).
+    4. Bulk-inserts daily_plans and daily_plan_items, then commits.
+
+Reviews count as due if they fall due before the end of the plan's day.
+
+Running it again for the same day only fills in missing plans. It runs from
+cron via the CLI. PLAN_PREGENERATE_AT also runs it in-process once a day.
+That path is guarded by a file lock so only one worker per host runs it.
+
+Usage (from backend/):
+    python -m jobs.generate_daily_plans [--date 2026-10-17] [--workers 4]
+        [--chunk-users 1000] [--active-days 14]
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import exists, func, insert, select
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.daily_plan import DailyPlan, DailyPlanItem
+from app.models.review_item import ReviewItem
+from app.models.user import User
+from app.models.user_concept_stats import UserConceptStats
+from app.models.user_daily_activity import UserDailyActivity
+from app.services.plan_service import build_plan_items
+from app.services.user_cache import principal_from_row
+from app.utils.upsert import upsert_insert
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_USERS = 1000
+WEAKEST_COUNT = 3
+
+# Core executemany needs every row to carry the same keys; these mirror the
+# column defaults the ORM applies when plan_service inserts items
+_ITEM_DEFAULTS = {
+    "concept_id": None,
+    "question_count": 5,
+    "difficulty_range_min": 1,
+    "difficulty_range_max": 5,
+    "is_completed": False,
+}
+
+
+def active_user_chunks(db: Session, chunk_users: int, active_since: date | None):
+    """Yield lists of user ids, ascending, chunk_users at a time."""
+    query = select(User.id).order_by(User.id).limit(chunk_users)
+    if active_since is not None:
+        query = query.where(
+            exists().where(
+                UserDailyActivity.user_id == User.id,
+                UserDailyActivity.activity_date >= active_since,
+            )
+        )
+    last_id = 0
+    while True:
+        ids = db.execute(query.where(User.id > last_id)).scalars().all()
+        if not ids:
+            return
+        yield ids
+        last_id = ids[-1]
+
+
+def generate_chunk(db: Session, user_ids: list[int], day: date) -> int:
+    """Create the day's missing plans for user_ids; returns how many."""
+    planned = set(
+        db.execute(
+            select(DailyPlan.user_id).where(DailyPlan.date == day, DailyPlan.user_id.in_(user_ids))
+        ).scalars()
+    )
+    todo = [uid for uid in user_ids if uid not in planned]
+    if not todo:
+        return 0
+
+    principals = [
+        principal_from_row(row)
+        for row in db.execute(
+            select(User.id, User.is_admin, User.level, User.daily_minutes).where(
+                User.id.in_(todo)
+            )
+        )
+    ]
+    weakest = _weakest_concepts(db, todo)
+    reviews = _due_review_counts(db, todo, datetime.combine(day + timedelta(days=1), datetime.min.time()))
+
+    plans_table = DailyPlan.__table__
+    dialect_insert = upsert_insert(db)
+    stmt = insert(plans_table)
+    if dialect_insert is not None:
+        # A plan /plan/today created since the check above wins; its user is
+        # left out of RETURNING and gets no items from this chunk
+        stmt = dialect_insert(plans_table).on_conflict_do_nothing(
+            index_elements=[plans_table.c.user_id, plans_table.c.date]
+        )
+    plans = db.execute(
+        stmt.returning(plans_table.c.id, plans_table.c.user_id),
+        [
+            {
+                "user_id": p.id,
+                "date": day,
+                "total_minutes": p.daily_minutes,
+                "is_completed": False,
+                "created_at": datetime.utcnow(),
+            }
+            for p in principals
+        ],
+    )
+    plan_ids = {user_id: plan_id for plan_id, user_id in plans}
+    if not plan_ids:
+        db.rollback()
+        return 0
+
+    items = [
+        {**_ITEM_DEFAULTS, **item, "plan_id": plan_ids[p.id]}
+        for p in principals
+        if p.id in plan_ids
+        for item in build_plan_items(p, weakest.get(p.id, []), reviews.get(p.id, 0))
+    ]
+    db.execute(insert(DailyPlanItem.__table__), items)
+    db.commit()
+    return len(plan_ids)
+
+
+def generate_plans(
+    day: date,
+    workers: int = 4,
+    chunk_users: int = DEFAULT_CHUNK_USERS,
+    active_days: int = 14,
+    session_factory: sessionmaker = SessionLocal,
+    log=print,
+) -> dict:
+    """Generate the day's plans for every active user; returns a summary."""
+    active_since = day - timedelta(days=active_days) if active_days > 0 else None
+    start = time.perf_counter()
+    summary = {"users": 0, "created": 0, "chunks": 0}
+
+    def run(user_ids: list[int]) -> int:
+        db = session_factory()
+        try:
+            return generate_chunk(db, user_ids, day)
+        finally:
+            db.close()
+
+    reader = session_factory()
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            pending = []
+            for user_ids in active_user_chunks(reader, chunk_users, active_since):
+                summary["users"] += len(user_ids)
+                pending.append(pool.submit(run, user_ids))
+                # Bound the chunks held in memory to a couple per thread
+                if len(pending) >= 2 * workers:
+                    summary["created"] += pending.pop(0).result()
+                    summary["chunks"] += 1
+            for future in pending:
+                summary["created"] += future.result()
+                summary["chunks"] += 1
+    finally:
+        reader.close()
+
+    summary["seconds"] = time.perf_counter() - start
+    log(
+        f"{day}: {summary['created']} plans created for {summary['users']} active users "
+        f"in {summary['chunks']} chunks ({summary['seconds']:.1f}s)"
+    )
+    return summary
+
+
+async def run_scheduler() -> None:
+    """Run generate_plans daily at PLAN_PREGENERATE_AT (HH:MM, UTC), forever."""
+    run_at = datetime.strptime(settings.PLAN_PREGENERATE_AT, "%H:%M").time()
+    while True:
+        now = datetime.utcnow()
+        next_run = datetime.combine(now.date(), run_at)
+        if next_run <= now:
+            next_run += timedelta(days=1)
+        await asyncio.sleep((next_run - now).total_seconds())
+        try:
+            await _run_locked()
+        except Exception:
+            # Keep the schedule; tomorrow's run fills in whatever is missing
+            logger.exception("Daily plan pre-generation failed")
+
+
+async def _run_locked() -> None:
+    import fcntl
+
+    from starlette.concurrency import run_in_threadpool
+
+    with open(settings.PLAN_PREGENERATE_LOCK_FILE, "a") as lock:
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return  # Another worker on this host has it
+        try:
+            await run_in_threadpool(
+                generate_plans, date.today(), workers=settings.PLAN_PREGENERATE_WORKERS
+            )
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def _weakest_concepts(db: Session, user_ids: list[int]) -> dict[int, list]:
+    """user_id → up to WEAKEST_COUNT stats rows, lowest mastery first."""
+    rank = (
+        func.row_number()
+        .over(
+            partition_by=UserConceptStats.user_id,
+            order_by=(UserConceptStats.mastery.asc(), UserConceptStats.id.asc()),
+        )
+        .label("rank")
+    )
+    ranked = (
+        select(
+            UserConceptStats.user_id,
+            UserConceptStats.concept_id,
+            UserConceptStats.difficulty_comfort,
+            rank,
+        )
+        .where(UserConceptStats.user_id.in_(user_ids))
+        .subquery()
+    )
+    weakest: dict[int, list] = {}
+    for row in db.execute(
+        select(ranked.c.user_id, ranked.c.concept_id, ranked.c.difficulty_comfort)
+        .where(ranked.c.rank <= WEAKEST_COUNT)
+        .order_by(ranked.c.user_id, ranked.c.rank)
+    ):
+        weakest.setdefault(row.user_id, []).append(row)
+    return weakest
+
+
+def _due_review_counts(db: Session, user_ids: list[int], due_before: datetime) -> dict[int, int]:
+    return dict(
+        db.execute(
+            select(ReviewItem.user_id, func.count(ReviewItem.id))
+            .where(ReviewItem.user_id.in_(user_ids), ReviewItem.next_review_date < due_before)
+            .group_by(ReviewItem.user_id)
+        ).all()
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-generate daily plans for active users")
+    parser.add_argument(
+        "--date", type=date.fromisoformat, default=date.today(), help="Plan day (YYYY-MM-DD)"
+    )
+    parser.add_argument("--workers", type=int, default=4, help="Threads building chunks")
+    parser.add_argument("--chunk-users", type=int, default=DEFAULT_CHUNK_USERS)
+    parser.add_argument(
+        "--active-days",
+        type=int,
+        default=14,
+        help="Only users active in this many past days (0 = every user)",
+    )
+    args = parser.parse_args()
+    generate_plans(args.date, args.workers, args.chunk_users, args.active_days)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Rebuild user_daily_activity from the attempts table.
+
+Use after a backfill, a manual data fix, or if the table is suspected to
+have drifted. With --streaks, each affected user's streak is also
+recomputed from the rebuilt activity (days with answers; bare check-ins
+without answers are not in the attempts log and are dropped).
+
+Usage (from backend/):
+    python -m jobs.rebuild_daily_activity [--user-id 42 ...] [--streaks]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import SessionLocal
+from app.models.user_daily_activity import UserDailyActivity
+from app.services.activity_service import rebuild_daily_activity
+from app.services.streak_service import rebuild_streak
+
+STREAK_COMMIT_EVERY = 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild user_daily_activity from attempts")
+    parser.add_argument(
+        "--user-id",
+        type=int,
+        action="append",
+        dest="user_ids",
+        help="Only rebuild these users (repeatable); default is everyone",
+    )
+    parser.add_argument(
+        "--streaks", action="store_true", help="Also recompute streaks from the activity"
+    )
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        start = time.perf_counter()
+        rows = rebuild_daily_activity(db, args.user_ids)
+        db.commit()
+        print(f"Rebuilt {rows} activity rows in {time.perf_counter() - start:.1f}s")
+
+        if args.streaks:
+            user_ids = args.user_ids or [
+                uid for (uid,) in db.query(UserDailyActivity.user_id).distinct().all()
+            ]
+            for i, user_id in enumerate(user_ids, 1):
+                rebuild_streak(db, user_id)
+                if i % STREAK_COMMIT_EVERY == 0:
+                    db.commit()
+            db.commit()
+            print(f"Recomputed {len(user_ids)} streaks")
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
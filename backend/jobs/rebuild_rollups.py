@@ -0,0 +1,46 @@
+"""
+Rebuild user_rollups from the attempts table.
+
+Use after a backfill, a manual data fix, or if counters are suspected to have
+drifted. Rebuilding all users replaces every row in one transaction.
+
+Usage (from backend/):
+    python -m jobs.rebuild_rollups [--user-id 42 --user-id 43]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import SessionLocal
+from app.services.rollup_service import rebuild_rollups
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild user_rollups from attempts")
+    parser.add_argument(
+        "--user-id",
+        type=int,
+        action="append",
+        dest="user_ids",
+        help="Only rebuild these users (repeatable); default is everyone",
+    )
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        start = time.perf_counter()
+        rows = rebuild_rollups(db, args.user_ids)
+        db.commit()
+        print(f"Rebuilt {rows} rollups in {time.perf_counter() - start:.1f}s")
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,303 @@
+"""
+Recompute user_concept_stats by replaying the whole attempts log.
+
+Run this after changing a constant in mastery_kernel. Without it, existing
+rows keep the values the old formula produced.
+
+Users are split into fixed-width id ranges. A process pool handles the
+ranges. Each worker does three things:
+
+    1. Streams its range's attempts ordered by (user_id, created_at) through
+       a server-side cursor, so memory is bounded by one range.
+    2. Replays them with mastery_kernel.replay_streams.
+    3. Bulk-upserts the new rows.
+
+Each completed range is recorded in the --checkpoint file. Re-running with
+the same file skips those ranges. --dry-run writes nothing. It reports how
+far the recomputed values are from the stored ones instead.
+
+Replays start from an empty state. The diagnostic baseline set during
+onboarding is not in the attempts log, so it is dropped for every concept
+that has attempts. Concepts with only diagnostic results keep their rows.
+
+Usage (from backend/):
+    python -m jobs.recompute_mastery [--workers 8] [--batch-users 2000]
+        [--checkpoint recompute.json] [--dry-run [--top 20]]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal, engine
+from app.models.attempt import Attempt
+from app.models.question import Question
+from app.models.user_concept_stats import UserConceptStats
+from app.services.mastery_kernel import AttemptEvent, MasteryState, replay_streams
+from app.services.mastery_service import MASTERY_FIELDS, upsert_states
+
+DEFAULT_BATCH_USERS = 2000
+STREAM_CHUNK = 20_000
+WRITE_CHUNK = 5_000
+
+# Compared in --dry-run; timestamps differ by request latency and are ignored
+COMPARED_FIELDS = tuple(f for f in MASTERY_FIELDS if f not in ("last_seen", "last_correct"))
+
+# question_id → (concept_id, difficulty, expected_time_seconds), per worker
+_questions: dict[int, tuple[int, int, int]] = {}
+
+
+def load_questions(db: Session) -> dict[int, tuple[int, int, int]]:
+    """Every question (active or not) with the fields the kernel needs."""
+    return {
+        qid: (concept_id, difficulty or 3, expected or 90)
+        for qid, concept_id, difficulty, expected in db.execute(
+            select(
+                Question.id,
+                Question.concept_id,
+                Question.difficulty,
+                Question.expected_time_seconds,
+            )
+        )
+    }
+
+
+def user_ranges(db: Session, width: int) -> list[tuple[int, int]]:
+    """Half-open [lo, hi) user id windows covering every user with attempts.
+
+    Windows are aligned to multiples of width so checkpoint keys stay stable.
+    """
+    low, high = db.execute(select(func.min(Attempt.user_id), func.max(Attempt.user_id))).one()
+    if low is None:
+        return []
+    return [(lo, lo + width) for lo in range(low - low % width, high + 1, width)]
+
+
+def recompute_range(
+    db: Session,
+    lo: int,
+    hi: int,
+    questions: dict[int, tuple[int, int, int]],
+    dry_run: bool = False,
+    top: int = 0,
+) -> dict:
+    """Replay attempts of users lo <= id < hi; write (or diff) the results."""
+    streams: dict[tuple[int, int], list[AttemptEvent]] = {}
+    attempts = 0
+    # Core execution on the session's connection: no ORM row processing
+    rows = db.connection().execute(
+        select(
+            Attempt.user_id,
+            Attempt.question_id,
+            Attempt.is_correct,
+            Attempt.was_guessed,
+            Attempt.time_taken_seconds,
+            Attempt.created_at,
+        )
+        .where(Attempt.user_id >= lo, Attempt.user_id < hi)
+        .order_by(Attempt.user_id, Attempt.created_at, Attempt.id)
+        .execution_options(yield_per=STREAM_CHUNK)
+    )
+    for user_id, question_id, is_correct, was_guessed, time_taken, created_at in rows:
+        info = questions.get(question_id)
+        if info is None:
+            continue
+        concept_id, difficulty, expected = info
+        streams.setdefault((user_id, concept_id), []).append(
+            AttemptEvent(
+                is_correct=bool(is_correct),
+                was_guessed=bool(was_guessed),
+                time_taken=time_taken or 0,
+                difficulty=difficulty,
+                expected_time=expected,
+                at=created_at,
+            )
+        )
+        attempts += 1
+
+    states = replay_streams({}, streams)
+    summary = {
+        "ranges": 1,
+        "users": len({user_id for user_id, _ in states}),
+        "attempts": attempts,
+        "rows": len(states),
+    }
+    if dry_run:
+        summary.update(_diff(db, lo, hi, states, top))
+        return summary
+
+    items = list(states.items())
+    for i in range(0, len(items), WRITE_CHUNK):
+        upsert_states(db, dict(items[i : i + WRITE_CHUNK]))
+    db.commit()
+    return summary
+
+
+def _diff(
+    db: Session, lo: int, hi: int, states: dict[tuple[int, int], MasteryState], top: int
+) -> dict:
+    current = {
+        (row.user_id, row.concept_id): row
+        for row in db.execute(
+            select(
+                UserConceptStats.user_id,
+                UserConceptStats.concept_id,
+                *(getattr(UserConceptStats, f) for f in COMPARED_FIELDS),
+            ).where(UserConceptStats.user_id >= lo, UserConceptStats.user_id < hi)
+        )
+    }
+    new = changed = 0
+    deltas = []
+    for key, state in states.items():
+        row = current.get(key)
+        if row is None:
+            new += 1
+            continue
+        if any(getattr(row, f) != getattr(state, f) for f in COMPARED_FIELDS):
+            changed += 1
+        delta = state.mastery - (row.mastery or 0.0)
+        if delta:
+            deltas.append((abs(delta), key[0], key[1], row.mastery or 0.0, state.mastery))
+    deltas.sort(reverse=True)
+    return {
+        "new": new,
+        "changed": changed,
+        "mastery_delta_sum": sum(d[0] for d in deltas),
+        "mastery_delta_max": deltas[0][0] if deltas else 0.0,
+        "largest": [
+            {"user_id": u, "concept_id": c, "old": old, "new": value}
+            for _, u, c, old, value in deltas[:top]
+        ],
+    }
+
+
+def _init_worker():
+    # Forked children must not reuse the parent's pooled connections
+    engine.dispose(close=False)
+    db = SessionLocal()
+    try:
+        _questions.update(load_questions(db))
+    finally:
+        db.close()
+
+
+def _run_range(lo: int, hi: int, dry_run: bool, top: int) -> dict:
+    db = SessionLocal()
+    try:
+        return recompute_range(db, lo, hi, _questions, dry_run, top)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def _load_checkpoint(path: str | None, width: int) -> set[int]:
+    if not path or not os.path.exists(path):
+        return set()
+    with open(path) as f:
+        data = json.load(f)
+    if data["batch_users"] != width:
+        raise SystemExit(
+            f"{path} was written with --batch-users {data['batch_users']}; "
+            "use the same value or start a new checkpoint"
+        )
+    return set(data["done"])
+
+
+def _save_checkpoint(path: str, width: int, done: set[int]) -> None:
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump({"batch_users": width, "done": sorted(done)}, f)
+    os.replace(tmp, path)
+
+
+def _merge(total: dict, part: dict, top: int) -> None:
+    for key, value in part.items():
+        if key == "largest":
+            total[key] = sorted(
+                total.get(key, []) + value,
+                key=lambda d: abs(d["new"] - d["old"]),
+                reverse=True,
+            )[:top]
+        elif key == "mastery_delta_max":
+            total[key] = max(total.get(key, 0.0), value)
+        else:
+            total[key] = total.get(key, 0) + value
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recompute mastery from the attempts log")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument(
+        "--batch-users",
+        type=int,
+        default=DEFAULT_BATCH_USERS,
+        help="Width of each user id range handed to a worker",
+    )
+    parser.add_argument("--checkpoint", help="Record finished ranges here and resume from it")
+    parser.add_argument("--dry-run", action="store_true", help="Report differences, write nothing")
+    parser.add_argument("--top", type=int, default=20, help="Largest mastery changes to list")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        ranges = user_ranges(db, args.batch_users)
+    finally:
+        db.close()
+
+    done = set() if args.dry_run else _load_checkpoint(args.checkpoint, args.batch_users)
+    pending = [(lo, hi) for lo, hi in ranges if lo not in done]
+    print(f"{len(ranges)} ranges, {len(ranges) - len(pending)} already done")
+
+    start = time.perf_counter()
+    total: dict = {}
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker) as pool:
+        futures = {
+            pool.submit(_run_range, lo, hi, args.dry_run, args.top): lo for lo, hi in pending
+        }
+        for future in as_completed(futures):
+            _merge(total, future.result(), args.top)
+            if args.checkpoint and not args.dry_run:
+                done.add(futures[future])
+                _save_checkpoint(args.checkpoint, args.batch_users, done)
+            print(
+                f"\r{total['ranges']}/{len(pending)} ranges, "
+                f"{total['attempts']} attempts replayed",
+                end="",
+                flush=True,
+            )
+    elapsed = time.perf_counter() - start
+    print()
+
+    if not total:
+        print("Nothing to do")
+        return
+    rate = total["attempts"] / elapsed if elapsed else 0.0
+    print(
+        f"{total['users']} users, {total['rows']} stats rows from "
+        f"{total['attempts']} attempts in {elapsed:.1f}s ({rate:,.0f} attempts/s)"
+    )
+    if args.dry_run:
+        rows = total["rows"] or 1
+        print(
+            f"Dry run: {total['changed']} rows would change, {total['new']} would be created; "
+            f"mean |Δmastery| {total['mastery_delta_sum'] / rows:.4f}, "
+            f"max {total['mastery_delta_max']:.4f}"
+        )
+        for d in total["largest"]:
+            print(
+                f"  user {d['user_id']:>8} concept {d['concept_id']:>5}: "
+                f"{d['old']:.4f} → {d['new']:.4f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+"""Baseline schema (as created by Base.metadata.create_all before migrations)
+
+Databases that were bootstrapped by create_all already have these tables, so
+each one is only created when missing; `alembic upgrade head` is safe on both
+fresh and existing databases.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-16
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+
+    def create(name, *columns, indexes=()):
+        if name in existing:
+            return
+        op.create_table(name, *columns)
+        op.create_index(f"ix_{name}_id", name, ["id"])
+        for index_name, cols, unique in indexes:
+            op.create_index(index_name, name, cols, unique=unique)
+
+    create(
+        "topics",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("slug", sa.String(), nullable=False, unique=True),
+        sa.Column("description", sa.String()),
+        sa.Column("weight_in_exam", sa.Float()),
+        sa.Column("display_order", sa.Integer()),
+    )
+    create(
+        "users",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("email", sa.String(), nullable=False),
+        sa.Column("hashed_password", sa.String(), nullable=False),
+        sa.Column("full_name", sa.String(), nullable=False),
+        sa.Column("level", sa.String()),
+        sa.Column("exam_date", sa.DateTime()),
+        sa.Column("daily_minutes", sa.Integer()),
+        sa.Column("target_score", sa.Integer()),
+        sa.Column("study_focus", sa.String()),
+        sa.Column("is_admin", sa.Boolean()),
+        sa.Column("onboarding_complete", sa.Boolean()),
+        sa.Column("created_at", sa.DateTime()),
+        sa.Column("updated_at", sa.DateTime()),
+        indexes=[("ix_users_email", ["email"], True)],
+    )
+    create(
+        "concepts",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("topic_id", sa.Integer(), sa.ForeignKey("topics.id"), nullable=False),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("slug", sa.String(), nullable=False, unique=True),
+        sa.Column("description", sa.String()),
+        sa.Column(
+            "prerequisite_concept_id", sa.Integer(), sa.ForeignKey("concepts.id")
+        ),
+        sa.Column("display_order", sa.Integer()),
+    )
+    create(
+        "daily_plans",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("date", sa.Date(), nullable=False),
+        sa.Column("total_minutes", sa.Integer(), nullable=False),
+        sa.Column("is_completed", sa.Boolean()),
+        sa.Column("created_at", sa.DateTime()),
+    )
+    create(
+        "streaks",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column(
+            "user_id",
+            sa.Integer(),
+            sa.ForeignKey("users.id"),
+            nullable=False,
+            unique=True,
+        ),
+        sa.Column("current_streak", sa.Integer()),
+        sa.Column("longest_streak", sa.Integer()),
+        sa.Column("last_activity_date", sa.Date()),
+        sa.Column("streak_start_date", sa.Date()),
+    )
+    create(
+        "study_sessions",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("session_type", sa.String(), nullable=False),
+        sa.Column("question_count", sa.Integer()),
+        sa.Column("correct_count", sa.Integer()),
+        sa.Column("total_time_seconds", sa.Integer()),
+        sa.Column("started_at", sa.DateTime()),
+        sa.Column("ended_at", sa.DateTime()),
+        sa.Column("is_completed", sa.Boolean()),
+    )
+    create(
+        "daily_plan_items",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column(
+            "plan_id", sa.Integer(), sa.ForeignKey("daily_plans.id"), nullable=False
+        ),
+        sa.Column("item_type", sa.String(), nullable=False),
+        sa.Column("concept_id", sa.Integer(), sa.ForeignKey("concepts.id")),
+        sa.Column("duration_minutes", sa.Integer(), nullable=False),
+        sa.Column("question_count", sa.Integer()),
+        sa.Column("difficulty_range_min", sa.Integer()),
+        sa.Column("difficulty_range_max", sa.Integer()),
+        sa.Column("display_order", sa.Integer()),
+        sa.Column("is_completed", sa.Boolean()),
+    )
+    create(
+        "questions",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column(
+            "concept_id", sa.Integer(), sa.ForeignKey("concepts.id"), nullable=False
+        ),
+        sa.Column("text", sa.String(), nullable=False),
+        sa.Column("difficulty", sa.Integer()),
+        sa.Column("option_a", sa.String(), nullable=False),
+        sa.Column("option_b", sa.String(), nullable=False),
+        sa.Column("option_c", sa.String(), nullable=False),
+        sa.Column("option_d", sa.String(), nullable=False),
+        sa.Column("correct_option", sa.String(), nullable=False),
+        sa.Column("explanation", sa.String(), nullable=False),
+        sa.Column("hint", sa.String()),
+        sa.Column("why_wrong_a", sa.String()),
+        sa.Column("why_wrong_b", sa.String()),
+        sa.Column("why_wrong_c", sa.String()),
+        sa.Column("why_wrong_d", sa.String()),
+        sa.Column("expected_time_seconds", sa.Integer()),
+        sa.Column("tags", sa.String()),
+        sa.Column("is_active", sa.Boolean()),
+        sa.Column("created_at", sa.DateTime()),
+    )
+    create(
+        "user_concept_stats",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column(
+            "concept_id", sa.Integer(), sa.ForeignKey("concepts.id"), nullable=False
+        ),
+        sa.Column("mastery", sa.Float()),
+        sa.Column("difficulty_comfort", sa.Integer()),
+        sa.Column("total_attempts", sa.Integer()),
+        sa.Column("correct_attempts", sa.Integer()),
+        sa.Column("accuracy", sa.Float()),
+        sa.Column("avg_time_seconds", sa.Float()),
+        sa.Column("current_streak", sa.Integer()),
+        sa.Column("best_streak", sa.Integer()),
+        sa.Column("last_seen", sa.DateTime()),
+        sa.Column("last_correct", sa.DateTime()),
+        sa.UniqueConstraint("user_id", "concept_id", name="uq_user_concept"),
+    )
+    create(
+        "attempts",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column(
+            "question_id", sa.Integer(), sa.ForeignKey("questions.id"), nullable=False
+        ),
+        sa.Column("selected_option", sa.String(), nullable=False),
+        sa.Column("is_correct", sa.Boolean(), nullable=False),
+        sa.Column("time_taken_seconds", sa.Integer(), nullable=False),
+        sa.Column("was_guessed", sa.Boolean()),
+        sa.Column("hint_used", sa.Boolean()),
+        sa.Column("mistake_type", sa.String()),
+        sa.Column("session_id", sa.Integer(), sa.ForeignKey("study_sessions.id")),
+        sa.Column("created_at", sa.DateTime()),
+        sa.Column("next_review_date", sa.DateTime()),
+        sa.Column("review_interval_days", sa.Integer()),
+        sa.Column("review_count", sa.Integer()),
+    )
+
+
+def downgrade() -> None:
+    for name in (
+        "attempts",
+        "user_concept_stats",
+        "questions",
+        "daily_plan_items",
+        "study_sessions",
+        "streaks",
+        "daily_plans",
+        "concepts",
+        "users",
+        "topics",
+    ):
+        op.drop_table(name)
@@ -0,0 +1,49 @@
+"""Composite indexes for the hot query shapes
+
+    attempts            (user_id, is_correct, next_review_date)  due reviews
+    attempts            (user_id, created_at)                    trends, history
+    attempts            (user_id, question_id)                   seen-question index
+    questions           (concept_id, is_active, difficulty)      question lookup
+    daily_plans         (user_id, date)                          today's plan
+    daily_plan_items    (plan_id)                                plan items
+    user_concept_stats  (user_id, mastery)                       weakest concepts
+    study_sessions      (user_id, started_at)                    session history
+
+Kept in step with the Index entries in the models' __table_args__, which is
+what create_all uses for dev and test databases.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-16
+"""
+from alembic import op
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ("ix_attempts_user_review", "attempts", ["user_id", "is_correct", "next_review_date"]),
+    ("ix_attempts_user_created", "attempts", ["user_id", "created_at"]),
+    ("ix_attempts_user_question", "attempts", ["user_id", "question_id"]),
+    (
+        "ix_questions_concept_active_difficulty",
+        "questions",
+        ["concept_id", "is_active", "difficulty"],
+    ),
+    ("ix_daily_plans_user_date", "daily_plans", ["user_id", "date"]),
+    ("ix_daily_plan_items_plan_id", "daily_plan_items", ["plan_id"]),
+    ("ix_user_concept_stats_user_mastery", "user_concept_stats", ["user_id", "mastery"]),
+    ("ix_study_sessions_user_started", "study_sessions", ["user_id", "started_at"]),
+]
+
+
+def upgrade() -> None:
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, if_not_exists=True)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
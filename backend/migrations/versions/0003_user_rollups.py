@@ -0,0 +1,52 @@
+"""Per-user lifetime attempt counters (user_rollups), backfilled from attempts
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-16
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if "user_rollups" not in sa.inspect(op.get_bind()).get_table_names():
+        op.create_table(
+            "user_rollups",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column(
+                "user_id",
+                sa.Integer(),
+                sa.ForeignKey("users.id"),
+                nullable=False,
+                unique=True,
+            ),
+            sa.Column("total_attempts", sa.Integer(), nullable=False),
+            sa.Column("correct_attempts", sa.Integer(), nullable=False),
+            sa.Column("total_time_seconds", sa.Integer(), nullable=False),
+            sa.Column("updated_at", sa.DateTime()),
+        )
+        op.create_index("ix_user_rollups_id", "user_rollups", ["id"])
+
+    op.execute("DELETE FROM user_rollups")
+    op.execute(
+        """
+        INSERT INTO user_rollups
+            (user_id, total_attempts, correct_attempts, total_time_seconds, updated_at)
+        SELECT user_id,
+               COUNT(id),
+               SUM(CASE WHEN is_correct THEN 1 ELSE 0 END),
+               COALESCE(SUM(time_taken_seconds), 0),
+               CURRENT_TIMESTAMP
+        FROM attempts
+        GROUP BY user_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("user_rollups")
@@ -0,0 +1,54 @@
+"""Per-user daily activity facts (user_daily_activity), backfilled from attempts
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-16
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if "user_daily_activity" not in sa.inspect(op.get_bind()).get_table_names():
+        op.create_table(
+            "user_daily_activity",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+            sa.Column("activity_date", sa.Date(), nullable=False),
+            sa.Column("topic_id", sa.Integer(), sa.ForeignKey("topics.id"), nullable=False),
+            sa.Column("attempts", sa.Integer(), nullable=False),
+            sa.Column("correct", sa.Integer(), nullable=False),
+            sa.Column("time_seconds", sa.Integer(), nullable=False),
+            sa.UniqueConstraint(
+                "user_id", "activity_date", "topic_id", name="uq_user_daily_activity"
+            ),
+        )
+        op.create_index("ix_user_daily_activity_id", "user_daily_activity", ["id"])
+
+    op.execute("DELETE FROM user_daily_activity")
+    op.execute(
+        """
+        INSERT INTO user_daily_activity
+            (user_id, activity_date, topic_id, attempts, correct, time_seconds)
+        SELECT a.user_id,
+               DATE(a.created_at),
+               c.topic_id,
+               COUNT(a.id),
+               SUM(CASE WHEN a.is_correct THEN 1 ELSE 0 END),
+               COALESCE(SUM(a.time_taken_seconds), 0)
+        FROM attempts a
+        JOIN questions q ON q.id = a.question_id
+        JOIN concepts c ON c.id = q.concept_id
+        WHERE a.created_at IS NOT NULL
+        GROUP BY a.user_id, DATE(a.created_at), c.topic_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("user_daily_activity")
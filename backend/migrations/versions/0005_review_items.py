@@ -0,0 +1,85 @@
+"""Spaced-repetition state in review_items, backfilled from attempts
+
+One row per (user_id, question_id), taken from the user's latest wrong
+attempt at that question. attempts.next_review_date / review_interval_days /
+review_count are left in place but no longer written, so their index goes.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-16
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if "review_items" not in sa.inspect(op.get_bind()).get_table_names():
+        op.create_table(
+            "review_items",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+            sa.Column(
+                "question_id", sa.Integer(), sa.ForeignKey("questions.id"), nullable=False
+            ),
+            sa.Column(
+                "attempt_id", sa.Integer(), sa.ForeignKey("attempts.id"), nullable=False
+            ),
+            sa.Column("next_review_date", sa.DateTime(), nullable=False),
+            sa.Column("review_interval_days", sa.Integer(), nullable=False),
+            sa.Column("review_count", sa.Integer(), nullable=False),
+            sa.UniqueConstraint("user_id", "question_id", name="uq_review_item"),
+        )
+        op.create_index("ix_review_items_id", "review_items", ["id"])
+        op.create_index(
+            "ix_review_items_user_due", "review_items", ["user_id", "next_review_date"]
+        )
+
+    op.execute("DELETE FROM review_items")
+    op.execute(
+        """
+        INSERT INTO review_items
+            (user_id, question_id, attempt_id, next_review_date,
+             review_interval_days, review_count)
+        SELECT a.user_id,
+               a.question_id,
+               a.id,
+               a.next_review_date,
+               COALESCE(a.review_interval_days, 1),
+               COALESCE(a.review_count, 0)
+        FROM attempts a
+        JOIN (
+            SELECT MAX(id) AS id
+            FROM attempts
+            WHERE NOT is_correct AND next_review_date IS NOT NULL
+            GROUP BY user_id, question_id
+        ) latest ON latest.id = a.id
+        """
+    )
+    op.drop_index("ix_attempts_user_review", table_name="attempts", if_exists=True)
+
+
+def downgrade() -> None:
+    # Hand the current schedule back to each item's latest wrong attempt; the
+    # app has kept it only in review_items since this revision
+    op.execute(
+        """
+        UPDATE attempts
+        SET next_review_date = r.next_review_date,
+            review_interval_days = r.review_interval_days,
+            review_count = r.review_count
+        FROM review_items r
+        WHERE r.attempt_id = attempts.id
+        """
+    )
+    op.create_index(
+        "ix_attempts_user_review",
+        "attempts",
+        ["user_id", "is_correct", "next_review_date"],
+        if_not_exists=True,
+    )
+    op.drop_table("review_items")
@@ -0,0 +1,36 @@
+"""One daily plan per user and day: ix_daily_plans_user_date becomes unique
+
+The plan pre-generation job and /plan/today can both create a day's plan;
+the unique index makes the second insert a conflict instead of a duplicate.
+Existing duplicates keep their oldest plan, which is the one .first() most
+likely served.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17
+"""
+from alembic import op
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+_DUPLICATES = """
+    SELECT id FROM daily_plans
+    WHERE id NOT IN (SELECT MIN(id) FROM daily_plans GROUP BY user_id, date)
+"""
+
+
+def upgrade() -> None:
+    op.execute(f"DELETE FROM daily_plan_items WHERE plan_id IN ({_DUPLICATES})")
+    op.execute(f"DELETE FROM daily_plans WHERE id IN ({_DUPLICATES})")
+    op.drop_index("ix_daily_plans_user_date", table_name="daily_plans", if_exists=True)
+    op.create_index(
+        "ix_daily_plans_user_date", "daily_plans", ["user_id", "date"], unique=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_daily_plans_user_date", table_name="daily_plans")
+    op.create_index("ix_daily_plans_user_date", "daily_plans", ["user_id", "date"])
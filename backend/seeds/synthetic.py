@@ -0,0 +1,473 @@
+"""
+Synthetic data generator for GAT Mentor.
+
+Bulk-loads realistic student histories on top of the seeded catalog so the
+hot endpoints can be exercised at production volumes:
+
+- users (+ streaks) with a level, a daily budget and a per-concept ability
+- study sessions spread over the last --days days
+- attempts inside those sessions (difficulty-dependent correctness)
+- review_items for the questions answered wrong, due a day after the
+  latest mistake
+- user_concept_stats, user_rollups and user_daily_activity aggregated from
+  the generated attempts
+- one daily plan (3 items) per active day
+
+Rows are written per chunk of users: COPY on PostgreSQL, executemany on
+SQLite. Every synthetic user logs in with synthetic{id}@example.com /
+synthetic123.
+
+Usage (from backend/, DATABASE_URL selects the target database):
+    python -m seeds.synthetic --users 100000 --attempts-per-user 500
+"""
+import argparse
+import csv
+import io
+import math
+import os
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import func, insert, select, text
+from sqlalchemy.engine import Connection, Engine
+
+from app.models import (
+    Attempt,
+    Concept,
+    DailyPlan,
+    DailyPlanItem,
+    Question,
+    ReviewItem,
+    Streak,
+    StudySession,
+    User,
+    UserConceptStats,
+    UserDailyActivity,
+    UserRollup,
+)
+from app.utils.security import hash_password
+
+PASSWORD = "synthetic123"
+LEVELS = {"beginner": -0.8, "average": 0.0, "high_scorer": 0.9}
+DAILY_MINUTES = [30, 45, 60, 90]
+SESSION_SIZE = (8, 20)
+
+# Insert order respects foreign keys
+TABLES = [
+    User.__table__,
+    Streak.__table__,
+    StudySession.__table__,
+    Attempt.__table__,
+    ReviewItem.__table__,
+    UserConceptStats.__table__,
+    DailyPlan.__table__,
+    DailyPlanItem.__table__,
+    UserRollup.__table__,
+    UserDailyActivity.__table__,
+]
+
+
+def generate(
+    engine: Engine,
+    n_users: int,
+    attempts_per_user: int = 200,
+    days: int = 90,
+    chunk_users: int = 500,
+    seed: int = 42,
+    log=print,
+) -> dict[str, int]:
+    """Append n_users synthetic students; return the row count per table."""
+    rng = random.Random(seed)
+    with engine.connect() as conn:
+        questions = conn.execute(
+            select(
+                Question.id,
+                Question.concept_id,
+                Question.difficulty,
+                Question.expected_time_seconds,
+                Question.correct_option,
+            ).where(Question.is_active == True)
+        ).all()
+        topic_of = dict(conn.execute(select(Concept.id, Concept.topic_id)).all())
+        next_ids = {
+            table.name: (conn.execute(select(func.max(table.c.id))).scalar() or 0) + 1
+            for table in TABLES
+        }
+    if not questions:
+        raise RuntimeError("No active questions; run `python -m seeds.seed` first.")
+
+    by_concept: dict[int, list] = {}
+    for q in questions:
+        by_concept.setdefault(q.concept_id, []).append(q)
+    hashed = hash_password(PASSWORD)
+    write = _copy_rows if engine.dialect.name == "postgresql" else _executemany_rows
+
+    totals = {table.name: 0 for table in TABLES}
+    started = time.perf_counter()
+    for chunk_start in range(0, n_users, chunk_users):
+        rows = {table.name: [] for table in TABLES}
+        for _ in range(min(chunk_users, n_users - chunk_start)):
+            _generate_user(
+                rng, rows, next_ids, by_concept, topic_of, hashed, attempts_per_user, days
+            )
+
+        with engine.begin() as conn:
+            for table in TABLES:
+                if rows[table.name]:
+                    write(conn, table, rows[table.name])
+                    totals[table.name] += len(rows[table.name])
+
+        done = chunk_start + min(chunk_users, n_users - chunk_start)
+        log(
+            f"  {done}/{n_users} users, {totals['attempts']} attempts "
+            f"({time.perf_counter() - started:.1f}s)"
+        )
+
+    if engine.dialect.name == "postgresql":
+        with engine.begin() as conn:
+            for table in TABLES:
+                conn.execute(
+                    text(
+                        f"SELECT setval(pg_get_serial_sequence('{table.name}', 'id'), "
+                        f"(SELECT MAX(id) FROM {table.name}))"
+                    )
+                )
+    return totals
+
+
+def _generate_user(
+    rng, rows, next_ids, by_concept, topic_of, hashed, attempts_per_user, days
+):
+    """Append one student's rows (user, history, aggregates) to rows."""
+    now = datetime.utcnow()
+    user_id = _take_id(next_ids, "users")
+    level = rng.choice(list(LEVELS))
+    daily_minutes = rng.choice(DAILY_MINUTES)
+    concept_ids = list(by_concept)
+    ability = {c: LEVELS[level] + rng.gauss(0, 0.7) for c in concept_ids}
+    # Students favour a handful of concepts rather than spreading evenly
+    focus = [rng.random() ** 2 for _ in concept_ids]
+
+    rows["users"].append(
+        {
+            "id": user_id,
+            "email": f"synthetic{user_id}@example.com",
+            "hashed_password": hashed,
+            "full_name": f"Synthetic Student {user_id}",
+            "level": level,
+            "exam_date": now + timedelta(days=rng.randint(14, 120)),
+            "daily_minutes": daily_minutes,
+            "target_score": rng.choice([60, 70, 75, 80, 90]),
+            "study_focus": rng.choice(["quant", "verbal", "both"]),
+            "is_admin": False,
+            "onboarding_complete": True,
+            "created_at": now - timedelta(days=days),
+            "updated_at": now - timedelta(days=days),
+        }
+    )
+
+    n_attempts = max(1, int(rng.gauss(attempts_per_user, attempts_per_user * 0.4)))
+    n_sessions = max(1, round(n_attempts / (sum(SESSION_SIZE) / 2)))
+    # Oldest first; busy students fit several sessions into one day
+    session_days = sorted((rng.randrange(days) for _ in range(n_sessions)), reverse=True)
+
+    stats: dict[int, dict] = {}
+    # question_id → (latest wrong attempt id, when)
+    mistakes: dict[int, tuple[int, datetime]] = {}
+    activity: dict[tuple[date, int], list[int]] = {}
+    active_days: set[date] = set()
+    remaining = n_attempts
+    for i, days_ago in enumerate(session_days):
+        if remaining <= 0:
+            break
+        if i == len(session_days) - 1:
+            size = remaining
+        else:
+            size = min(remaining, rng.randint(*SESSION_SIZE))
+        remaining -= size
+
+        session_id = _take_id(next_ids, "study_sessions")
+        started_at = (now - timedelta(days=days_ago)).replace(
+            hour=rng.randint(7, 22), minute=rng.randint(0, 59)
+        )
+        if started_at > now:
+            started_at = now - timedelta(minutes=size * 2)
+        active_days.add(started_at.date())
+
+        at = started_at
+        correct_count = 0
+        total_time = 0
+        for _ in range(size):
+            concept_id = rng.choices(concept_ids, weights=focus)[0]
+            q = rng.choice(by_concept[concept_id])
+            difficulty = q.difficulty or 3
+            expected = q.expected_time_seconds or 90
+            p_correct = 1 / (1 + math.exp(-(ability[concept_id] - (difficulty - 3) * 0.6)))
+            is_correct = rng.random() < p_correct
+            taken = max(5, int(expected * rng.lognormvariate(0, 0.35)))
+            at += timedelta(seconds=taken)
+
+            attempt_id = _take_id(next_ids, "attempts")
+            rows["attempts"].append(
+                {
+                    "id": attempt_id,
+                    "user_id": user_id,
+                    "question_id": q.id,
+                    "selected_option": (
+                        q.correct_option
+                        if is_correct
+                        else rng.choice([o for o in "abcd" if o != q.correct_option])
+                    ),
+                    "is_correct": is_correct,
+                    "time_taken_seconds": taken,
+                    "was_guessed": rng.random() < 0.05,
+                    "hint_used": rng.random() < 0.1,
+                    "mistake_type": None,
+                    "session_id": session_id,
+                    "created_at": at,
+                }
+            )
+            if not is_correct:
+                mistakes[q.id] = (attempt_id, at)
+            _accumulate(stats, concept_id, is_correct, taken, at)
+            day_totals = activity.setdefault((at.date(), topic_of[concept_id]), [0, 0, 0])
+            day_totals[0] += 1
+            day_totals[1] += is_correct
+            day_totals[2] += taken
+            correct_count += is_correct
+            total_time += taken
+            # Practice slowly improves ability
+            ability[concept_id] += 0.01
+
+        rows["study_sessions"].append(
+            {
+                "id": session_id,
+                "user_id": user_id,
+                "session_type": rng.choice(["practice", "practice", "timed", "review"]),
+                "question_count": size,
+                "correct_count": correct_count,
+                "total_time_seconds": total_time,
+                "started_at": started_at,
+                "ended_at": at,
+                "is_completed": True,
+            }
+        )
+
+    for question_id, (attempt_id, at) in mistakes.items():
+        rows["review_items"].append(
+            {
+                "id": _take_id(next_ids, "review_items"),
+                "user_id": user_id,
+                "question_id": question_id,
+                "attempt_id": attempt_id,
+                "next_review_date": at + timedelta(days=1),
+                "review_interval_days": 1,
+                "review_count": 0,
+            }
+        )
+
+    for concept_id, s in stats.items():
+        accuracy = s["correct"] / s["total"]
+        mastery = round(accuracy * (1 - math.exp(-s["total"] / 15)), 4)
+        rows["user_concept_stats"].append(
+            {
+                "id": _take_id(next_ids, "user_concept_stats"),
+                "user_id": user_id,
+                "concept_id": concept_id,
+                "mastery": mastery,
+                "difficulty_comfort": 1 + round(mastery * 4),
+                "total_attempts": s["total"],
+                "correct_attempts": s["correct"],
+                "accuracy": accuracy,
+                "avg_time_seconds": s["avg_time"],
+                "current_streak": s["streak"],
+                "best_streak": s["best_streak"],
+                "last_seen": s["last_seen"],
+                "last_correct": s["last_correct"],
+            }
+        )
+
+    weakest = sorted(stats, key=lambda c: stats[c]["correct"] / stats[c]["total"])[:3]
+    for day in sorted(active_days):
+        plan_id = _take_id(next_ids, "daily_plans")
+        rows["daily_plans"].append(
+            {
+                "id": plan_id,
+                "user_id": user_id,
+                "date": day,
+                "total_minutes": daily_minutes,
+                "is_completed": rng.random() < 0.6,
+                "created_at": datetime.combine(day, datetime.min.time()),
+            }
+        )
+        for order, concept_id in enumerate(weakest):
+            rows["daily_plan_items"].append(
+                {
+                    "id": _take_id(next_ids, "daily_plan_items"),
+                    "plan_id": plan_id,
+                    "item_type": "weak_concept",
+                    "concept_id": concept_id,
+                    "duration_minutes": daily_minutes // 3,
+                    "question_count": 5,
+                    "difficulty_range_min": 1,
+                    "difficulty_range_max": 3,
+                    "display_order": order,
+                    "is_completed": rng.random() < 0.6,
+                }
+            )
+
+    rows["user_rollups"].append(
+        {
+            "id": _take_id(next_ids, "user_rollups"),
+            "user_id": user_id,
+            "total_attempts": sum(s["total"] for s in stats.values()),
+            "correct_attempts": sum(s["correct"] for s in stats.values()),
+            "total_time_seconds": sum(s["time"] for s in stats.values()),
+            "updated_at": now,
+        }
+    )
+
+    for (day, topic_id), (count, correct, time_seconds) in activity.items():
+        rows["user_daily_activity"].append(
+            {
+                "id": _take_id(next_ids, "user_daily_activity"),
+                "user_id": user_id,
+                "activity_date": day,
+                "topic_id": topic_id,
+                "attempts": count,
+                "correct": correct,
+                "time_seconds": time_seconds,
+            }
+        )
+
+    current, longest = _streaks(active_days, now.date())
+    rows["streaks"].append(
+        {
+            "id": _take_id(next_ids, "streaks"),
+            "user_id": user_id,
+            "current_streak": current,
+            "longest_streak": longest,
+            "last_activity_date": max(active_days) if active_days else None,
+            "streak_start_date": (
+                now.date() - timedelta(days=current - 1) if current else None
+            ),
+        }
+    )
+
+
+def _take_id(next_ids: dict[str, int], table: str) -> int:
+    value = next_ids[table]
+    next_ids[table] = value + 1
+    return value
+
+
+def _accumulate(stats: dict, concept_id: int, is_correct: bool, taken: int, at: datetime):
+    s = stats.setdefault(
+        concept_id,
+        {
+            "total": 0,
+            "correct": 0,
+            "time": 0,
+            "avg_time": 0.0,
+            "streak": 0,
+            "best_streak": 0,
+            "last_seen": None,
+            "last_correct": None,
+        },
+    )
+    s["total"] += 1
+    s["time"] += taken
+    s["avg_time"] = taken if s["total"] == 1 else s["avg_time"] * 0.8 + taken * 0.2
+    s["last_seen"] = at
+    if is_correct:
+        s["correct"] += 1
+        s["streak"] += 1
+        s["best_streak"] = max(s["best_streak"], s["streak"])
+        s["last_correct"] = at
+    else:
+        s["streak"] = 0
+
+
+def _streaks(active_days: set[date], today: date) -> tuple[int, int]:
+    """(current, longest) run of consecutive active days."""
+    longest = run = 0
+    previous = None
+    for day in sorted(active_days):
+        run = run + 1 if previous and day - previous == timedelta(days=1) else 1
+        longest = max(longest, run)
+        previous = day
+
+    current = 0
+    day = today if today in active_days else today - timedelta(days=1)
+    while day in active_days:
+        current += 1
+        day -= timedelta(days=1)
+    return current, longest
+
+
+def _executemany_rows(conn: Connection, table, rows: list[dict]) -> None:
+    conn.execute(insert(table), rows)
+
+
+def _copy_rows(conn: Connection, table, rows: list[dict]) -> None:
+    """Stream rows through COPY ... FROM STDIN (psycopg2)."""
+    columns = list(rows[0])
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow(["" if row[c] is None else row[c] for c in columns])
+    buffer.seek(0)
+
+    cursor = conn.connection.driver_connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY {table.name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)",
+            buffer,
+        )
+    finally:
+        cursor.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--attempts-per-user", type=int, default=200)
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument("--chunk-users", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    from app.database import Base, SessionLocal, engine
+    from app.models.topic import Topic
+    from seeds.seed import seed
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        if db.query(Topic).count() == 0:
+            seed()
+    finally:
+        db.close()
+
+    print(f"Generating {args.users} synthetic users on {engine.dialect.name}...")
+    totals = generate(
+        engine,
+        args.users,
+        attempts_per_user=args.attempts_per_user,
+        days=args.days,
+        chunk_users=args.chunk_users,
+        seed=args.seed,
+    )
+    print("\nSynthetic data complete!")
+    for name, count in totals.items():
+        print(f"  {name}: {count}")
+    print(f"\nLogin as synthetic<id>@example.com / {PASSWORD}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,40 @@
 """Test fixtures for GAT Mentor backend."""
+import random
+from datetime import datetime, timedelta
+
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
 from app.database import Base
 from app.dependencies import get_db
 from app.models import *
+from app.services.catalog import invalidate_catalog
+from app.services.lookahead_queue import clear_lookahead
+from app.services.review_count_cache import clear_due_count_cache
+from app.services.seen_index import clear_seen_index
+from app.services.user_cache import clear_user_cache
 from app.utils.security import hash_password
 
 
+@pytest.fixture(autouse=True)
+def reset_caches():
+    """Drop per-process caches so each test sees its own database."""
+    invalidate_catalog()
+    clear_seen_index()
+    clear_lookahead()
+    clear_user_cache()
+    clear_due_count_cache()
+    yield
+    invalidate_catalog()
+    clear_seen_index()
+    clear_lookahead()
+    clear_user_cache()
+    clear_due_count_cache()
+
+
 @pytest.fixture
 def test_engine():
     """Create an in-memory SQLite database for testing."""
@@ -23,6 +47,19 @@ def test_engine():
     return engine
 
 
+@pytest.fixture
+def query_log(test_engine):
+    """SQL statements executed on the test engine while the test runs."""
+    statements = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(test_engine, "before_cursor_execute", _record)
+    yield statements
+    event.remove(test_engine, "before_cursor_execute", _record)
+
+
 @pytest.fixture
 def test_db(test_engine):
     """Create a test database session."""
@@ -137,3 +174,65 @@ def client(test_engine):
 
     app.dependency_overrides[get_db] = override_get_db
     return TestClient(app)
+
+
+# Shared helpers (plain functions, imported from tests.conftest)
+
+STATS_FIELDS = (
+    "mastery",
+    "accuracy",
+    "avg_time_seconds",
+    "total_attempts",
+    "correct_attempts",
+    "current_streak",
+    "best_streak",
+    "difficulty_comfort",
+)
+
+
+def make_answers(db, n, seed=3):
+    """n answers over the seeded questions (repeats included), ~60% correct."""
+    rng = random.Random(seed)
+    questions = db.query(Question).all()
+    answers = []
+    for _ in range(n):
+        q = rng.choice(questions)
+        option = q.correct_option if rng.random() < 0.6 else "b"
+        answers.append(
+            {"question_id": q.id, "selected_option": option, "time_taken_seconds": rng.randint(20, 120)}
+        )
+    return answers
+
+
+def concept_stats(db, user_id):
+    """concept_id → STATS_FIELDS values of the user's stats rows, freshly read."""
+    db.expire_all()
+    return {
+        s.concept_id: tuple(getattr(s, f) for f in STATS_FIELDS)
+        for s in db.query(UserConceptStats).filter(UserConceptStats.user_id == user_id)
+    }
+
+
+def make_review_item(db, user_id=1, days_overdue=0, interval=1):
+    """Create a wrong attempt at a fresh question and its review item."""
+    question_id = db.query(ReviewItem).count() + 1
+    attempt = Attempt(
+        user_id=user_id,
+        question_id=question_id,
+        selected_option="b",
+        is_correct=False,
+        time_taken_seconds=60,
+    )
+    db.add(attempt)
+    db.flush()
+    item = ReviewItem(
+        user_id=user_id,
+        question_id=question_id,
+        attempt_id=attempt.id,
+        next_review_date=datetime.utcnow() - timedelta(days=days_overdue),
+        review_interval_days=interval,
+        review_count=0,
+    )
+    db.add(item)
+    db.commit()
+    return item
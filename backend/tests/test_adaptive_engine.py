@@ -1,14 +1,24 @@
 """Tests for the adaptive engine."""
+import random
 from datetime import datetime, timedelta
 
+from app.config import settings
+from app.models.attempt import Attempt
 from app.models.concept import Concept
 from app.models.user_concept_stats import UserConceptStats
+from app.services import lookahead_queue
 from app.services.adaptive_engine import (
     _calculate_priorities,
+    _calculate_top_priorities,
     _calculate_target_difficulty,
     _calculate_review_urgency,
     _select_concept,
+    get_next_question,
+    get_next_questions,
 )
+from app.services.catalog import get_catalog
+from app.services.mastery_service import update_mastery
+from app.services.seen_index import mark_seen
 
 
 def _make_stats(mastery=0.5, accuracy=0.5, total_attempts=10, last_seen_days_ago=0, streak=0):
@@ -138,3 +148,117 @@ def test_select_concept_weighted():
     selections = [_select_concept(priorities)["concept_id"] for _ in range(1000)]
     concept_1_count = selections.count(1)
     assert concept_1_count > 700  # Should be selected ~90% of the time
+
+
+def _random_catalog(n_concepts, n_topics, seed):
+    """Helper to build concepts plus partial, randomized stats."""
+    rng = random.Random(seed)
+    concepts = [
+        Concept(id=i + 1, topic_id=rng.randint(1, n_topics), name=f"C{i}", slug=f"c{i}")
+        for i in range(n_concepts)
+    ]
+    stats = {}
+    for concept in concepts:
+        if rng.random() < 0.3:
+            continue  # Never practiced
+        s = _make_stats(
+            mastery=rng.choice([0.0, 0.25, 0.5, rng.random()]),
+            accuracy=rng.choice([0.0, 0.5, rng.random()]),
+            total_attempts=rng.randint(0, 40),
+            last_seen_days_ago=rng.choice([None, 0, 3, 4, 8, 15, 22, rng.randint(0, 60)]),
+        )
+        s.concept_id = concept.id
+        stats[concept.id] = s
+    return concepts, stats
+
+
+def test_vectorized_priorities_match_reference():
+    """Vectorized scoring should reproduce the scalar ranking exactly."""
+    for seed in range(5):
+        concepts, stats = _random_catalog(400, 4, seed)
+
+        expected = _calculate_priorities(concepts, stats)
+        assert _calculate_top_priorities(concepts, stats, top_n=None) == expected
+        assert _calculate_top_priorities(concepts, stats, top_n=5) == expected[:5]
+
+
+def test_vectorized_top_n_keeps_tie_order():
+    """Ties at the top-N cut-off should resolve in concept order."""
+    concepts = [
+        Concept(id=i, topic_id=1, name=f"New {i}", slug=f"n{i}") for i in range(10, 0, -1)
+    ]
+
+    top = _calculate_top_priorities(concepts, {}, top_n=3)
+    assert [p["concept_id"] for p in top] == [10, 9, 8]
+    assert top == _calculate_priorities(concepts, {})[:3]
+
+
+def test_lookahead_serves_queued_questions(seeded_db, monkeypatch):
+    """Lookahead mode should plan K distinct questions and serve them in turn."""
+    monkeypatch.setattr(settings, "ADAPTIVE_LOOKAHEAD", 4)
+
+    first = get_next_question(seeded_db, 1)
+    assert lookahead_queue.queued(1) == 3
+
+    served = [first.id] + [get_next_question(seeded_db, 1).id for _ in range(3)]
+    assert len(set(served)) == 4
+    assert lookahead_queue.queued(1) == 0
+
+
+def test_lookahead_invalidated_by_mastery_shift(seeded_db, monkeypatch):
+    """A mastery update that moves priorities should drop the queue."""
+    monkeypatch.setattr(settings, "ADAPTIVE_LOOKAHEAD", 4)
+    question = get_next_question(seeded_db, 1)
+    assert lookahead_queue.queued(1) == 3
+
+    attempt = Attempt(is_correct=True, time_taken_seconds=10, was_guessed=False)
+    update_mastery(seeded_db, 1, question, attempt)
+    assert lookahead_queue.queued(1) == 0
+
+
+def test_batch_selection_returns_distinct_unanswered_first(seeded_db):
+    """A batch should hold distinct questions, unanswered before answered."""
+    answered = get_next_question(seeded_db, 1)
+    seeded_db.add(
+        Attempt(
+            user_id=1,
+            question_id=answered.id,
+            selected_option="a",
+            is_correct=True,
+            time_taken_seconds=30,
+        )
+    )
+    seeded_db.commit()
+    mark_seen(1, answered.concept_id, answered.id)
+
+    batch = get_next_questions(seeded_db, 1, 9)
+    ids = [q.id for q in batch]
+    assert len(ids) == 9
+    assert len(set(ids)) == 9
+    assert ids[-1] == answered.id
+
+
+def test_batch_selection_query_count_is_fixed(seeded_db, query_log):
+    """Batch size should not change the number of queries issued."""
+    get_catalog(seeded_db)
+    query_log.clear()
+
+    get_next_questions(seeded_db, 1, 8)
+    assert len(query_log) <= 3
+
+
+def test_batch_endpoint(seeded_db, client):
+    """/questions/next/batch should return an adaptive set."""
+    token = client.post(
+        "/api/v1/auth/login",
+        json={"email": "test@test.com", "password": "test123"},
+    ).json()["access_token"]
+
+    resp = client.get(
+        "/api/v1/questions/next/batch?count=4&topic_id=1",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["count"] == 4
+    assert {q["topic_name"] for q in data["questions"]} == {"Verbal"}
@@ -0,0 +1,112 @@
+"""Tests for the async hot-path routes (ASYNC_DB)."""
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+from app.config import settings
+from app.database import Base, async_database_url
+from app.dependencies import get_async_db, get_db
+from app.models.user_concept_stats import UserConceptStats
+from app.utils.security import create_access_token
+
+PREFIX = settings.API_V1_PREFIX
+HEADERS = {"Authorization": f"Bearer {create_access_token({'sub': '1'})}"}
+
+
+@pytest.fixture
+def test_engine(tmp_path):
+    """A file database, so the sync fixtures and the async engine share data."""
+    engine = create_engine(f"sqlite:///{tmp_path}/async.db")
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def sync_calls():
+    return []
+
+
+@pytest.fixture
+def async_client(test_engine, seeded_db, sync_calls, monkeypatch):
+    """The real app with ASYNC_DB on; counts sync sessions handed out."""
+    from app.main import create_app
+
+    monkeypatch.setattr(settings, "ASYNC_DB", True)
+    app = create_app()
+
+    TestSession = sessionmaker(bind=test_engine)
+    # A fresh event loop per TestClient request; don't pool across loops
+    async_engine = create_async_engine(
+        async_database_url(str(test_engine.url)), poolclass=NullPool
+    )
+    AsyncTestSession = async_sessionmaker(async_engine, expire_on_commit=False)
+
+    def override_get_db():
+        sync_calls.append(1)
+        db = TestSession()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def override_get_async_db():
+        async with AsyncTestSession() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    return TestClient(app)
+
+
+def test_async_database_url():
+    assert async_database_url("sqlite:///./x.db") == "sqlite+aiosqlite:///./x.db"
+    assert async_database_url("postgresql://u:p@h/db") == "postgresql+asyncpg://u:p@h/db"
+    assert (
+        async_database_url("postgresql+psycopg2://u:p@h/db") == "postgresql+asyncpg://u:p@h/db"
+    )
+
+
+def test_hot_routes_run_on_async_sessions(async_client, seeded_db, sync_calls):
+    """Answer a question wrong, then read it back through every async route."""
+    response = async_client.get(f"{PREFIX}/questions/next", headers=HEADERS)
+    assert response.status_code == 200
+    question = response.json()
+
+    response = async_client.post(
+        f"{PREFIX}/attempts/",
+        headers=HEADERS,
+        json={"question_id": question["id"], "selected_option": "b", "time_taken_seconds": 40},
+    )
+    assert response.status_code == 200
+    assert response.json()["is_correct"] is False
+
+    stats = (
+        seeded_db.query(UserConceptStats)
+        .filter(UserConceptStats.concept_id == question["concept_id"])
+        .one()
+    )
+    assert stats.total_attempts == 1
+
+    dashboard = async_client.get(f"{PREFIX}/stats/dashboard", headers=HEADERS).json()
+    assert dashboard["total_questions_done"] == 1
+
+    # Not due until tomorrow
+    assert async_client.get(f"{PREFIX}/review/queue", headers=HEADERS).json()["count"] == 0
+
+    assert sync_calls == []
+
+
+def test_cold_routes_stay_sync(async_client, sync_calls):
+    assert async_client.get(f"{PREFIX}/review/queue/count", headers=HEADERS).status_code == 200
+    assert sync_calls
+
+
+def test_async_routes_reject_bad_tokens(async_client):
+    response = async_client.get(
+        f"{PREFIX}/stats/dashboard", headers={"Authorization": "Bearer nope"}
+    )
+    assert response.status_code == 401
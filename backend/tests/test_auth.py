@@ -1,4 +1,7 @@
 """Tests for authentication endpoints."""
+from app.config import settings
+from app.models.user import User
+from app.utils.security import needs_rehash, verify_password
 
 
 def test_register(client):
@@ -80,3 +83,39 @@ def test_unauthorized_access(client):
         headers={"Authorization": "Bearer invalid_token"},
     )
     assert resp.status_code == 401
+
+
+def test_login_rehashes_when_cost_changes(client, test_db, monkeypatch):
+    monkeypatch.setattr(settings, "BCRYPT_ROUNDS", 4)
+    client.post(
+        "/api/v1/auth/register",
+        json={"email": "cost@test.com", "password": "pass123", "full_name": "Cost User"},
+    )
+    user = test_db.query(User).filter(User.email == "cost@test.com").one()
+    assert user.hashed_password.startswith("$2b$04$")
+
+    monkeypatch.setattr(settings, "BCRYPT_ROUNDS", 5)
+    resp = client.post(
+        "/api/v1/auth/login",
+        json={"email": "cost@test.com", "password": "pass123"},
+    )
+    assert resp.status_code == 200
+
+    test_db.expire_all()
+    assert user.hashed_password.startswith("$2b$05$")
+    assert verify_password("pass123", user.hashed_password)
+    assert not needs_rehash(user.hashed_password)
+
+
+def test_hashing_in_threadpool(client, monkeypatch):
+    monkeypatch.setattr(settings, "BCRYPT_ROUNDS", 4)
+    monkeypatch.setattr(settings, "PASSWORD_HASH_WORKERS", 0)
+    client.post(
+        "/api/v1/auth/register",
+        json={"email": "inline@test.com", "password": "pass123", "full_name": "Inline"},
+    )
+    resp = client.post(
+        "/api/v1/auth/login",
+        json={"email": "inline@test.com", "password": "pass123"},
+    )
+    assert resp.status_code == 200
@@ -0,0 +1,35 @@
+"""Tests for the in-process catalog cache."""
+from app.models.question import Question
+from app.services.catalog import get_catalog, invalidate_catalog, load_catalog
+
+
+def test_catalog_resolves_names(seeded_db):
+    """Concept and topic names should resolve from the snapshot."""
+    catalog = get_catalog(seeded_db)
+    assert catalog.concept_name(3) == "Algebra"
+    assert catalog.topic_name_for_concept(3) == "Quantitative"
+    assert catalog.concept_name(999) is None
+    assert catalog.topic_name_for_concept(None) is None
+
+
+def test_catalog_orders_active_questions_by_difficulty(seeded_db):
+    """Per-concept question lists should hold active questions, easiest first."""
+    question = seeded_db.query(Question).filter(Question.concept_id == 1).first()
+    question.is_active = False
+    seeded_db.commit()
+
+    entries = get_catalog(seeded_db).questions_by_concept[1]
+    assert question.id not in [e.id for e in entries]
+    assert [e.difficulty for e in entries] == sorted(e.difficulty for e in entries)
+
+
+def test_catalog_is_reused_until_invalidated(seeded_db):
+    """Readers share one snapshot; invalidation forces a reload with a new version."""
+    first = get_catalog(seeded_db)
+    assert get_catalog(seeded_db) is first
+
+    invalidate_catalog()
+    second = get_catalog(seeded_db)
+    assert second is not first
+    assert second.version > first.version
+    assert load_catalog(seeded_db).version > second.version
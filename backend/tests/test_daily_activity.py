@@ -0,0 +1,113 @@
+"""Tests for the per-user daily activity table."""
+from datetime import datetime, timedelta
+
+from app.models.streak import Streak
+from app.models.user_daily_activity import UserDailyActivity
+from app.services.activity_service import rebuild_daily_activity, record_activity
+from app.services.session_service import start_session, submit_session
+from app.services.stats_service import get_heatmap, get_trends
+from app.services.streak_service import rebuild_streak
+
+
+def _rows(db, user_id=1):
+    db.expire_all()
+    return {
+        (r.activity_date, r.topic_id): (r.attempts, r.correct, r.time_seconds)
+        for r in db.query(UserDailyActivity).filter(UserDailyActivity.user_id == user_id)
+    }
+
+
+def _login(client):
+    token = client.post(
+        "/api/v1/auth/login",
+        json={"email": "test@test.com", "password": "test123"},
+    ).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_attempt_endpoint_upserts_activity(seeded_db, client):
+    """Answers add to today's row for the question's topic."""
+    headers = _login(client)
+    # Questions 1-3 are Synonyms (Verbal), 7-9 Algebra (Quantitative)
+    for qid, option, seconds in [(1, "a", 30), (2, "b", 40), (7, "a", 50)]:
+        resp = client.post(
+            "/api/v1/attempts/",
+            json={"question_id": qid, "selected_option": option, "time_taken_seconds": seconds},
+            headers=headers,
+        )
+        assert resp.status_code == 200
+
+    today = datetime.utcnow().date()
+    assert _rows(seeded_db) == {(today, 1): (2, 1, 70), (today, 2): (1, 1, 50)}
+
+
+def test_session_submit_splits_activity_by_topic(seeded_db):
+    session, questions = start_session(seeded_db, 1, "practice", 9)
+    submit_session(
+        seeded_db,
+        1,
+        session.id,
+        [
+            {"question_id": q.id, "selected_option": "a", "time_taken_seconds": 10}
+            for q in questions
+        ],
+    )
+
+    rows = _rows(seeded_db)
+    assert sum(v[0] for v in rows.values()) == 9
+    assert {topic for _, topic in rows} == {1, 2}
+
+
+def test_rebuild_matches_write_path(seeded_db, client):
+    """Rebuilding from attempts reproduces the incrementally kept rows."""
+    headers = _login(client)
+    for qid in (1, 4, 7, 8):
+        client.post(
+            "/api/v1/attempts/",
+            json={"question_id": qid, "selected_option": "a", "time_taken_seconds": 25},
+            headers=headers,
+        )
+    incremental = _rows(seeded_db)
+
+    seeded_db.query(UserDailyActivity).delete()
+    rebuild_daily_activity(seeded_db)
+    seeded_db.commit()
+
+    assert _rows(seeded_db) == incremental
+
+
+def test_heatmap_and_topic_trends(seeded_db):
+    today = datetime.utcnow().date()
+    record_activity(seeded_db, 1, [(1, True, 60), (3, False, 120)], day=today)
+    record_activity(seeded_db, 1, [(2, True, 30)], day=today - timedelta(days=3))
+    seeded_db.commit()
+
+    heatmap = get_heatmap(seeded_db, 1, days=30)
+    assert heatmap["active_days"] == 2
+    assert heatmap["max_questions"] == 2
+    assert heatmap["days"][-1] == {
+        "date": today.isoformat(),
+        "questions_done": 2,
+        "correct": 1,
+        "minutes": 3.0,
+        "topics": {"Verbal": 1, "Quantitative": 1},
+    }
+
+    verbal = get_trends(seeded_db, 1, days=7, topic_id=1)
+    assert [t["questions_done"] for t in verbal][-4:] == [1, 0, 0, 1]
+
+
+def test_rebuild_streak_from_activity(seeded_db):
+    """Streaks are recomputed from days with answers."""
+    today = datetime.utcnow().date()
+    for days_ago in (0, 1, 2, 5, 6, 7, 8):
+        record_activity(seeded_db, 1, [(1, True, 30)], day=today - timedelta(days=days_ago))
+    seeded_db.commit()
+
+    streak = rebuild_streak(seeded_db, 1)
+    seeded_db.commit()
+
+    assert (streak.current_streak, streak.longest_streak) == (3, 4)
+    assert streak.streak_start_date == today - timedelta(days=2)
+    assert streak.last_activity_date == today
+    assert seeded_db.query(Streak).filter(Streak.user_id == 1).count() == 1
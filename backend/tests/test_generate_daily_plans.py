@@ -0,0 +1,202 @@
+"""Tests for the nightly daily-plan pre-generation job."""
+import asyncio
+from datetime import date, timedelta
+
+import pytest
+from pydantic import ValidationError
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.config import Settings, settings
+from app.database import Base
+from app.models.daily_plan import DailyPlan, DailyPlanItem
+from app.models.user import User
+from app.models.user_concept_stats import UserConceptStats
+from app.models.user_daily_activity import UserDailyActivity
+from app.services import plan_service
+from app.services.plan_service import generate_daily_plan
+from app.services.user_cache import get_principal
+from jobs import generate_daily_plans
+from jobs.generate_daily_plans import generate_chunk, generate_plans
+from tests.conftest import make_review_item
+
+ITEM_FIELDS = (
+    "item_type",
+    "concept_id",
+    "duration_minutes",
+    "question_count",
+    "difficulty_range_min",
+    "difficulty_range_max",
+    "display_order",
+    "is_completed",
+)
+
+
+@pytest.fixture
+def test_engine(tmp_path):
+    """File-backed SQLite, so each of the job's threads gets its own connection."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'students.db'}")
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def students_db(seeded_db):
+    """Four students: 1-3 active this week, 4 idle for a month."""
+    today = date.today()
+    seeded_db.add_all(
+        User(
+            id=uid,
+            email=f"s{uid}@test.com",
+            hashed_password="x",
+            full_name=f"Student {uid}",
+            daily_minutes=minutes,
+        )
+        for uid, minutes in ((2, 30), (3, 90), (4, 45))
+    )
+    seeded_db.flush()
+    for uid, days_ago in ((1, 0), (2, 3), (3, 13), (4, 30)):
+        seeded_db.add(
+            UserDailyActivity(user_id=uid, activity_date=today - timedelta(days=days_ago), topic_id=1)
+        )
+    for uid, masteries in ((1, (0.5, 0.2, 0.8)), (3, (0.1, 0.1))):
+        for concept_id, mastery in enumerate(masteries, start=1):
+            seeded_db.add(
+                UserConceptStats(
+                    user_id=uid, concept_id=concept_id, mastery=mastery, difficulty_comfort=concept_id
+                )
+            )
+    seeded_db.commit()
+    # Two reviews due for student 1, one due next week for student 2
+    make_review_item(seeded_db, user_id=1, days_overdue=1)
+    make_review_item(seeded_db, user_id=1)
+    make_review_item(seeded_db, user_id=2, days_overdue=-7)
+    return seeded_db
+
+
+def _items(db, user_id: int) -> list[tuple]:
+    plan = db.query(DailyPlan).filter(DailyPlan.user_id == user_id).one()
+    items = db.query(DailyPlanItem).filter(DailyPlanItem.plan_id == plan.id)
+    return [
+        tuple(getattr(item, field) for field in ITEM_FIELDS)
+        for item in items.order_by(DailyPlanItem.display_order)
+    ]
+
+
+def _run(db, **kwargs) -> dict:
+    factory = sessionmaker(bind=db.get_bind())
+    return generate_plans(date.today(), session_factory=factory, log=lambda _: None, **kwargs)
+
+
+def test_batch_plans_match_live_generation(students_db):
+    summary = _run(students_db, workers=2, chunk_users=2)
+    assert summary["users"] == summary["created"] == 3
+    assert summary["chunks"] == 2
+
+    batch = {uid: _items(students_db, uid) for uid in (1, 2, 3)}
+    assert [item[0] for item in batch[1]].count("weak_topic_drill") == 3
+    assert batch[1][-1][:4] == ("mistake_review", None, 9, 2)
+    assert "mistake_review" not in [item[0] for item in batch[2]]
+    students_db.expire_all()
+    for uid in (1, 2, 3):
+        generate_daily_plan(students_db, get_principal(students_db, uid))
+        assert _items(students_db, uid) == batch[uid]
+
+
+def test_inactive_users_are_skipped(students_db):
+    _run(students_db)
+    assert students_db.query(DailyPlan).filter(DailyPlan.user_id == 4).count() == 0
+
+    summary = _run(students_db, active_days=0)
+    assert summary["created"] == 1
+    assert students_db.query(DailyPlan).filter(DailyPlan.user_id == 4).count() == 1
+
+
+def test_rerun_only_fills_missing_plans(students_db):
+    generate_daily_plan(students_db, get_principal(students_db, 2))
+    kept = students_db.query(DailyPlan).filter(DailyPlan.user_id == 2).one().id
+
+    assert _run(students_db)["created"] == 2
+    assert students_db.query(DailyPlan).filter(DailyPlan.user_id == 2).one().id == kept
+    assert _run(students_db)["created"] == 0
+    assert students_db.query(DailyPlan).count() == 3
+
+
+def test_one_insert_per_table_per_chunk(students_db, query_log):
+    query_log.clear()
+    _run(students_db)
+    inserts = [s for s in query_log if s.startswith("INSERT")]
+    assert len(inserts) == 2
+
+
+def test_plan_created_during_chunk_is_kept(students_db, monkeypatch):
+    """A /plan/today that lands after the existence check wins the insert."""
+    load_weakest = generate_daily_plans._weakest_concepts
+
+    def racing_request(db, user_ids):
+        db.add(DailyPlan(user_id=2, date=date.today(), total_minutes=30))
+        db.flush()
+        return load_weakest(db, user_ids)
+
+    monkeypatch.setattr(generate_daily_plans, "_weakest_concepts", racing_request)
+    assert _run(students_db)["created"] == 2
+
+    plan = students_db.query(DailyPlan).filter(DailyPlan.user_id == 2).one()
+    assert students_db.query(DailyPlanItem).filter(DailyPlanItem.plan_id == plan.id).count() == 0
+
+
+def test_today_plan_reads_plan_created_concurrently(tmp_path, monkeypatch):
+    """/plan/today losing the race to the job returns the job's plan."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'plans.db'}")
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+    request, job = Session(), Session()
+    try:
+        request.add(User(id=1, email="a@test.com", hashed_password="x", full_name="A"))
+        request.commit()
+        principal = get_principal(request, 1)
+        load_weakest = plan_service._get_weakest_concepts
+
+        def job_runs_first(db, user_id, count=3):
+            generate_chunk(job, [user_id], date.today())
+            return load_weakest(db, user_id, count)
+
+        monkeypatch.setattr(plan_service, "_get_weakest_concepts", job_runs_first)
+        plan = plan_service.get_or_generate_today_plan(request, principal)
+
+        assert request.query(DailyPlan).count() == 1
+        assert plan.id == job.query(DailyPlan.id).scalar()
+    finally:
+        request.close()
+        job.close()
+        engine.dispose()
+
+
+def test_pregenerate_time_is_validated():
+    assert Settings(PLAN_PREGENERATE_AT="02:30").PLAN_PREGENERATE_AT == "02:30"
+    with pytest.raises(ValidationError):
+        Settings(PLAN_PREGENERATE_AT="25:00")
+
+
+def test_scheduler_logs_failures_and_keeps_running(tmp_path, monkeypatch, caplog):
+    monkeypatch.setattr(settings, "PLAN_PREGENERATE_AT", "02:30")
+    monkeypatch.setattr(settings, "PLAN_PREGENERATE_LOCK_FILE", str(tmp_path / "plans.lock"))
+    sleeps = []
+
+    async def fake_sleep(seconds):
+        sleeps.append(seconds)
+        if len(sleeps) == 3:
+            raise asyncio.CancelledError
+
+    def failing_run(*args, **kwargs):
+        raise RuntimeError("database is down")
+
+    monkeypatch.setattr(generate_daily_plans.asyncio, "sleep", fake_sleep)
+    monkeypatch.setattr(generate_daily_plans, "generate_plans", failing_run)
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(generate_daily_plans.run_scheduler())
+
+    assert len(sleeps) == 3
+    assert caplog.text.count("Daily plan pre-generation failed") == 2
+    assert "database is down" in caplog.text
@@ -3,23 +3,33 @@ from datetime import datetime
 
 from app.models.attempt import Attempt
 from app.models.question import Question
+from app.models.review_item import ReviewItem
 from app.models.user_concept_stats import UserConceptStats
 from app.services.mastery_service import get_or_create_stats, update_mastery
+from app.services.spaced_repetition import get_review_item
 
 
 def _make_question(difficulty=3, expected_time=60):
     q = Question()
+    q.id = 1
     q.concept_id = 1
     q.difficulty = difficulty
     q.expected_time_seconds = expected_time
     return q
 
 
-def _make_attempt(is_correct=True, time_taken=30, was_guessed=False):
+def _make_attempt(is_correct=True, time_taken=30, was_guessed=False, db=None):
     a = Attempt()
     a.is_correct = is_correct
     a.time_taken_seconds = time_taken
     a.was_guessed = was_guessed
+    if db is not None:
+        # Persisted, so a wrong answer can be scheduled for review
+        a.user_id = 1
+        a.question_id = 1
+        a.selected_option = "b"
+        db.add(a)
+        db.flush()
     return a
 
 
@@ -69,7 +79,7 @@ def test_wrong_decreases_mastery(seeded_db):
     ).first()
     mastery_before = stats.mastery
 
-    wrong = _make_attempt(is_correct=False, time_taken=30)
+    wrong = _make_attempt(is_correct=False, time_taken=30, db=seeded_db)
     stats, change = update_mastery(seeded_db, 1, question, wrong)
     assert change < 0
     assert stats.mastery < mastery_before
@@ -86,18 +96,28 @@ def test_guessed_gives_minimal_mastery(seeded_db):
 
 
 def test_wrong_schedules_review(seeded_db):
-    """Wrong answer should schedule the attempt for review."""
+    """Wrong answer should schedule the question for review, once per question."""
     question = _make_question(expected_time=60)
-    wrong = _make_attempt(is_correct=False, time_taken=30)
-    wrong.user_id = 1
-    wrong.question_id = 1
-    wrong.selected_option = "b"
-    seeded_db.add(wrong)
+    first = _make_attempt(is_correct=False, time_taken=30, db=seeded_db)
+    update_mastery(seeded_db, 1, question, first)
+
+    item = get_review_item(seeded_db, 1, 1)
+    assert item.attempt_id == first.id
+    assert item.next_review_date > datetime.utcnow()
+    assert item.review_interval_days == 1
+
+    item.review_interval_days = 7
+    item.review_count = 2
     seeded_db.flush()
 
-    update_mastery(seeded_db, 1, question, wrong)
-    assert wrong.next_review_date is not None
-    assert wrong.review_interval_days == 1
+    again = _make_attempt(is_correct=False, time_taken=30, db=seeded_db)
+    update_mastery(seeded_db, 1, question, again)
+    seeded_db.expire_all()
+
+    assert seeded_db.query(ReviewItem).count() == 1
+    item = get_review_item(seeded_db, 1, 1)
+    assert item.attempt_id == again.id
+    assert (item.review_interval_days, item.review_count) == (1, 0)
 
 
 def test_streak_tracking(seeded_db):
@@ -117,7 +137,7 @@ def test_streak_tracking(seeded_db):
     assert stats.best_streak == 3
 
     # Wrong resets streak
-    wrong = _make_attempt(is_correct=False, time_taken=30)
+    wrong = _make_attempt(is_correct=False, time_taken=30, db=seeded_db)
     update_mastery(seeded_db, 1, question, wrong)
     assert stats.current_streak == 0
     assert stats.best_streak == 3  # Best streak preserved
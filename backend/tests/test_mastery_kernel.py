@@ -0,0 +1,90 @@
+"""Tests for the pure mastery kernel."""
+import random
+from datetime import datetime, timedelta
+
+from app.services.mastery_kernel import (
+    AttemptEvent,
+    MasteryState,
+    apply_event,
+    replay,
+    replay_streams,
+)
+
+T0 = datetime(2026, 1, 1, 9, 0)
+
+
+def _event(is_correct=True, time_taken=30, was_guessed=False, difficulty=3, minute=0):
+    return AttemptEvent(
+        is_correct=is_correct,
+        was_guessed=was_guessed,
+        time_taken=time_taken,
+        difficulty=difficulty,
+        expected_time=60,
+        at=T0 + timedelta(minutes=minute),
+    )
+
+
+def _random_stream(rng: random.Random, length: int) -> list[AttemptEvent]:
+    return [
+        _event(
+            is_correct=rng.random() < 0.65,
+            time_taken=rng.randint(5, 150),
+            was_guessed=rng.random() < 0.1,
+            difficulty=rng.randint(1, 5),
+            minute=i,
+        )
+        for i in range(length)
+    ]
+
+
+def test_apply_event_rules():
+    """Fast/slow/guess/wrong deltas, streaks and the time EMA."""
+    fast = apply_event(MasteryState(), _event(time_taken=30, difficulty=4))
+    assert fast.mastery == 0.08
+    assert fast.current_streak == 1
+    assert fast.difficulty_comfort == 4
+    assert fast.last_correct == T0
+    assert fast.avg_time_seconds == 30
+
+    slow = apply_event(fast, _event(time_taken=90, minute=1))
+    assert slow.mastery == 0.08 + 0.04 * (1 - 0.08)
+    assert slow.current_streak == slow.best_streak == 2
+    assert slow.avg_time_seconds == 30 * 0.8 + 90 * 0.2
+
+    guess = apply_event(slow, _event(was_guessed=True, minute=2))
+    assert guess.mastery == slow.mastery + 0.01
+    assert guess.current_streak == 0
+    assert guess.last_correct == slow.last_correct
+
+    wrong = apply_event(guess, _event(is_correct=False, minute=3))
+    assert wrong.mastery == guess.mastery - 0.06 * guess.mastery
+    assert wrong.total_attempts == 4
+    assert wrong.correct_attempts == 3
+    assert wrong.accuracy == 0.75
+    assert wrong.best_streak == 2
+    assert wrong.last_seen == T0 + timedelta(minutes=3)
+
+
+def test_apply_event_does_not_mutate_input():
+    start = MasteryState(mastery=0.5)
+    apply_event(start, _event())
+    assert start == MasteryState(mastery=0.5)
+
+
+def test_replay_streams_matches_scalar_kernel():
+    """The vectorized replay is bit-identical to folding apply_event."""
+    rng = random.Random(3)
+    streams = {(u, c): _random_stream(rng, rng.randint(0, 40)) for u in range(5) for c in range(6)}
+    starts = {(0, 0): MasteryState(mastery=0.4, total_attempts=10, correct_attempts=6, accuracy=0.6)}
+
+    vectorized = replay_streams(starts, streams)
+
+    assert vectorized.keys() == streams.keys()
+    for key, events in streams.items():
+        assert vectorized[key] == replay(starts.get(key, MasteryState()), events)
+
+
+def test_replay_streams_keeps_start_for_empty_stream():
+    start = MasteryState(mastery=0.3, last_seen=T0)
+    assert replay_streams({"k": start}, {"k": []}) == {"k": start}
+    assert replay_streams({}, {}) == {}
@@ -0,0 +1,92 @@
+"""Tests for engine tuning and connection pool metrics."""
+import pytest
+from sqlalchemy import create_engine, exc
+
+from app.config import settings
+from app.database import engine_options, tune_engine
+from app.models.user import User
+from app.utils.pool_metrics import PoolMetrics, TimedQueuePool, pool_status
+from app.utils.security import create_access_token
+
+
+def test_pool_metrics_histogram():
+    metrics = PoolMetrics()
+    for wait in (0.0002, 0.003, 0.003, 2.0, 9.0):
+        metrics.record(wait)
+    metrics.record_timeout()
+
+    snapshot = metrics.snapshot()
+    assert snapshot["checkouts"] == 5
+    assert snapshot["timeouts"] == 1
+    assert snapshot["wait_max_ms"] == 9000
+    assert snapshot["wait_histogram"]["<=1ms"] == 1
+    assert snapshot["wait_histogram"]["<=5ms"] == 2
+    assert snapshot["wait_histogram"]["<=5000ms"] == 1
+    assert snapshot["wait_histogram"][">5000ms"] == 1
+
+
+def test_timed_pool_counts_checkouts_and_timeouts(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path}/pool.db",
+        poolclass=TimedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+    with engine.connect():
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+        status = pool_status(engine)
+        assert status["checked_out"] == 1
+    with engine.connect():
+        pass
+
+    status = pool_status(engine)
+    assert status["checkouts"] == 2
+    assert status["timeouts"] == 1
+    assert status["checked_out"] == 0
+
+    # Metrics survive dispose() recreating the pool
+    engine.dispose()
+    assert pool_status(engine)["checkouts"] == 2
+
+
+def test_sqlite_pragmas_applied_on_connect(tmp_path):
+    engine = tune_engine(
+        create_engine(f"sqlite:///{tmp_path}/tuned.db", **engine_options("sqlite:///x.db"))
+    )
+    with engine.connect() as conn:
+        assert conn.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+        assert conn.exec_driver_sql("PRAGMA busy_timeout").scalar() == settings.SQLITE_BUSY_TIMEOUT_MS
+        assert conn.exec_driver_sql("PRAGMA cache_size").scalar() == -settings.SQLITE_CACHE_SIZE_KB
+
+
+def test_engine_options_per_backend(monkeypatch):
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", 12)
+    monkeypatch.setattr(settings, "DB_STATEMENT_TIMEOUT_MS", 5000)
+    monkeypatch.setattr(settings, "DB_IDLE_IN_TRANSACTION_TIMEOUT_MS", 0)
+
+    pg = engine_options("postgresql://u@h/db")
+    assert pg["pool_size"] == 12
+    assert pg["pool_pre_ping"] is True
+    assert pg["connect_args"] == {"options": "-c statement_timeout=5000"}
+
+    pg_async = engine_options("postgresql+asyncpg://u@h/db", is_async=True)
+    assert pg_async["connect_args"] == {"server_settings": {"statement_timeout": "5000"}}
+
+    assert "poolclass" not in engine_options("sqlite:///:memory:")
+    assert "pool_recycle" not in engine_options("sqlite:///./app.db")
+
+
+def test_pool_endpoint_is_admin_only(client, seeded_db):
+    seeded_db.add(User(id=9, email="admin@test.com", hashed_password="x", full_name="A", is_admin=True))
+    seeded_db.commit()
+    url = f"{settings.API_V1_PREFIX}/admin/stats/pool"
+
+    student = {"Authorization": f"Bearer {create_access_token({'sub': '1'})}"}
+    assert client.get(url, headers=student).status_code == 403
+
+    admin = {"Authorization": f"Bearer {create_access_token({'sub': '9'})}"}
+    body = client.get(url, headers=admin).json()
+    assert body["pool_size"] == settings.DB_POOL_SIZE
+    assert "checkouts" in body["sync"]
@@ -0,0 +1,272 @@
+"""
+EXPLAIN regression tests for the hot query shapes.
+
+Runs the real services and endpoints against a larger seeded dataset, captures
+every SELECT they issue, and asks SQLite for its query plan. A hot table that
+shows up as a full SCAN means an index from migrations/versions is missing or
+no longer matches the query.
+"""
+import random
+import re
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import event, insert, select
+from sqlalchemy.orm import sessionmaker
+
+from app.config import settings
+from app.models import (
+    Attempt,
+    Concept,
+    DailyPlan,
+    DailyPlanItem,
+    Question,
+    ReviewItem,
+    Streak,
+    StudySession,
+    Topic,
+    User,
+    UserConceptStats,
+)
+from app.services.adaptive_engine import get_next_question
+from app.services.catalog import get_catalog
+from app.services.plan_service import _get_weakest_concepts
+from app.services.review_count_cache import get_due_count
+from app.services.seen_index import get_seen
+from app.services.spaced_repetition import (
+    get_due_reviews,
+    get_review_count,
+    get_review_page,
+)
+from app.services.stats_service import get_dashboard_data, get_heatmap, get_trends
+from app.utils.security import create_access_token
+
+HOT_TABLES = {
+    "attempts",
+    "questions",
+    "user_concept_stats",
+    "daily_plans",
+    "daily_plan_items",
+    "study_sessions",
+    "user_daily_activity",
+    "user_rollups",
+    "review_items",
+}
+N_USERS = 40
+ATTEMPTS_PER_USER = 250
+USER_ID = 7
+
+_SCAN = re.compile(r"^SCAN (?:TABLE )?(\w+)")
+
+
+@pytest.fixture
+def large_db(test_engine):
+    """A few thousand rows per hot table, with statistics gathered."""
+    rng = random.Random(7)
+    now = datetime.utcnow()
+
+    with test_engine.begin() as conn:
+        conn.execute(
+            insert(Topic),
+            [{"id": t, "name": f"Topic {t}", "slug": f"topic-{t}"} for t in (1, 2, 3)],
+        )
+        conn.execute(
+            insert(Concept),
+            [
+                {"id": c, "topic_id": (c - 1) // 5 + 1, "name": f"C{c}", "slug": f"c-{c}"}
+                for c in range(1, 16)
+            ],
+        )
+        conn.execute(
+            insert(Question),
+            [
+                {
+                    "concept_id": c,
+                    "text": f"Q{c}-{i}",
+                    "difficulty": i % 5 + 1,
+                    "option_a": "A",
+                    "option_b": "B",
+                    "option_c": "C",
+                    "option_d": "D",
+                    "correct_option": "a",
+                    "explanation": "A",
+                    "is_active": True,
+                }
+                for c in range(1, 16)
+                for i in range(20)
+            ],
+        )
+        conn.execute(
+            insert(User),
+            [
+                {"id": u, "email": f"u{u}@test.com", "hashed_password": "x", "full_name": f"U{u}"}
+                for u in range(1, N_USERS + 1)
+            ],
+        )
+        conn.execute(insert(Streak), [{"user_id": u} for u in range(1, N_USERS + 1)])
+        conn.execute(
+            insert(UserConceptStats),
+            [
+                {
+                    "user_id": u,
+                    "concept_id": c,
+                    "mastery": rng.random(),
+                    "total_attempts": 10,
+                    "accuracy": rng.random(),
+                    "last_seen": now - timedelta(days=rng.randint(0, 20)),
+                }
+                for u in range(1, N_USERS + 1)
+                for c in range(1, 16)
+            ],
+        )
+        conn.execute(
+            insert(StudySession),
+            [
+                {
+                    "user_id": u,
+                    "session_type": "practice",
+                    "total_time_seconds": 600,
+                    "started_at": now - timedelta(days=d),
+                }
+                for u in range(1, N_USERS + 1)
+                for d in range(20)
+            ],
+        )
+        conn.execute(
+            insert(Attempt),
+            [
+                {
+                    "user_id": u,
+                    "question_id": rng.randint(1, 300),
+                    "selected_option": "b",
+                    "is_correct": (correct := rng.random() < 0.7),
+                    "time_taken_seconds": rng.randint(10, 120),
+                    "created_at": now - timedelta(minutes=rng.randint(0, 60 * 24 * 60)),
+                }
+                for u in range(1, N_USERS + 1)
+                for _ in range(ATTEMPTS_PER_USER)
+            ],
+        )
+        latest_wrong = {
+            (user_id, question_id): attempt_id
+            for attempt_id, user_id, question_id in conn.execute(
+                select(Attempt.id, Attempt.user_id, Attempt.question_id)
+                .where(Attempt.is_correct == False)
+                .order_by(Attempt.id)
+            )
+        }
+        conn.execute(
+            insert(ReviewItem),
+            [
+                {
+                    "user_id": user_id,
+                    "question_id": question_id,
+                    "attempt_id": attempt_id,
+                    "next_review_date": now + timedelta(days=rng.randint(-5, 5)),
+                }
+                for (user_id, question_id), attempt_id in latest_wrong.items()
+            ],
+        )
+        conn.execute(
+            insert(DailyPlan),
+            [
+                {
+                    "id": (u - 1) * 30 + d + 1,
+                    "user_id": u,
+                    "date": date.today() - timedelta(days=d),
+                    "total_minutes": 45,
+                }
+                for u in range(1, N_USERS + 1)
+                for d in range(30)
+            ],
+        )
+        conn.execute(
+            insert(DailyPlanItem),
+            [
+                {"plan_id": p, "item_type": "practice", "concept_id": 1, "duration_minutes": 15}
+                for p in range(1, N_USERS * 30 + 1)
+                for _ in range(3)
+            ],
+        )
+        conn.exec_driver_sql("ANALYZE")
+
+    db = sessionmaker(bind=test_engine)()
+    get_catalog(db)  # Catalog load is a deliberate full read; keep it out of the log
+    yield db
+    db.close()
+
+
+@pytest.fixture
+def captured_selects(test_engine):
+    """SELECT statements (with bound parameters) issued while the test runs."""
+    captured = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            captured.append((statement, parameters))
+
+    event.listen(test_engine, "before_cursor_execute", _record)
+    yield captured
+    event.remove(test_engine, "before_cursor_execute", _record)
+
+
+def _full_scans(test_engine, captured) -> list[str]:
+    """Return 'plan detail: statement' for every hot-table SCAN in the plans."""
+    problems = []
+    raw = test_engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        for statement, parameters in captured:
+            cursor.execute(f"EXPLAIN QUERY PLAN {statement}", parameters)
+            for row in cursor.fetchall():
+                match = _SCAN.match(row[-1])
+                if match and match.group(1) in HOT_TABLES:
+                    problems.append(f"{row[-1]}: {statement}")
+    finally:
+        raw.close()
+    return problems
+
+
+def test_service_queries_use_indexes(test_engine, large_db, captured_selects):
+    """Due reviews, trends, stats, plans and adaptive selection hit indexes."""
+    get_due_reviews(large_db, USER_ID)
+    get_review_count(large_db, USER_ID)
+    get_due_count(large_db, USER_ID)
+    _, cursor = get_review_page(large_db, USER_ID, limit=5)
+    get_review_page(large_db, USER_ID, cursor, limit=5)
+    get_trends(large_db, USER_ID, days=7)
+    get_heatmap(large_db, USER_ID)
+    get_dashboard_data(large_db, USER_ID)
+    _get_weakest_concepts(large_db, USER_ID)
+    get_seen(large_db, USER_ID)
+    get_next_question(large_db, USER_ID)
+
+    assert captured_selects
+    assert _full_scans(test_engine, captured_selects) == []
+
+
+def test_endpoint_queries_use_indexes(test_engine, large_db, client, captured_selects):
+    """History, recent attempts and today's plan hit indexes."""
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': str(USER_ID)})}"}
+    prefix = settings.API_V1_PREFIX
+
+    assert client.get(f"{prefix}/attempts/history", headers=headers).status_code == 200
+    assert client.get(f"{prefix}/attempts/recent", headers=headers).status_code == 200
+    assert client.get(f"{prefix}/plan/today", headers=headers).status_code == 200
+
+    assert captured_selects
+    assert _full_scans(test_engine, captured_selects) == []
+
+
+def test_scan_detection_catches_missing_index(test_engine, large_db, client, captured_selects):
+    """Sanity check: dropping an index must make the check fail."""
+    with test_engine.begin() as conn:
+        conn.exec_driver_sql("DROP INDEX ix_daily_plans_user_date")
+
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': str(USER_ID)})}"}
+    client.get(f"{settings.API_V1_PREFIX}/plan/today", headers=headers)
+
+    assert any(
+        p.startswith("SCAN daily_plans") or p.startswith("SCAN TABLE daily_plans")
+        for p in _full_scans(test_engine, captured_selects)
+    )
@@ -0,0 +1,58 @@
+"""Tests for the random question sampler."""
+from collections import Counter
+
+import pytest
+from pydantic import ValidationError
+
+from app.config import QUESTION_SAMPLERS, Settings
+from app.models.question import Question
+from app.services.question_sampler import sample_questions
+
+STRATEGIES = list(QUESTION_SAMPLERS)
+
+
+@pytest.mark.parametrize("strategy", STRATEGIES)
+def test_sampler_respects_filters(seeded_db, strategy):
+    """Topic, concept and difficulty filters should all apply."""
+    verbal = sample_questions(seeded_db, 50, topic_id=1, strategy=strategy)
+    assert len(verbal) == 6
+    assert {q.concept_id for q in verbal} == {1, 2}
+
+    algebra = sample_questions(seeded_db, 50, concept_id=3, strategy=strategy)
+    assert {q.concept_id for q in algebra} == {3}
+
+    easy = sample_questions(seeded_db, 50, difficulty=1, strategy=strategy)
+    assert {q.difficulty for q in easy} == {1}
+
+
+@pytest.mark.parametrize("strategy", STRATEGIES)
+def test_sampler_draws_distinct_active_questions(seeded_db, strategy):
+    """Samples should be distinct and skip deactivated questions."""
+    inactive = seeded_db.query(Question).first()
+    inactive.is_active = False
+    seeded_db.commit()
+
+    questions = sample_questions(seeded_db, 50, strategy=strategy)
+    ids = [q.id for q in questions]
+    assert len(ids) == 8
+    assert len(set(ids)) == 8
+    assert inactive.id not in ids
+
+
+def test_catalog_sampler_is_uniform(seeded_db):
+    """Every matching question should be drawn about equally often."""
+    counts = Counter(
+        q.id for _ in range(900) for q in sample_questions(seeded_db, 1, strategy="catalog")
+    )
+    assert len(counts) == 9
+    assert min(counts.values()) > 60  # Expected ~100 each
+
+
+def test_unknown_sampler_rejected(seeded_db):
+    with pytest.raises(ValueError):
+        sample_questions(seeded_db, 5, strategy="nope")
+
+
+def test_unknown_sampler_setting_fails_at_startup():
+    with pytest.raises(ValidationError):
+        Settings(QUESTION_SAMPLER="nope")
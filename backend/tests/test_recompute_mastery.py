@@ -0,0 +1,64 @@
+"""Tests for the offline mastery recomputation job."""
+import pytest
+
+from app.models.user_concept_stats import UserConceptStats
+from app.services.session_service import start_session, submit_session
+from jobs.recompute_mastery import (
+    _load_checkpoint,
+    _save_checkpoint,
+    load_questions,
+    recompute_range,
+    user_ranges,
+)
+from tests.conftest import STATS_FIELDS, concept_stats, make_answers
+
+
+@pytest.fixture
+def answered_db(seeded_db):
+    session, _ = start_session(seeded_db, 1, "practice", 40)
+    submit_session(seeded_db, 1, session.id, make_answers(seeded_db, 40))
+    return seeded_db
+
+
+def test_replay_reproduces_live_concept_stats(answered_db):
+    """Replaying the log lands on exactly what the live path stored."""
+    live = concept_stats(answered_db, 1)
+
+    report = recompute_range(answered_db, 1, 2, load_questions(answered_db), dry_run=True)
+    assert report["attempts"] == 40
+    assert report["rows"] == len(live)
+    assert report["changed"] == report["new"] == 0
+
+    recompute_range(answered_db, 1, 2, load_questions(answered_db))
+    assert concept_stats(answered_db, 1) == live
+
+
+def test_dry_run_reports_drift_without_writing(answered_db):
+    live = concept_stats(answered_db, 1)
+    row = answered_db.query(UserConceptStats).filter(UserConceptStats.concept_id == 1).one()
+    row.mastery = 0.99
+    answered_db.commit()
+
+    report = recompute_range(answered_db, 1, 2, load_questions(answered_db), dry_run=True, top=5)
+    assert report["changed"] == 1
+    assert report["largest"][0]["concept_id"] == 1
+    assert report["largest"][0]["old"] == 0.99
+    assert concept_stats(answered_db, 1)[1][STATS_FIELDS.index("mastery")] == 0.99
+
+    recompute_range(answered_db, 1, 2, load_questions(answered_db))
+    assert concept_stats(answered_db, 1) == live
+
+
+def test_user_ranges_cover_all_users(answered_db):
+    assert user_ranges(answered_db, 1000) == [(0, 1000)]
+    assert user_ranges(answered_db, 1) == [(1, 2)]
+
+
+def test_checkpoint_round_trip(tmp_path):
+    path = str(tmp_path / "recompute.json")
+    assert _load_checkpoint(path, 100) == set()
+
+    _save_checkpoint(path, 100, {1, 101})
+    assert _load_checkpoint(path, 100) == {1, 101}
+    with pytest.raises(SystemExit):
+        _load_checkpoint(path, 50)
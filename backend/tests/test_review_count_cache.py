@@ -0,0 +1,135 @@
+"""Tests for the cached due-review count."""
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.config import settings
+from app.database import Base
+from app.models.attempt import Attempt
+from app.models.review_item import ReviewItem
+from app.services import review_count_cache
+from app.services.review_count_cache import get_due_count
+from app.services.spaced_repetition import process_review, schedule_reviews
+from app.utils.security import create_access_token
+
+PREFIX = settings.API_V1_PREFIX
+HEADERS = {"Authorization": f"Bearer {create_access_token({'sub': '1'})}"}
+
+
+def _review_queries(statements) -> int:
+    return sum(1 for s in statements if "FROM review_items" in s)
+
+
+def _add_attempt(db, question_id):
+    attempt = Attempt(
+        user_id=1,
+        question_id=question_id,
+        selected_option="b",
+        is_correct=False,
+        time_taken_seconds=60,
+    )
+    db.add(attempt)
+    db.flush()
+    return attempt
+
+
+def _add_item(db, question_id, due_in):
+    item = ReviewItem(
+        user_id=1,
+        question_id=question_id,
+        attempt_id=_add_attempt(db, question_id).id,
+        next_review_date=datetime.utcnow() + due_in,
+    )
+    db.add(item)
+    db.commit()
+    return item
+
+
+def test_polls_are_served_from_cache(client, seeded_db, query_log):
+    _add_item(seeded_db, 1, timedelta(days=-1))
+    _add_item(seeded_db, 2, timedelta(days=2))
+
+    for _ in range(3):
+        response = client.get(f"{PREFIX}/review/queue/count", headers=HEADERS)
+        assert response.json() == {"count": 1}
+    assert _review_queries(query_log) == 1
+
+
+def test_entry_expires_when_next_item_falls_due(seeded_db, monkeypatch):
+    _add_item(seeded_db, 1, timedelta(hours=1))
+    assert get_due_count(seeded_db, 1) == 0
+
+    class _TwoHoursLater(datetime):
+        @classmethod
+        def utcnow(cls):
+            return datetime.utcnow() + timedelta(hours=2)
+
+    monkeypatch.setattr(review_count_cache, "datetime", _TwoHoursLater)
+    assert get_due_count(seeded_db, 1) == 1
+
+
+def test_writes_invalidate(seeded_db):
+    item = _add_item(seeded_db, 1, timedelta(days=-1))
+    assert get_due_count(seeded_db, 1) == 1
+
+    process_review(seeded_db, item, got_correct=True, time_taken=10, expected_time=60)
+    seeded_db.commit()
+    assert get_due_count(seeded_db, 1) == 0
+
+    # Scheduled as if answered wrong two days ago, so it is due already
+    attempt = _add_attempt(seeded_db, 2)
+    schedule_reviews(seeded_db, 1, {2: attempt.id}, datetime.utcnow() - timedelta(days=2))
+    seeded_db.commit()
+    assert get_due_count(seeded_db, 1) == 1
+
+
+def test_poll_before_commit_does_not_stick(tmp_path):
+    """A poll on another connection between flush and commit sees the old rows."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'reviews.db'}")
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+    writer, poller = Session(), Session()
+    try:
+        item = _add_item(writer, 1, timedelta(days=-1))
+        assert get_due_count(poller, 1) == 1
+        poller.rollback()
+
+        process_review(writer, item, got_correct=True, time_taken=10, expected_time=60)
+        writer.flush()
+        assert get_due_count(poller, 1) == 1
+        poller.rollback()
+
+        writer.commit()
+        assert get_due_count(poller, 1) == 0
+    finally:
+        writer.close()
+        poller.close()
+        engine.dispose()
+
+
+def test_load_overlapping_invalidation_is_not_cached(seeded_db, query_log, monkeypatch):
+    """A count read before a commit whose invalidation ran meanwhile is not kept."""
+    _add_item(seeded_db, 1, timedelta(days=-1))
+    load = review_count_cache._load
+
+    def commit_lands_during_load(db, user_id, now):
+        loaded = load(db, user_id, now)
+        review_count_cache.invalidate_due_count(user_id)
+        return loaded
+
+    monkeypatch.setattr(review_count_cache, "_load", commit_lands_during_load)
+    assert get_due_count(seeded_db, 1) == 1
+    monkeypatch.setattr(review_count_cache, "_load", load)
+
+    get_due_count(seeded_db, 1)
+    get_due_count(seeded_db, 1)
+    assert _review_queries(query_log) == 2
+    assert review_count_cache._loading == {}
+
+
+def test_cache_disabled_counts_every_time(seeded_db, query_log, monkeypatch):
+    monkeypatch.setattr(settings, "REVIEW_COUNT_TTL_SECONDS", 0)
+    get_due_count(seeded_db, 1)
+    get_due_count(seeded_db, 1)
+    assert _review_queries(query_log) == 2
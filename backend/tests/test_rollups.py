@@ -0,0 +1,82 @@
+"""Tests for the per-user lifetime attempt counters."""
+from app.models.attempt import Attempt
+from app.models.user_rollup import UserRollup
+from app.services.rollup_service import ensure_rollup, rebuild_rollups, record_attempts
+from app.services.session_service import start_session, submit_session
+
+
+def _counters(db, user_id=1):
+    db.expire_all()
+    rollup = db.query(UserRollup).filter(UserRollup.user_id == user_id).first()
+    if not rollup:
+        return None
+    return rollup.total_attempts, rollup.correct_attempts, rollup.total_time_seconds
+
+
+def test_attempt_endpoint_updates_rollup(seeded_db, client):
+    """Each answered question bumps the counters in the same transaction."""
+    headers = {
+        "Authorization": "Bearer "
+        + client.post(
+            "/api/v1/auth/login",
+            json={"email": "test@test.com", "password": "test123"},
+        ).json()["access_token"]
+    }
+    for option, seconds in [("a", 40), ("b", 20)]:
+        resp = client.post(
+            "/api/v1/attempts/",
+            json={"question_id": 1, "selected_option": option, "time_taken_seconds": seconds},
+            headers=headers,
+        )
+        assert resp.status_code == 200
+
+    assert _counters(seeded_db) == (2, 1, 60)
+
+
+def test_session_submit_updates_rollup_once(seeded_db):
+    """A submitted session adds all of its recorded answers."""
+    session, questions = start_session(seeded_db, 1, "practice", 3)
+    answers = [
+        {"question_id": q.id, "selected_option": "a", "time_taken_seconds": 30}
+        for q in questions
+    ] + [{"question_id": 9999, "selected_option": "a", "time_taken_seconds": 30}]
+
+    submit_session(seeded_db, 1, session.id, answers)
+
+    assert _counters(seeded_db) == (3, 3, 90)
+
+
+def test_rebuild_matches_incremental_counters(seeded_db):
+    """Rebuilding from attempts reproduces what the write path maintained."""
+    for i in range(5):
+        seeded_db.add(
+            Attempt(
+                user_id=1,
+                question_id=i + 1,
+                selected_option="a",
+                is_correct=i % 2 == 0,
+                time_taken_seconds=10 * (i + 1),
+            )
+        )
+        record_attempts(seeded_db, 1, 1, int(i % 2 == 0), 10 * (i + 1))
+    seeded_db.commit()
+    incremental = _counters(seeded_db)
+
+    seeded_db.query(UserRollup).update({UserRollup.total_attempts: 0})
+    assert rebuild_rollups(seeded_db, [1]) == 1
+    seeded_db.commit()
+
+    assert incremental == (5, 3, 150)
+    assert _counters(seeded_db) == incremental
+
+
+def test_ensure_rollup_keeps_existing_counters(seeded_db):
+    """ensure_rollup only creates missing rows."""
+    ensure_rollup(seeded_db, 1)
+    seeded_db.commit()
+    assert _counters(seeded_db) == (0, 0, 0)
+
+    record_attempts(seeded_db, 1, 2, 1, 50)
+    ensure_rollup(seeded_db, 1)
+    seeded_db.commit()
+    assert _counters(seeded_db) == (2, 1, 50)
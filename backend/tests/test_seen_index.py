@@ -0,0 +1,101 @@
+"""Tests for the per-user seen-question index."""
+from app.models.attempt import Attempt
+from app.models.question import Question
+from app.services.adaptive_engine import _find_question
+from app.services.seen_index import get_seen, invalidate_user, is_seen, mark_seen
+from app.utils.after_commit import after_commit
+
+
+def _answer(db, question_id, user_id=1):
+    """Helper to record a plain attempt row."""
+    db.add(
+        Attempt(
+            user_id=user_id,
+            question_id=question_id,
+            selected_option="a",
+            is_correct=True,
+            time_taken_seconds=30,
+        )
+    )
+    db.commit()
+
+
+def _concept_question_ids(db, concept_id):
+    return [
+        q.id
+        for q in db.query(Question)
+        .filter(Question.concept_id == concept_id)
+        .order_by(Question.difficulty)
+        .all()
+    ]
+
+
+def test_index_loads_answered_questions_by_concept(seeded_db):
+    """First use should build the index from existing attempts."""
+    ids = _concept_question_ids(seeded_db, 2)
+    _answer(seeded_db, ids[2])
+    _answer(seeded_db, ids[0])
+    _answer(seeded_db, ids[0])
+
+    seen = get_seen(seeded_db, 1)
+    assert list(seen[2]) == sorted([ids[0], ids[2]])
+    assert 1 not in seen
+
+
+def test_mark_seen_keeps_ids_sorted_and_unique(seeded_db):
+    """Incremental updates should keep each concept's array sorted."""
+    get_seen(seeded_db, 1)
+    mark_seen(1, 1, 7)
+    mark_seen(1, 1, 3)
+    mark_seen(1, 1, 7)
+
+    seen = get_seen(seeded_db, 1)[1]
+    assert list(seen) == [3, 7]
+    assert is_seen(seen, 3)
+    assert not is_seen(seen, 5)
+
+
+def test_find_question_skips_seen_questions(seeded_db):
+    """Unanswered questions should be served first, easiest first."""
+    ids = _concept_question_ids(seeded_db, 1)
+
+    assert _find_question(seeded_db, 1, 1).id == ids[0]
+    get_seen(seeded_db, 1)
+    mark_seen(1, 1, ids[0])
+    assert _find_question(seeded_db, 1, 1).id == ids[1]
+
+
+def test_find_question_falls_back_when_all_seen(seeded_db):
+    """With everything answered, a question should still be returned."""
+    for qid in _concept_question_ids(seeded_db, 3):
+        _answer(seeded_db, qid)
+    invalidate_user(1)
+
+    question = _find_question(seeded_db, 1, 3)
+    assert question is not None
+    assert question.concept_id == 3
+
+
+def test_attempts_mark_seen_only_once_committed(seeded_db):
+    """A rolled-back attempt must not leave its question in the index."""
+    ids = _concept_question_ids(seeded_db, 1)
+    get_seen(seeded_db, 1)
+
+    seeded_db.add(
+        Attempt(
+            user_id=1,
+            question_id=ids[0],
+            selected_option="a",
+            is_correct=True,
+            time_taken_seconds=30,
+        )
+    )
+    after_commit(seeded_db, mark_seen, 1, 1, ids[0])
+    seeded_db.flush()
+    assert 1 not in get_seen(seeded_db, 1)
+    seeded_db.rollback()
+    assert 1 not in get_seen(seeded_db, 1)
+
+    after_commit(seeded_db, mark_seen, 1, 1, ids[1])
+    _answer(seeded_db, ids[1])
+    assert list(get_seen(seeded_db, 1)[1]) == [ids[1]]
@@ -0,0 +1,103 @@
+"""Tests for session submission."""
+import pytest
+
+from app.models.attempt import Attempt
+from app.models.question import Question
+from app.models.review_item import ReviewItem
+from app.models.streak import Streak
+from app.models.user import User
+from app.services.catalog import get_catalog
+from app.services.mastery_service import update_mastery
+from app.services.session_service import start_session, submit_session
+from tests.conftest import concept_stats, make_answers
+
+
+def _second_user(db):
+    db.add(User(id=2, email="two@test.com", hashed_password="x", full_name="Two"))
+    db.add(Streak(user_id=2))
+    db.commit()
+
+
+def test_bulk_submit_matches_sequential_updates(seeded_db):
+    """Bulk submission ends in the same stats as answering one by one."""
+    _second_user(seeded_db)
+    answers = make_answers(seeded_db, 50)
+
+    # User 1: the per-answer path (attempt + update_mastery each time)
+    for answer in answers:
+        question = seeded_db.get(Question, answer["question_id"])
+        attempt = Attempt(
+            user_id=1,
+            question_id=question.id,
+            selected_option=answer["selected_option"],
+            is_correct=answer["selected_option"] == question.correct_option,
+            time_taken_seconds=answer["time_taken_seconds"],
+            was_guessed=False,
+        )
+        seeded_db.add(attempt)
+        seeded_db.flush()
+        update_mastery(seeded_db, 1, question, attempt)
+    seeded_db.commit()
+
+    # User 2: one bulk session submission
+    session, _ = start_session(seeded_db, 2, "exam", 50)
+    result = submit_session(seeded_db, 2, session.id, answers)
+
+    sequential, bulk = concept_stats(seeded_db, 1), concept_stats(seeded_db, 2)
+    assert sequential.keys() == bulk.keys()
+    for concept_id, values in sequential.items():
+        assert bulk[concept_id] == pytest.approx(values)
+
+    def reviews(user_id):
+        return seeded_db.query(ReviewItem).filter(ReviewItem.user_id == user_id).count()
+
+    # One review item per question answered wrong, however often
+    wrong_questions = {
+        answer["question_id"]
+        for answer in answers
+        if answer["selected_option"]
+        != seeded_db.get(Question, answer["question_id"]).correct_option
+    }
+    assert result["correct_count"] < 50
+    assert reviews(2) == reviews(1) == len(wrong_questions)
+    assert seeded_db.query(Attempt).filter(Attempt.session_id == session.id).count() == 50
+
+
+def test_bulk_submit_query_count_is_fixed(seeded_db, query_log):
+    """Submitting 10 or 50 answers costs the same number of statements."""
+    get_catalog(seeded_db)
+    counts = []
+    for n in (10, 50):
+        session, _ = start_session(seeded_db, 1, "exam", n)
+        answers = make_answers(seeded_db, n, seed=n)
+        query_log.clear()
+        submit_session(seeded_db, 1, session.id, answers)
+        counts.append(len(query_log))
+
+    assert counts[0] == counts[1]
+    assert counts[1] <= 13
+
+
+def test_submit_skips_unknown_questions(seeded_db):
+    session, _ = start_session(seeded_db, 1, "practice", 2)
+    result = submit_session(
+        seeded_db,
+        1,
+        session.id,
+        [
+            {"question_id": 1, "selected_option": "a", "time_taken_seconds": 30},
+            {"question_id": 999, "selected_option": "a", "time_taken_seconds": 30},
+        ],
+    )
+
+    assert result["correct_count"] == 1
+    assert result["total_questions"] == 2
+    assert seeded_db.query(Attempt).count() == 1
+
+
+def test_submit_rejects_other_users_session(seeded_db):
+    _second_user(seeded_db)
+    session, _ = start_session(seeded_db, 2, "practice", 2)
+
+    with pytest.raises(ValueError):
+        submit_session(seeded_db, 1, session.id, [])
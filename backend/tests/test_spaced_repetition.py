@@ -1,36 +1,22 @@
 """Tests for the spaced repetition service."""
-from datetime import datetime, timedelta
+from datetime import datetime
 
-from app.models.attempt import Attempt
+from app.models.user import User
 from app.services.spaced_repetition import (
     INTERVALS,
     get_due_reviews,
     get_review_count,
+    get_review_page,
     process_review,
 )
-
-
-def _make_review_attempt(db, user_id=1, days_overdue=0, interval=1):
-    """Create a wrong attempt scheduled for review."""
-    attempt = Attempt(
-        user_id=user_id,
-        question_id=1,
-        selected_option="b",
-        is_correct=False,
-        time_taken_seconds=60,
-        next_review_date=datetime.utcnow() - timedelta(days=days_overdue),
-        review_interval_days=interval,
-        review_count=0,
-    )
-    db.add(attempt)
-    db.commit()
-    return attempt
+from app.utils.security import create_access_token
+from tests.conftest import make_review_item
 
 
 def test_get_due_reviews(seeded_db):
     """Should return attempts due for review."""
-    _make_review_attempt(seeded_db, days_overdue=1)  # Due
-    _make_review_attempt(seeded_db, days_overdue=-1)  # Not due yet
+    make_review_item(seeded_db, days_overdue=1)  # Due
+    make_review_item(seeded_db, days_overdue=-1)  # Not due yet
 
     due = get_due_reviews(seeded_db, 1)
     assert len(due) == 1
@@ -38,84 +24,173 @@ def test_get_due_reviews(seeded_db):
 
 def test_review_count(seeded_db):
     """Should count items due for review."""
-    _make_review_attempt(seeded_db, days_overdue=1)
-    _make_review_attempt(seeded_db, days_overdue=2)
+    make_review_item(seeded_db, days_overdue=1)
+    make_review_item(seeded_db, days_overdue=2)
 
     assert get_review_count(seeded_db, 1) == 2
 
 
+def test_review_pages_follow_cursor(seeded_db):
+    """Pages are oldest first, disjoint, and end with next_cursor None."""
+    for days in (5, 4, 3, 3, 2):
+        make_review_item(seeded_db, days_overdue=days)
+    make_review_item(seeded_db, days_overdue=-1)
+
+    first, cursor = get_review_page(seeded_db, 1, limit=2)
+    second, cursor2 = get_review_page(seeded_db, 1, cursor, limit=2)
+    third, cursor3 = get_review_page(seeded_db, 1, cursor2, limit=2)
+
+    rows = first + second + third
+    assert [len(first), len(second), len(third)] == [2, 2, 1]
+    assert cursor3 is None
+    assert len({row.id for row in rows}) == 5
+    assert [row.next_review_date for row in rows] == sorted(r.next_review_date for r in rows)
+    assert first[0].text and first[0].correct_option
+
+
+def test_review_queue_route_pages(client, seeded_db):
+    items = [make_review_item(seeded_db, days_overdue=days) for days in (3, 2, 1)]
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': '1'})}"}
+
+    page = client.get("/api/v1/review/queue?limit=2", headers=headers).json()
+    assert page["count"] == 2
+    assert [r["attempt_id"] for r in page["reviews"]] == [i.attempt_id for i in items[:2]]
+    assert page["reviews"][0]["concept_name"]
+
+    rest = client.get(
+        "/api/v1/review/queue", params={"cursor": page["next_cursor"]}, headers=headers
+    ).json()
+    assert rest["count"] == 1
+    assert rest["next_cursor"] is None
+
+    bad = client.get("/api/v1/review/queue?cursor=nope", headers=headers)
+    assert bad.status_code == 400
+
+
+def test_reviewed_route_updates_item(client, seeded_db):
+    item = make_review_item(seeded_db, days_overdue=1)
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': '1'})}"}
+
+    resp = client.post(
+        f"/api/v1/review/{item.attempt_id}/reviewed",
+        json={"got_correct": True, "time_taken": 10},
+        headers=headers,
+    )
+    assert resp.status_code == 200
+    assert resp.json()["review_interval_days"] == 3
+    assert client.get("/api/v1/review/queue/count", headers=headers).json()["count"] == 0
+
+
+def test_batch_review_route(client, seeded_db, query_log):
+    """One load query for the whole batch; bad ids are reported per item."""
+    mine = [make_review_item(seeded_db, days_overdue=1) for _ in range(3)]
+    seeded_db.add(User(id=2, email="two@test.com", hashed_password="x", full_name="Two"))
+    foreign = make_review_item(seeded_db, user_id=2, days_overdue=1)
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': '1'})}"}
+    query_log.clear()
+
+    resp = client.post(
+        "/api/v1/review/batch",
+        json={
+            "reviews": [
+                {"attempt_id": mine[0].attempt_id, "got_correct": True, "time_taken": 10},
+                {"attempt_id": foreign.attempt_id, "got_correct": True},
+                {"attempt_id": mine[1].attempt_id, "got_correct": False},
+                {"attempt_id": 999},
+                {"attempt_id": mine[2].attempt_id, "got_correct": True, "time_taken": 500},
+            ]
+        },
+        headers=headers,
+    )
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["reviewed"] == 3
+    assert [r["status"] for r in body["results"]] == [
+        "reviewed", "not_found", "reviewed", "not_found", "reviewed",
+    ]
+    assert [r.get("review_interval_days") for r in body["results"]] == [3, None, 1, None, 1]
+
+    assert sum(1 for s in query_log if "FROM attempts" in s) == 1
+    # Flushed as executemany, one statement per set of changed columns
+    assert sum(1 for s in query_log if s.startswith("UPDATE review_items")) <= 2
+
+    seeded_db.expire_all()
+    assert foreign.review_count == 0
+    assert mine[0].review_count == 1
+
+
 def test_correct_fast_advances_interval(seeded_db):
     """Correct + fast should advance to next interval."""
-    attempt = _make_review_attempt(seeded_db, interval=1)
+    item = make_review_item(seeded_db, interval=1)
 
     process_review(
-        seeded_db, attempt,
+        seeded_db, item,
         got_correct=True, time_taken=30, expected_time=60,
     )
 
-    assert attempt.review_interval_days == 3  # 1 -> 3
-    assert attempt.review_count == 1
+    assert item.review_interval_days == 3  # 1 -> 3
+    assert item.review_count == 1
 
 
 def test_full_interval_progression(seeded_db):
     """Should progress through all intervals: 1 -> 3 -> 7 -> 14 -> 30."""
-    attempt = _make_review_attempt(seeded_db, interval=1)
+    item = make_review_item(seeded_db, interval=1)
 
     for expected_interval in [3, 7, 14, 30]:
         process_review(
-            seeded_db, attempt,
+            seeded_db, item,
             got_correct=True, time_taken=30, expected_time=60,
         )
-        assert attempt.review_interval_days == expected_interval
+        assert item.review_interval_days == expected_interval
 
 
 def test_correct_slow_stays_at_current(seeded_db):
     """Correct but slow should stay at current interval."""
-    attempt = _make_review_attempt(seeded_db, interval=3)
+    item = make_review_item(seeded_db, interval=3)
 
     process_review(
-        seeded_db, attempt,
+        seeded_db, item,
         got_correct=True, time_taken=120, expected_time=60,  # Slow
     )
 
-    assert attempt.review_interval_days == 3  # Stays at 3
+    assert item.review_interval_days == 3  # Stays at 3
 
 
 def test_wrong_resets_to_one(seeded_db):
     """Wrong on review should reset interval to 1 day."""
-    attempt = _make_review_attempt(seeded_db, interval=14)
+    item = make_review_item(seeded_db, interval=14)
 
     process_review(
-        seeded_db, attempt,
+        seeded_db, item,
         got_correct=False, time_taken=30, expected_time=60,
     )
 
-    assert attempt.review_interval_days == 1  # Reset
+    assert item.review_interval_days == 1  # Reset
 
 
 def test_max_interval_stays_at_30(seeded_db):
     """Should not go beyond 30-day interval."""
-    attempt = _make_review_attempt(seeded_db, interval=30)
+    item = make_review_item(seeded_db, interval=30)
 
     process_review(
-        seeded_db, attempt,
+        seeded_db, item,
         got_correct=True, time_taken=30, expected_time=60,
     )
 
-    assert attempt.review_interval_days == 30  # Stays at max
+    assert item.review_interval_days == 30  # Stays at max
 
 
 def test_review_updates_next_date(seeded_db):
     """Next review date should be set correctly."""
-    attempt = _make_review_attempt(seeded_db, interval=1)
+    item = make_review_item(seeded_db, interval=1)
     before = datetime.utcnow()
 
     process_review(
-        seeded_db, attempt,
+        seeded_db, item,
         got_correct=True, time_taken=30, expected_time=60,
     )
 
     # Next review should be ~3 days from now (advanced from 1 to 3)
-    assert attempt.next_review_date > before
-    delta = attempt.next_review_date - before
+    assert item.next_review_date > before
+    delta = item.next_review_date - before
     assert 2 <= delta.days <= 4
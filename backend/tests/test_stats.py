@@ -0,0 +1,209 @@
+"""Tests for dashboard and stats aggregation."""
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from app.models.attempt import Attempt
+from app.models.study_session import StudySession
+from app.models.streak import Streak
+from app.models.user_concept_stats import UserConceptStats
+from app.services.activity_service import rebuild_daily_activity
+from app.services.catalog import get_catalog
+from app.services.rollup_service import record_attempts
+from app.services.stats_service import get_dashboard_data, get_mastery_map, get_trends
+
+
+def _attempts(db, n_attempts):
+    """Add attempts, two in three correct, and count them like the router does."""
+    for i in range(n_attempts):
+        db.add(
+            Attempt(
+                user_id=1,
+                question_id=i % 9 + 1,
+                selected_option="a",
+                is_correct=i % 3 != 0,
+                time_taken_seconds=30 + i,
+            )
+        )
+        record_attempts(db, 1, 1, int(i % 3 != 0), 30 + i)
+    db.commit()
+
+
+def _history(db, n_attempts=6):
+    """Attempts, one 10-minute session, stats per concept and a streak."""
+    _attempts(db, n_attempts)
+    db.add(StudySession(user_id=1, session_type="practice", total_time_seconds=600))
+    for concept_id, mastery in [(1, 0.8), (2, 0.4), (3, 0.2)]:
+        db.add(
+            UserConceptStats(user_id=1, concept_id=concept_id, mastery=mastery, accuracy=0.5)
+        )
+    streak = db.query(Streak).filter(Streak.user_id == 1).one()
+    streak.current_streak, streak.longest_streak = 3, 5
+    db.commit()
+
+
+def test_dashboard_aggregates(seeded_db):
+    """Totals, streak, study time, topic summary and weakest concepts."""
+    _history(seeded_db)
+
+    data = get_dashboard_data(seeded_db, 1)
+
+    assert data["total_questions_done"] == 6
+    assert data["total_correct"] == 4
+    assert data["overall_accuracy"] == round(4 / 6, 3)
+    assert data["avg_time_per_question"] == 32.5
+    assert (data["current_streak"], data["longest_streak"]) == (3, 5)
+    assert data["total_study_minutes"] == 10
+    assert data["mastery_summary"] == pytest.approx({"Verbal": 0.6, "Quantitative": 0.2})
+    assert [c["concept_name"] for c in data["weakest_concepts"]] == [
+        "Algebra",
+        "Antonyms",
+        "Synonyms",
+    ]
+    assert data["weakest_concepts"][0]["topic_name"] == "Quantitative"
+
+
+def test_dashboard_for_new_user(seeded_db):
+    """A user with no history gets zeros rather than errors."""
+    data = get_dashboard_data(seeded_db, 1)
+
+    assert data["total_questions_done"] == 0
+    assert data["overall_accuracy"] == 0.0
+    assert data["total_study_minutes"] == 0
+    assert data["mastery_summary"] == {}
+    assert data["weakest_concepts"] == []
+
+
+def test_dashboard_query_count_is_fixed(seeded_db, query_log):
+    """The dashboard costs the same few queries however much history exists."""
+    get_catalog(seeded_db)
+    _history(seeded_db, n_attempts=3)
+
+    query_log.clear()
+    get_dashboard_data(seeded_db, 1)
+    small = len(query_log)
+
+    _attempts(seeded_db, 60)
+    seeded_db.expire_all()
+    query_log.clear()
+    get_dashboard_data(seeded_db, 1)
+
+    assert small <= 3
+    assert len(query_log) == small
+
+
+def _attempt_on(db, days_ago, is_correct, seconds):
+    """Backdated attempt; call _commit_history() to roll it into daily activity."""
+    db.add(
+        Attempt(
+            user_id=1,
+            question_id=1,
+            selected_option="a",
+            is_correct=is_correct,
+            time_taken_seconds=seconds,
+            created_at=datetime.utcnow() - timedelta(days=days_ago),
+        )
+    )
+
+
+def _commit_history(db):
+    db.flush()
+    rebuild_daily_activity(db)
+    db.commit()
+
+
+def test_trends_per_day(seeded_db):
+    """One point per day, oldest first, with empty days filled in."""
+    _attempt_on(seeded_db, 0, True, 30)
+    _attempt_on(seeded_db, 0, False, 50)
+    _attempt_on(seeded_db, 2, True, 20)
+    _attempt_on(seeded_db, 10, True, 20)  # Outside the window
+    _commit_history(seeded_db)
+
+    trends = get_trends(seeded_db, 1, days=7)
+
+    assert len(trends) == 7
+    assert trends[-1]["date"] == datetime.utcnow().date().isoformat()
+    assert trends[-1] == {
+        "date": trends[-1]["date"],
+        "accuracy": 0.5,
+        "avg_time": 40.0,
+        "questions_done": 2,
+    }
+    assert trends[-3]["questions_done"] == 1
+    assert sum(t["questions_done"] for t in trends) == 3
+
+
+def test_trends_weekly_and_monthly_buckets(seeded_db):
+    """Days fold into their week (Monday) or month (1st) bucket."""
+    for days_ago in range(0, 60, 3):
+        _attempt_on(seeded_db, days_ago, days_ago % 2 == 0, 30)
+    _commit_history(seeded_db)
+    today = datetime.utcnow().date()
+
+    weekly = get_trends(seeded_db, 1, days=60, bucket="week")
+    monthly = get_trends(seeded_db, 1, days=60, bucket="month")
+
+    assert all(date.fromisoformat(t["date"]).weekday() == 0 for t in weekly)
+    assert weekly[-1]["date"] == (today - timedelta(days=today.weekday())).isoformat()
+    assert all(date.fromisoformat(t["date"]).day == 1 for t in monthly)
+    assert sum(t["questions_done"] for t in weekly) == 20
+    assert sum(t["questions_done"] for t in monthly) == 20
+
+
+def test_trends_cost_one_query(seeded_db, query_log):
+    """A year-long window is still a single grouped query."""
+    for days_ago in range(0, 300, 7):
+        _attempt_on(seeded_db, days_ago, True, 30)
+    _commit_history(seeded_db)
+
+    query_log.clear()
+    trends = get_trends(seeded_db, 1, days=365)
+
+    assert len(trends) == 365
+    assert len(query_log) == 1
+
+
+def test_mastery_map_from_catalog_and_one_query(seeded_db, query_log):
+    """Every catalog concept appears; only the user's stats are queried."""
+    seeded_db.add(
+        UserConceptStats(user_id=1, concept_id=3, mastery=0.7, accuracy=0.8, total_attempts=5)
+    )
+    seeded_db.commit()
+    get_catalog(seeded_db)
+
+    query_log.clear()
+    topics = get_mastery_map(seeded_db, 1)
+
+    assert len(query_log) == 1
+    assert [t["topic_name"] for t in topics] == ["Verbal", "Quantitative"]
+    assert [c["name"] for c in topics[0]["concepts"]] == ["Synonyms", "Antonyms"]
+    assert topics[1]["concepts"] == [
+        {"id": 3, "name": "Algebra", "mastery": 0.7, "accuracy": 0.8, "total_attempts": 5}
+    ]
+
+
+def test_mastery_endpoint_etag(seeded_db, client):
+    """Unchanged maps answer If-None-Match with 304; changes get a new ETag."""
+    token = client.post(
+        "/api/v1/auth/login",
+        json={"email": "test@test.com", "password": "test123"},
+    ).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    first = client.get("/api/v1/stats/mastery", headers=headers)
+    etag = first.headers["ETag"]
+    assert first.status_code == 200
+
+    cached = client.get("/api/v1/stats/mastery", headers={**headers, "If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.headers["ETag"] == etag
+
+    client.post(
+        "/api/v1/attempts/",
+        json={"question_id": 1, "selected_option": "a", "time_taken_seconds": 30},
+        headers=headers,
+    )
+    changed = client.get("/api/v1/stats/mastery", headers={**headers, "If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
@@ -0,0 +1,62 @@
+"""Tests for the synthetic data generator."""
+from sqlalchemy import func
+
+from app.models import (
+    Attempt,
+    DailyPlan,
+    Question,
+    ReviewItem,
+    StudySession,
+    User,
+    UserConceptStats,
+    UserDailyActivity,
+    UserRollup,
+)
+from seeds.synthetic import generate
+
+
+def test_generated_histories_are_consistent(test_engine, seeded_db):
+    """Aggregates should agree with the attempts they were built from."""
+    totals = generate(
+        test_engine, 6, attempts_per_user=40, days=30, chunk_users=4, log=lambda _: None
+    )
+
+    assert totals["users"] == 6
+    assert seeded_db.query(User).count() == 7  # Plus the fixture's user
+    assert totals["attempts"] == seeded_db.query(Attempt).count()
+
+    per_concept = {
+        (user_id, concept_id): count
+        for user_id, concept_id, count in seeded_db.query(
+            Attempt.user_id, Question.concept_id, func.count(Attempt.id)
+        )
+        .join(Question, Attempt.question_id == Question.id)
+        .group_by(Attempt.user_id, Question.concept_id)
+        .all()
+    }
+    for stats in seeded_db.query(UserConceptStats).all():
+        assert stats.total_attempts == per_concept[(stats.user_id, stats.concept_id)]
+        assert 0.0 <= stats.mastery <= 1.0
+
+    session_total = seeded_db.query(func.sum(StudySession.question_count)).scalar()
+    assert session_total == totals["attempts"]
+    assert seeded_db.query(DailyPlan).count() == totals["daily_plans"]
+    assert seeded_db.query(func.sum(UserRollup.total_attempts)).scalar() == totals["attempts"]
+    assert (
+        seeded_db.query(func.sum(UserDailyActivity.attempts)).scalar() == totals["attempts"]
+    )
+    wrong_questions = (
+        seeded_db.query(Attempt.user_id, Attempt.question_id)
+        .filter(Attempt.is_correct == False)
+        .distinct()
+        .count()
+    )
+    assert seeded_db.query(ReviewItem).count() == totals["review_items"] == wrong_questions
+
+
+def test_generator_appends_after_existing_ids(test_engine, seeded_db):
+    """Running twice should keep adding users without id collisions."""
+    generate(test_engine, 2, attempts_per_user=5, log=lambda _: None)
+    generate(test_engine, 2, attempts_per_user=5, seed=1, log=lambda _: None)
+
+    assert seeded_db.query(User).count() == 5
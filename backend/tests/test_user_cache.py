@@ -0,0 +1,88 @@
+"""Tests for the authenticated-user fast path (user cache and token claims)."""
+from jose import jwt
+
+from app.config import settings
+from app.services.user_cache import get_principal
+from app.utils.security import create_access_token
+
+PREFIX = settings.API_V1_PREFIX
+HEADERS = {"Authorization": f"Bearer {create_access_token({'sub': '1'})}"}
+
+
+def _user_queries(statements) -> int:
+    return sum(1 for s in statements if "FROM users" in s)
+
+
+def test_principal_is_cached_between_requests(client, seeded_db, query_log):
+    assert client.get(f"{PREFIX}/review/queue/count", headers=HEADERS).status_code == 200
+    assert _user_queries(query_log) == 1
+
+    assert client.get(f"{PREFIX}/review/queue/count", headers=HEADERS).status_code == 200
+    assert client.get(f"{PREFIX}/streaks/current", headers=HEADERS).status_code == 200
+    assert _user_queries(query_log) == 1
+
+
+def test_profile_update_invalidates_cache(client, seeded_db):
+    principal = get_principal(seeded_db, 1)
+    assert principal.daily_minutes == 45
+
+    response = client.put(f"{PREFIX}/auth/me", headers=HEADERS, json={"daily_minutes": 90})
+    assert response.status_code == 200
+
+    assert get_principal(seeded_db, 1).daily_minutes == 90
+
+
+def test_plan_settings_invalidate_cache(client, seeded_db):
+    get_principal(seeded_db, 1)
+    client.put(f"{PREFIX}/plan/settings", headers=HEADERS, json={"daily_minutes": 30})
+
+    assert get_principal(seeded_db, 1).daily_minutes == 30
+
+
+def test_cache_disabled_reads_every_time(client, seeded_db, query_log, monkeypatch):
+    monkeypatch.setattr(settings, "USER_CACHE_TTL_SECONDS", 0)
+    client.get(f"{PREFIX}/review/queue/count", headers=HEADERS)
+    client.get(f"{PREFIX}/review/queue/count", headers=HEADERS)
+    assert _user_queries(query_log) == 2
+
+
+def test_embedded_claims_skip_users_table(client, seeded_db, query_log, monkeypatch):
+    monkeypatch.setattr(settings, "TOKEN_EMBED_CLAIMS", True)
+    token = client.post(
+        f"{PREFIX}/auth/login", json={"email": "test@test.com", "password": "test123"}
+    ).json()["access_token"]
+    claims = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    assert claims["daily_minutes"] == 45
+    assert claims["is_admin"] is False
+    query_log.clear()
+
+    headers = {"Authorization": f"Bearer {token}"}
+    assert client.get(f"{PREFIX}/review/queue/count", headers=headers).status_code == 200
+    assert client.get(f"{PREFIX}/streaks/current", headers=headers).status_code == 200
+    assert _user_queries(query_log) == 0
+
+
+def test_plans_ignore_stale_embedded_claims(client, seeded_db, monkeypatch):
+    """Plans are stored, so they use the current settings, not the token's."""
+    monkeypatch.setattr(settings, "TOKEN_EMBED_CLAIMS", True)
+    token = client.post(
+        f"{PREFIX}/auth/login", json={"email": "test@test.com", "password": "test123"}
+    ).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    client.put(f"{PREFIX}/plan/settings", headers=headers, json={"daily_minutes": 120})
+    response = client.post(f"{PREFIX}/plan/generate", headers=headers)
+    assert response.json()["total_minutes"] == 120
+
+    client.post(
+        f"{PREFIX}/onboarding/profile",
+        headers=headers,
+        json={"level": "beginner", "daily_minutes": 60},
+    )
+    client.post(f"{PREFIX}/plan/generate", headers=headers)
+    assert client.get(f"{PREFIX}/plan/today", headers=headers).json()["total_minutes"] == 60
+
+
+def test_unknown_user_is_rejected(client, seeded_db):
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': '999'})}"}
+    assert client.get(f"{PREFIX}/streaks/current", headers=headers).status_code == 401